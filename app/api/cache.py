@@ -0,0 +1,119 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+    stamp: tuple
+
+
+def encode_json(data) -> bytes:
+    """Same compact UTF-8 encoding FastAPI's JSONResponse produces."""
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def parse_coding(part: str) -> Tuple[str, float]:
+    """(coding, q) from one Accept-Encoding element such as "gzip; q=0.5"; a malformed q counts as 0."""
+    coding, *params = part.split(";")
+    q = 1.0
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                q = float(value.strip())
+            except ValueError:
+                q = 0.0
+    return coding.strip().lower(), q
+
+
+class ResponseCache:
+    """
+    LRU of pre-encoded response bodies keyed by what the response was built from.
+
+    Callers pass a stamp with every lookup: the (inode, mtime, size) the
+    SummaryIndex loaded a day's file at, or the index generation for range and
+    global pages. An entry is
+    reused only while its stamp is unchanged, so a top-k rewrite picked up by
+    the index invalidates it without any explicit eviction.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, stamp, build: Callable[[], bytes]) -> CachedBody:
+        """Cached body for `key` while its stamp is unchanged; otherwise build and store a new one."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached.stamp == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        body = build()
+        entry = CachedBody(body, '"' + hashlib.sha1(body).hexdigest() + '"', stamp)
+
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+
+class CompressedBodies:
+    """
+    Compressed variants of cached bodies, keyed by (etag, encoding).
+
+    Bodies are compressed once per version instead of on every response; brotli
+    is offered only when the optional `brotli` package is installed.
+    """
+
+    def __init__(self, max_entries: int = 256, minimum_size: int = 1024):
+        self.max_entries = max_entries
+        self.minimum_size = minimum_size
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+    def negotiate(self, accept_encoding: str, body: bytes) -> Optional[str]:
+        if len(body) < self.minimum_size:
+            return None
+        accepted = {coding for coding, q in map(parse_coding, accept_encoding.split(",")) if q > 0}
+        for encoding in self.encodings:
+            if encoding in accepted:
+                return encoding
+        return None
+
+    def get(self, cached: CachedBody, encoding: str) -> bytes:
+        key = (cached.etag, encoding)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                return body
+        if encoding == "br":
+            body = brotli.compress(cached.body, quality=5)
+        else:
+            body = gzip.compress(cached.body, compresslevel=6, mtime=0)
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = body
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return body
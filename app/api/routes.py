@@ -1,54 +1,244 @@
+import asyncio
 import os
-import json
-from fastapi import APIRouter, HTTPException, Query
-from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from datetime import datetime, date as date_cls
 from zoneinfo import ZoneInfo
+from app.api.cache import CachedBody, CompressedBodies, ResponseCache, encode_json
+from app.api.stream import ChangeNotifier, sse_event, wait_for
+from app.api.summary_index import GLOBAL_REGION, SummaryIndex
+from app.utils import metrics
+from app.utils.config import region_timezones
 
 router = APIRouter()
 
 SUMMARY_DIR = "data/top_k_cache"
+DATA_DIR = "data"
 REGION_CONFIG = "app/config/regions.json"
 
-# Load region → timezone mapping
-with open(REGION_CONFIG, "r") as f:
-    REGION_TIMEZONES = json.load(f)
+# Dates older than this many days are no longer rewritten by the precomputer
+IMMUTABLE_AFTER_DAYS = 2
+CACHE_CONTROL_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_CONTROL_RECENT = "public, max-age=300"
+CACHE_CONTROL_TODAY = "public, max-age=30, must-revalidate"
+
+# Longest range one /summary/range call may ask for; pages cut it further
+MAX_RANGE_DAYS = 366
+DEFAULT_PAGE_SIZE = 7
+MAX_GLOBAL_K = 100
+
+response_cache = ResponseCache(max_entries=int(os.environ.get("SUMMARY_CACHE_SIZE", "256")))
+compressed_bodies = CompressedBodies(max_entries=int(os.environ.get("SUMMARY_CACHE_SIZE", "256")))
+summary_index = SummaryIndex(SUMMARY_DIR, refresh_seconds=float(os.environ.get("SUMMARY_INDEX_REFRESH_SECONDS", "2")))
+# Rank the global view over every scored article (score_index) instead of each region's top-k only
+GLOBAL_FROM_SCORE_INDEX = os.environ.get("SUMMARY_GLOBAL_FROM_SCORE_INDEX", "0") == "1"
+# Woken by the index watcher (app.main lifespan) when a region's top-k files change
+summary_notifier = ChangeNotifier()
+# Comment line sent to idle /summary/stream clients so proxies keep the connection open
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get("SUMMARY_STREAM_HEARTBEAT_SECONDS", "15"))
+stream_subscribers = 0
 
 
 def resolve_region(region: str | None) -> str:
     """Ensure region is valid, fallback to 'us' only if region is None."""
     if region is None:
         return "us"
-    if region not in REGION_TIMEZONES:
+    if region not in region_timezones(REGION_CONFIG):
         raise HTTPException(status_code=404, detail=f"Region '{region}' is not supported.")
     return region
 
 
 def get_local_date(region: str) -> str:
-    tz = ZoneInfo(REGION_TIMEZONES[region])
+    tz = ZoneInfo(region_timezones(REGION_CONFIG)[region])
     return datetime.now(tz).date().isoformat()
 
 
-def load_summary(date_str: str, region: str):
-    path = os.path.join(SUMMARY_DIR, region, f"{date_str}.json")
-    if not os.path.exists(path):
+def cache_control(date_str: str, region: str) -> str:
+    age = (date_cls.fromisoformat(get_local_date(region)) - date_cls.fromisoformat(date_str)).days
+    if age > IMMUTABLE_AFTER_DAYS:
+        return CACHE_CONTROL_IMMUTABLE
+    if age > 0:
+        return CACHE_CONTROL_RECENT
+    return CACHE_CONTROL_TODAY
+
+
+def parse_date(value: str, name: str = "date") -> str:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} format. Use YYYY-MM-DD.")
+
+
+def body_response(request: Request, cached: CachedBody, cache_control_value: str) -> Response:
+    """Serve a pre-encoded body with ETag revalidation and gzip/brotli when the client accepts it."""
+    encoding = compressed_bodies.negotiate(request.headers.get("accept-encoding", ""), cached.body)
+    # Each encoding is its own representation, so it gets its own ETag
+    etag = cached.etag if encoding is None else f'{cached.etag[:-1]}-{encoding}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control_value, "Vary": "Accept-Encoding"}
+
+    if_none_match = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag in if_none_match or cached.etag in if_none_match or "*" in if_none_match:
+        return Response(status_code=304, headers=headers)
+    if encoding is None:
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(content=compressed_bodies.get(cached, encoding), media_type="application/json", headers=headers)
+
+
+def summary_body(date_str: str, region: str) -> Optional[CachedBody]:
+    """Pre-encoded body for (region, date), built from the in-memory index; None if there is no summary."""
+    # Stamp first: the index publishes articles before stamps, so the body is never older than its key
+    stamp = summary_index.stamp(region, date_str)
+    articles = summary_index.get(region, date_str)
+    if stamp is None or articles is None:
+        return None
+    return response_cache.get_or_build(
+        ("summary", region, date_str), stamp,
+        lambda: encode_json({"region": region, "date": date_str, "articles": articles})
+    )
+
+
+def summary_response(request: Request, date_str: str, region: str) -> Response:
+    """Serve the pre-encoded body for (region, date) with ETag revalidation."""
+    cached = summary_body(date_str, region)
+    if cached is None:
         raise HTTPException(status_code=404, detail=f"Summary not found for {region} on {date_str}.")
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+    return body_response(request, cached, cache_control(date_str, region))
+
+
+def page_bounds(page: int, page_size: int, total: int):
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total), (page + 1 if start + page_size < total else None)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus exposition: this API process plus the last snapshot of every pipeline process."""
+    metrics.REGISTRY.set("api_response_cache_hits", response_cache.hits)
+    metrics.REGISTRY.set("api_response_cache_misses", response_cache.misses)
+    metrics.REGISTRY.set("api_stream_subscribers", stream_subscribers)
+    # Snapshots are files written by the pipeline processes
+    snapshots = await asyncio.to_thread(metrics.load_snapshots)
+    snapshots["api"] = metrics.REGISTRY.snapshot()
+    return PlainTextResponse(metrics.render_prometheus(snapshots), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/summary/range")
+async def get_summary_range(
+    request: Request,
+    start: str = Query(alias="from", description="First local date, YYYY-MM-DD"),
+    end: str = Query(alias="to", description="Last local date (inclusive), YYYY-MM-DD"),
+    region: str = Query(default="us", description="Region code like 'us', 'jp', etc."),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_RANGE_DAYS, description="Days per page")
+):
+    region = resolve_region(region)
+    start, end = parse_date(start, "from"), parse_date(end, "to")
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'.")
+    if (date_cls.fromisoformat(end) - date_cls.fromisoformat(start)).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Ranges are limited to {MAX_RANGE_DAYS} days.")
+
+    def build():
+        days = summary_index.range(region, start, end)
+        first, last, next_page = page_bounds(page, page_size, len(days))
+        return encode_json({
+            "region": region, "from": start, "to": end,
+            "page": page, "page_size": page_size, "total_days": len(days), "next_page": next_page,
+            "days": [{"date": d, "articles": articles} for d, articles in days[first:last]],
+        })
+
+    summary_index.poll()
+    key = ("range", region, start, end, page, page_size)
+    cached = response_cache.get_or_build(key, summary_index.generation, build)
+    # The range is only as cacheable as its most recent day
+    return body_response(request, cached, cache_control(end, region))
+
+
+@router.get("/summary/global")
+async def get_global_summary(
+    request: Request,
+    date: str = Query(default=None, description="UTC date, YYYY-MM-DD (default today)"),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=10, ge=1, le=MAX_GLOBAL_K)
+):
+    date_str = parse_date(date) if date else get_local_date(GLOBAL_REGION)
+    if page * page_size > MAX_GLOBAL_K:
+        raise HTTPException(status_code=400, detail=f"Only the top {MAX_GLOBAL_K} global articles are served.")
+
+    def build():
+        ranked = summary_index.global_top_k(
+            date_str, page * page_size, region_timezones(REGION_CONFIG),
+            score_base_dir=DATA_DIR if GLOBAL_FROM_SCORE_INDEX else None
+        )
+        first, last, _ = page_bounds(page, page_size, len(ranked))
+        has_more = len(ranked) == page * page_size and page * page_size < MAX_GLOBAL_K
+        return encode_json({
+            "region": GLOBAL_REGION, "date": date_str, "page": page, "page_size": page_size,
+            "next_page": page + 1 if has_more else None,
+            "articles": ranked[first:last],
+        })
+
+    # Every summarizer run ends with a top_k_cache rewrite, so the generation also covers score_index appends
+    summary_index.poll()
+    key = ("global", date_str, page, page_size)
+    if GLOBAL_FROM_SCORE_INDEX:
+        # Ranking reads the memory-mapped score index, so keep it off the event loop
+        cached = await asyncio.to_thread(response_cache.get_or_build, key, summary_index.generation, build)
+    else:
+        cached = response_cache.get_or_build(key, summary_index.generation, build)
+    return body_response(request, cached, cache_control(date_str, GLOBAL_REGION))
 
 
 @router.get("/summary/today")
-def get_today_summary(region: str = Query(default="us", description="Region code like 'us', 'jp', etc.")):
+async def get_today_summary(
+    request: Request,
+    region: str = Query(default="us", description="Region code like 'us', 'jp', etc.")
+):
     region = resolve_region(region)
     today = get_local_date(region)
-    return {
-        "region": region,
-        "date": today,
-        "articles": load_summary(today, region)
-    }
+    return summary_response(request, today, region)
+
+
+@router.get("/summary/stream")
+async def stream_today_summary(
+    request: Request,
+    region: str = Query(default="us", description="Region code like 'us', 'jp', etc.")
+):
+    """
+    Server-Sent Events feed of the region's today summary: the current body
+    on connect (unless Last-Event-ID already matches it), then one event
+    whenever the precomputer rewrites it, including after local midnight.
+    Each event carries the same JSON as /summary/today, with its ETag as id.
+    """
+    region = resolve_region(region)
+    last_id = request.headers.get("last-event-id")
+
+    async def events():
+        global stream_subscribers
+        nonlocal last_id
+        stream_subscribers += 1
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                changed = summary_notifier.event(region)
+                cached = summary_body(get_local_date(region), region)
+                if cached is not None and cached.etag.strip('"') != last_id:
+                    last_id = cached.etag.strip('"')
+                    yield sse_event(cached.body, "summary", last_id)
+                if not await wait_for(changed, STREAM_HEARTBEAT_SECONDS):
+                    yield b": keep-alive\n\n"
+        finally:
+            stream_subscribers -= 1
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @router.get("/summary/{date}")
-def get_summary_by_date(
+async def get_summary_by_date(
+    request: Request,
     date: str,
     region: str = Query(default="us", description="Region code like 'us', 'jp', etc.")
 ):
@@ -57,8 +247,4 @@ def get_summary_by_date(
         datetime.strptime(date, "%Y-%m-%d")
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD.")
-    return {
-        "region": region,
-        "date": date,
-        "articles": load_summary(date, region)
-    }
\ No newline at end of file
+    return summary_response(request, date, region)
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Dict, Iterable
+
+from app.api.summary_index import SummaryIndex
+
+
+class ChangeNotifier:
+    """
+    Wakes every coroutine waiting on a region once that region changes.
+
+    Waiters share one asyncio.Event per region, replaced on every publish, so
+    an idle subscriber costs one pending wait and a change costs one wake-up
+    per subscriber, however many there are. Take the event before reading the
+    state it guards, so a change in between is not missed.
+    """
+
+    def __init__(self):
+        self._events: Dict[str, asyncio.Event] = {}
+
+    def event(self, region: str) -> asyncio.Event:
+        event = self._events.get(region)
+        if event is None:
+            event = self._events[region] = asyncio.Event()
+        return event
+
+    def publish(self, regions: Iterable[str]):
+        for region in regions:
+            event = self._events.pop(region, None)
+            if event is not None:
+                event.set()
+
+
+async def wait_for(event: asyncio.Event, timeout: float) -> bool:
+    """True if `event` was set within `timeout` seconds."""
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+async def watch_summaries(index: SummaryIndex, notifier: ChangeNotifier, interval: float):
+    """
+    Keep `index` fresh from one background task per process: refresh it off
+    the event loop every `interval` seconds and wake the regions that changed.
+    While this runs, request handlers read the index without touching disk.
+    """
+    index.watched = True
+    try:
+        while True:
+            try:
+                changed = await asyncio.to_thread(index.refresh, True)
+            except Exception as e:
+                print(f"[WARN] Summary index refresh failed: {e}")
+                changed = set()
+            if changed:
+                notifier.publish({region for region, _ in changed})
+            await asyncio.sleep(interval)
+    finally:
+        index.watched = False
+
+
+def sse_event(data: bytes, event: str, event_id: str) -> bytes:
+    # encode_json output never contains a newline, so the body fits one data line
+    return b"id: " + event_id.encode() + b"\nevent: " + event.encode() + b"\ndata: " + data + b"\n\n"
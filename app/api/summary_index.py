@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from datetime import date as date_cls, datetime, time as time_cls, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+from app.core.summarizer.topk_changes import TopKChangeLog
+
+GLOBAL_REGION = "global"
+
+
+def global_score(article: Dict) -> float:
+    return article.get("impact", {}).get("global", 0) + article.get("frequency", 0)
+
+
+class SummaryIndex:
+    """
+    In-memory copy of top_k_cache: {region: {date: articles}}.
+
+    Loaded once at startup. Afterwards refresh() runs at most every
+    `refresh_seconds` and reloads only the files named in the precomputer's
+    change log (TopKChangeLog). It falls back to re-statting the whole tree
+    when there is no log, when the log was rotated, and every
+    `rescan_seconds` regardless. `generation` increases whenever anything
+    changed, so callers can key response caches on it.
+
+    A region's dict is replaced, never mutated, so readers on another thread
+    see either the old or the new snapshot. While `watched` is set, a
+    background task owns refreshing and lookups never touch the disk.
+    """
+
+    def __init__(self, summary_dir="data/top_k_cache", refresh_seconds: float = 2.0, rescan_seconds: float = 60.0):
+        self.summary_dir = Path(summary_dir)
+        self.refresh_seconds = refresh_seconds
+        self.rescan_seconds = rescan_seconds
+        self.generation = 0
+        self.watched = False
+        self.changes = TopKChangeLog(self.summary_dir)
+        self._days: Dict[str, Dict[str, List[Dict]]] = {}
+        self._stamps: Dict[Tuple[str, str], tuple] = {}
+        self._position = None
+        self._last_scan = 0.0
+        self._last_rescan = 0.0
+        self._score_indexes = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> Set[Tuple[str, str]]:
+        """Reload whatever changed on disk; returns the (region, date) keys that did."""
+        now = time.monotonic()
+        if not force and now - self._last_scan < self.refresh_seconds:
+            return set()
+        with self._lock:
+            if not force and now - self._last_scan < self.refresh_seconds:
+                return set()
+            self._last_scan = now
+            changes, position = self.changes.read(self._position)
+            updates = {}
+            if changes is None or now - self._last_rescan >= self.rescan_seconds:
+                self._scan(updates)
+                self._last_rescan = now
+            else:
+                for change in changes:
+                    key = (change["region"], change["date"])
+                    self._reload(key, self.summary_dir / key[0] / f"{key[1]}.json", updates)
+            self._position = position
+            if updates:
+                self._apply(updates)
+                self.generation += 1
+            return set(updates)
+
+    def _scan(self, updates: Dict):
+        seen = set()
+        if self.summary_dir.exists():
+            for region_entry in os.scandir(self.summary_dir):
+                if not region_entry.is_dir():
+                    continue
+                for file_entry in os.scandir(region_entry.path):
+                    if not file_entry.name.endswith(".json"):
+                        continue
+                    key = (region_entry.name, file_entry.name[:-5])
+                    seen.add(key)
+                    self._reload(key, file_entry.path, updates)
+
+        for key in set(self._stamps) - seen:
+            updates[key] = None
+
+    def _reload(self, key: Tuple[str, str], path, updates: Dict):
+        """Queue (stamp, articles) in `updates` if the file changed since it was loaded (None if it is gone)."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            if key in self._stamps:
+                updates[key] = None
+            return
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._stamps.get(key) == stamp:
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                articles = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Skipped {path}: {e}")
+            return
+        updates[key] = (stamp, articles)
+
+    def _apply(self, updates: Dict):
+        days = dict(self._days)
+        copied = set()
+        for (region, date_str), update in updates.items():
+            if region not in copied:
+                days[region] = dict(days.get(region, {}))
+                copied.add(region)
+            if update is None:
+                days[region].pop(date_str, None)
+            else:
+                days[region][date_str] = update[1]
+        self._days = days
+        # Stamps last: a reader that sees the new stamp is guaranteed to see the new articles
+        for key, update in updates.items():
+            if update is None:
+                self._stamps.pop(key, None)
+            else:
+                self._stamps[key] = update[0]
+
+    def poll(self):
+        """refresh(), unless a background task already keeps the index fresh."""
+        if not self.watched:
+            self.refresh()
+
+    def stamp(self, region: str, date_str: str) -> Optional[tuple]:
+        """Version of one (region, date) as loaded: the file's inode, mtime and size."""
+        self.poll()
+        return self._stamps.get((region, date_str))
+
+    def regions(self) -> List[str]:
+        self.poll()
+        return sorted(region for region, days in self._days.items() if days and region != GLOBAL_REGION)
+
+    def get(self, region: str, date_str: str) -> Optional[List[Dict]]:
+        self.poll()
+        return self._days.get(region, {}).get(date_str)
+
+    def range(self, region: str, start: str, end: str) -> List[Tuple[str, List[Dict]]]:
+        """(date, articles) for every stored date in [start, end], oldest first."""
+        self.poll()
+        days = self._days.get(region, {})
+        return [(d, days[d]) for d in sorted(days) if start <= d <= end]
+
+    def global_top_k(self, date_str: str, k: int, timezones: Dict[str, str] = None,
+                     score_base_dir: Optional[Path] = None) -> List[Dict]:
+        """
+        Cross-region top-k for one date by global impact + frequency.
+
+        Candidates are each region's top_k_cache list for that (local) date.
+        With `score_base_dir` (the data dir holding score_index/), every scored
+        article of the region's local day is ranked instead, which also finds
+        globally important stories that missed their own region's top-k.
+        """
+        candidates = {}
+        for region in self.regions():
+            if score_base_dir is not None and timezones and region in timezones:
+                articles = self._score_index_candidates(score_base_dir, region, date_str, k, timezones[region])
+            else:
+                articles = self.get(region, date_str) or []
+            for article in articles:
+                best = candidates.get(article["uuid"])
+                if best is None or global_score(article) > global_score(best):
+                    candidates[article["uuid"]] = dict(article, region=region)
+        ranked = sorted(candidates.values(), key=lambda a: (-global_score(a), a["uuid"]))
+        return ranked[:k]
+
+    def _score_index_candidates(self, base_dir, region, date_str, k, tz_name) -> List[Dict]:
+        from app.core.summarizer.score_index import ScoreIndex
+
+        if not (Path(base_dir) / "score_index" / region).exists():
+            return self.get(region, date_str) or []
+        tz = ZoneInfo(tz_name)
+        start = datetime.combine(date_cls.fromisoformat(date_str), time_cls.min, tzinfo=tz)
+        end = start + timedelta(days=1)
+        with self._lock:
+            # Kept open between requests so only newly appended rows are mapped each time
+            index = self._score_indexes.get(region)
+            if index is None:
+                index = self._score_indexes[region] = ScoreIndex(base_dir, region)
+            return index.top_k(k, int(start.timestamp()), int(end.timestamp()), field="global_score")
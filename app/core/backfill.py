@@ -0,0 +1,256 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date as date_cls, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+from app.utils import metrics
+from app.utils.helper import atomic_write_json
+
+STATE_DIR = Path("log") / "backfill"
+REPLACED_DIR = Path("backfill") / "replaced"
+
+# Per worker process, set by _init_worker
+_WORKER = {}
+
+
+def date_range(start: str, end: str) -> List[str]:
+    first, last = date_cls.fromisoformat(start), date_cls.fromisoformat(end)
+    return [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+
+def _init_worker(base_dir, use_llm, limiter, llm, replace, job_id, llm_workers, window_size, next_index):
+    # Workers are numbered 0..workers-1 on every job, so their metrics dumps are overwritten, not piled up
+    with next_index.get_lock():
+        index = next_index.value
+        next_index.value += 1
+    metrics.set_process_name(f"backfill_{index}")
+    _WORKER.update(base_dir=base_dir, use_llm=use_llm, limiter=limiter, llm=llm, replace=replace,
+                   job_id=job_id, llm_workers=llm_workers, window_size=window_size, summarizers={}, topk=None)
+
+
+def _summarizer(region: str):
+    from app.core.summarizer.summarizer import Summarizer
+
+    summarizer = _WORKER["summarizers"].get(region)
+    if summarizer is None:
+        # One warm Summarizer per region per worker; every instance shares the LLM cache db and the limiter
+        summarizer = Summarizer(region=region, base_dir=_WORKER["base_dir"], use_llm=_WORKER["use_llm"],
+                                llm=_WORKER["llm"], limiter=_WORKER["limiter"], llm_workers=_WORKER["llm_workers"],
+                                window_size=_WORKER["window_size"])
+        _WORKER["summarizers"][region] = summarizer
+    return summarizer
+
+
+def _replace_score_cache(base_dir: Path, region: str, date_str: str, job_id: str):
+    """
+    Move the date's existing score entries and cluster signatures aside once
+    per job, so regrouped stories neither duplicate nor join the old ones.
+    """
+    current = base_dir / "score_cache" / region / date_str
+    backup = base_dir / REPLACED_DIR / job_id / region / date_str
+    if backup.exists() or not current.exists():
+        return
+    backup.parent.mkdir(parents=True, exist_ok=True)
+    clusters = base_dir / "cluster_index" / region / f"{date_str}.ndjson"
+    if clusters.exists():
+        clusters.rename(backup.parent / f"{date_str}.clusters.ndjson")
+    current.rename(backup)
+
+
+def run_unit(region: str, date_str: str) -> Dict:
+    """Reprocess one region's archived fetches for one UTC fetch date, inside a worker process."""
+    from app.core.status.archive import ArchiveStore
+    from app.core.summarizer.topk_precomputer import TopKPrecomputer
+
+    start = time.perf_counter()
+    base_dir = Path(_WORKER["base_dir"])
+    if _WORKER["replace"]:
+        _replace_score_cache(base_dir, region, date_str, _WORKER["job_id"])
+
+    summarizer = _summarizer(region)
+    # Reload even if already bound: --replace may just have moved this date's entries and clusters aside
+    summarizer.bind_date(date_str, reload=True)
+    calls_before = summarizer.llm_executor.stats["calls"] if summarizer.llm_executor else 0
+    articles = ArchiveStore(base_dir, region).iter_items(date_str, date_str)
+    process_log = summarizer.reprocess(articles, overwrite=_WORKER["replace"])
+
+    # Local dates the new entries land on, for the final top-k pass
+    if _WORKER["topk"] is None:
+        _WORKER["topk"] = TopKPrecomputer(base_dir=base_dir)
+    entries = []
+    for uuid in (process_log or {}).get("uuids_processed", []):
+        try:
+            with open(summarizer.cache_dir / f"{uuid}.json", "r") as f:
+                entries.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    local_dates = sorted(_WORKER["topk"].group_by_local_date(entries, region)) if entries else []
+    metrics.REGISTRY.dump()
+
+    return {
+        "region": region,
+        "date": date_str,
+        "articles": process_log["articles"] if process_log else 0,
+        "uuids": len(process_log["uuids_processed"]) if process_log else 0,
+        "llm_calls": (summarizer.llm_executor.stats["calls"] - calls_before) if summarizer.llm_executor else 0,
+        "local_dates": local_dates,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+class Backfill:
+    """
+    Reprocess archived fetches for a set of regions over a date range.
+
+    Work is split into (region, UTC fetch date) units, ordered by date, and
+    run on a process pool. All workers share the SQLite LLM cache and one
+    rate limiter held in shared memory, so the API budget holds for the whole
+    job. Per-unit top-k updates are skipped; once every unit is done, the
+    affected local dates are recomputed in one pass per region.
+
+    Progress is saved to data/log/backfill/{job}.json after every unit, where
+    the job id is derived from the arguments. Re-running the same command
+    skips completed units and finishes the top-k pass if it was interrupted.
+    """
+
+    def __init__(self, regions: List[str], start: str, end: str, base_dir="data", workers: int = 4,
+                 use_llm: bool = True, replace: bool = False, top_k: int = 5, requests_per_minute: float = 500,
+                 tokens_per_minute: float = 60000, llm_workers: int = 4, llm=None, window_size=None):
+        self.regions = sorted(regions)
+        self.dates = date_range(start, end)
+        self.base_dir = Path(base_dir)
+        self.workers = max(1, workers)
+        self.use_llm = use_llm
+        self.replace = replace
+        self.top_k = top_k
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.llm_workers = llm_workers
+        self.llm = llm
+        self.window_size = window_size
+
+        key = json.dumps([self.regions, start, end, use_llm, replace])
+        self.job_id = f"{start}_{end}_{hashlib.sha256(key.encode()).hexdigest()[:10]}"
+        self.state_path = self.base_dir / STATE_DIR / f"{self.job_id}.json"
+
+    def log(self, message: str):
+        print(f"[BACKFILL] {message}")
+
+    def load_state(self) -> Dict:
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"job": self.job_id, "units": {}, "topk_done": False}
+
+    def save_state(self, state: Dict):
+        atomic_write_json(self.state_path, state, indent=2)
+
+    def units(self) -> List[Tuple[str, str]]:
+        return [(region, date_str) for date_str in self.dates for region in self.regions]
+
+    def run(self) -> Dict:
+        from app.core.summarizer.llm_executor import RateLimiter
+
+        state = self.load_state()
+        units = self.units()
+        todo = [unit for unit in units if f"{unit[0]}/{unit[1]}" not in state["units"]]
+        if len(todo) < len(units):
+            self.log(f"Resuming {self.job_id}: {len(units) - len(todo)}/{len(units)} units already done")
+        else:
+            self.log(f"Starting {self.job_id}: {len(units)} units, {self.workers} workers")
+
+        start = time.perf_counter()
+        if todo:
+            state["topk_done"] = False
+            limiter = RateLimiter(self.requests_per_minute, self.tokens_per_minute, shared=True) \
+                if self.use_llm else None
+            initargs = (str(self.base_dir), self.use_llm, limiter, self.llm, self.replace, self.job_id,
+                        self.llm_workers, self.window_size, multiprocessing.Value("i", 0))
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(todo)), initializer=_init_worker,
+                                     initargs=initargs) as pool:
+                futures = {pool.submit(run_unit, region, date_str): (region, date_str) for region, date_str in todo}
+                done = len(units) - len(todo)
+                for future in as_completed(futures):
+                    region, date_str = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Left out of the state, so the next run retries it
+                        self.log(f"{region} {date_str} failed: {e}")
+                        continue
+                    state["units"][f"{region}/{date_str}"] = result
+                    self.save_state(state)
+                    done += 1
+                    elapsed = time.perf_counter() - start
+                    remaining = elapsed / (done - (len(units) - len(todo))) * (len(units) - done)
+                    self.log(f"{done}/{len(units)} ({done * 100 // len(units)}%) {region} {date_str}: "
+                             f"{result['articles']} articles, {result['uuids']} summaries, "
+                             f"{result['llm_calls']} LLM calls in {result['seconds']} s, ETA {remaining:.0f} s")
+
+        failed = len(units) - len(state["units"])
+        if failed:
+            self.log(f"{failed} units failed; top-k pass deferred until a re-run completes them")
+        elif not state["topk_done"]:
+            self.precompute(state)
+            state["topk_done"] = True
+            self.save_state(state)
+
+        summary = {
+            "job": self.job_id,
+            "units": len(units),
+            "failed": failed,
+            "articles": sum(u["articles"] for u in state["units"].values()),
+            "uuids": sum(u["uuids"] for u in state["units"].values()),
+            "llm_calls": sum(u["llm_calls"] for u in state["units"].values()),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        self.log(json.dumps(summary))
+        return summary
+
+    def precompute(self, state: Dict):
+        """One top-k pass per region over every local date the backfill touched."""
+        from app.core.summarizer.score_index import build_from_score_cache
+        from app.core.summarizer.topk_precomputer import TopKPrecomputer
+
+        precomputer = TopKPrecomputer(base_dir=self.base_dir, top_k=self.top_k)
+        for region in self.regions:
+            dates = {d for key, unit in state["units"].items() if key.startswith(f"{region}/")
+                     for d in unit["local_dates"]}
+            if self.replace:
+                # Replaced entries are still in the append-only index; rebuild it from score_cache.
+                # Live Summarizers' appends wait on the index lock meanwhile and land in the new files
+                build_from_score_cache(self.base_dir, region)
+            if dates:
+                with metrics.span("backfill_topk", region=region):
+                    precomputer.rebuild(regions=[region], dates=dates)
+            self.log(f"{region}: top-k recomputed for {len(dates)} local dates")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reprocess archived fetches for a date range.")
+    parser.add_argument("--region", action="append", required=True, help="Region to backfill (repeatable)")
+    parser.add_argument("--from", dest="start", required=True, help="First UTC fetch date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", required=True, help="Last UTC fetch date, YYYY-MM-DD")
+    parser.add_argument("--base-dir", default="data")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--llm-workers", type=int, default=4, help="Concurrent LLM calls per worker process")
+    parser.add_argument("--requests-per-minute", type=float, default=500, help="Shared by all workers")
+    parser.add_argument("--tokens-per-minute", type=float, default=60000, help="Shared by all workers")
+    parser.add_argument("--no-llm", action="store_true", help="Keep feed summaries and zero impact scores")
+    parser.add_argument("--replace", action="store_true",
+                        help="Move each date's existing score_cache aside and re-summarize every group")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--window-size", type=int, default=None,
+                        help="Summarize each unit in windows of this many articles to bound worker memory")
+    args = parser.parse_args()
+
+    Backfill(args.region, args.start, args.end, base_dir=args.base_dir, workers=args.workers,
+             use_llm=not args.no_llm, replace=args.replace, top_k=args.top_k,
+             requests_per_minute=args.requests_per_minute, tokens_per_minute=args.tokens_per_minute,
+             llm_workers=args.llm_workers, window_size=args.window_size).run()
@@ -1,70 +1,213 @@
 import os
 import json
-import socket
-import feedparser
+import time
+import queue
+import threading
 import requests
-from datetime import datetime, timezone, timedelta
-from email.utils import parsedate_to_datetime
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Iterator, List, Dict, Optional
 from pathlib import Path
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from app.core.fetcher.notifier import get_notifier
+from app.core.fetcher.stream_parser import iter_entries, parse_published
+from app.core.status.manifest import RawManifest
+from app.utils import metrics
+from app.utils.config import load_json_config
+from app.utils.helper import atomic_write_json, fsync_dir
+from app.core.status.store import open_status_store
 
 # Constants
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; NewsBot/1.0; +http://example.com/bot)"
 }
 
-PORT_CONFIG_PATH = Path("app/config/ports.json")
 RSS_SOURCE_FILE = Path("app/config/rss_sources.json")
 REGION_SOURCE_FILE = Path("app/config/region_sources.json")
-STATUS_DB_FILE = Path("data/cache/article_status.json")
+FETCH_CONFIG_FILE = Path("app/config/fetch_config.json")
+VALIDATOR_FILE = Path("data/cache/feed_validators.json")
 RAW_DUMP_BASE_DIR = Path("data/raw")
 
+STREAM_CHUNK_SIZE = 16 * 1024
+ITER_QUEUE_SIZE = 256
+DONE = object()
+
+DEFAULT_FETCH_CONFIG = {
+    "max_workers": 8,
+    "per_host_connections": 2,
+    "timeout": 10,
+    "sources": {}
+}
+
 RAW_DUMP_BASE_DIR.mkdir(parents=True, exist_ok=True)
-STATUS_DB_FILE.parent.mkdir(parents=True, exist_ok=True)
-if not STATUS_DB_FILE.exists():
-    with open(STATUS_DB_FILE, "w") as f:
-        json.dump({}, f)
+
+_session = None
+_session_lock = threading.Lock()
+
+def _reset_session_after_fork():
+    # Pooled sockets must never be shared between processes
+    global _session, _session_lock
+    _session = None
+    _session_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_session_after_fork)
 
 def load_rss_sources() -> Dict[str, str]:
-    with open(RSS_SOURCE_FILE, "r") as f:
-        return json.load(f)
+    return load_json_config(RSS_SOURCE_FILE)
 
 def load_region_sources() -> Dict[str, List[str]]:
-    with open(REGION_SOURCE_FILE, "r") as f:
-        return json.load(f)
+    return load_json_config(REGION_SOURCE_FILE)
 
-def load_article_status() -> Dict[str, Dict]:
+def load_fetch_config() -> Dict:
+    return dict(DEFAULT_FETCH_CONFIG, **load_json_config(FETCH_CONFIG_FILE, {}))
+
+def load_feed_validators() -> Dict[str, Dict]:
     try:
-        with open(STATUS_DB_FILE, "r") as f:
+        with open(VALIDATOR_FILE, "r") as f:
             return json.load(f)
     except Exception:
         return {}
 
-def save_article_status(status_data: Dict[str, Dict]):
-    with open(STATUS_DB_FILE, "w") as f:
-        json.dump(status_data, f, indent=2)
+def save_feed_validators(validators: Dict[str, Dict]):
+    atomic_write_json(VALIDATOR_FILE, validators, indent=2)
+
+def get_session(pool_size: int = 2) -> requests.Session:
+    """Shared keep-alive session; urllib3 keeps one connection pool per host."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
 
 def notify_via_socket(message: Dict, host="localhost"):
+    """Send one message through the shared persistent notifier (queued to the outbox on failure)."""
+    return get_notifier().send(message)
+
+def build_host_limits(rss_sources: Dict[str, str], config: Dict) -> Dict[str, threading.Semaphore]:
+    """One semaphore per host; a source override can only tighten its host's limit."""
+    sizes = {}
+    for name, url in rss_sources.items():
+        host = urlparse(url).netloc
+        limit = config["sources"].get(name, {}).get("max_connections", config["per_host_connections"])
+        sizes[host] = min(sizes.get(host, limit), limit)
+    return {host: threading.Semaphore(max(1, size)) for host, size in sizes.items()}
+
+def stream_feed(name: str, url: str, region: str, limit: int, validator: Optional[Dict], timeout: float,
+                host_limit: threading.Semaphore, session: requests.Session, status_store, dump_path: Path,
+                emit: Callable[[Dict], None], manifest: RawManifest = None) -> Dict:
+    """
+    Stream one feed: parse entries as bytes arrive, drop links already done,
+    stop after `limit` entries, and append new articles to an NDJSON dump as
+    they are found. Each new article is also passed to `emit`. The finished
+    dump is queued in the region's raw manifest for the Summarizer.
+    """
+    headers = {}
+    if validator and validator.get("url") == url:
+        if validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if validator.get("last_modified"):
+            headers["If-Modified-Since"] = validator["last_modified"]
+
+    result = {"source": name, "url": url, "region": region, "status": None, "bytes": 0,
+              "new_articles": 0, "dump_path": None, "validator": None}
+    part_path = dump_path.with_name(dump_path.name + ".part")
+    start = time.perf_counter()
+    dump = None
+    new_links = []
     try:
-        with open(PORT_CONFIG_PATH, "r") as f:
-            port_config = json.load(f)
+        with host_limit:
+            result["wait_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            with session.get(url, headers=headers, timeout=timeout, stream=True) as resp:
+                result["status"] = resp.status_code
+                if resp.status_code == 304:
+                    return result
+                resp.raise_for_status()
 
-        region = message.get("region")
-        if not region or region not in port_config:
-            raise ValueError(f"Region '{region}' not found in port config.")
+                def chunks():
+                    for chunk in resp.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                        result["bytes"] += len(chunk)
+                        yield chunk
 
-        port = port_config[region]
+                for seen, entry in enumerate(iter_entries(chunks())):
+                    if seen >= limit:
+                        break
+                    link = entry["link"]
+                    if not link or status_store.is_done(link):
+                        continue
+                    pub_dt = parse_published(entry["published"])
+                    if pub_dt is None:
+                        continue
 
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.connect((host, port))
-            s.sendall(json.dumps(message).encode())
+                    article = {
+                        "title": entry["title"],
+                        "link": link,
+                        "published": pub_dt.isoformat(),
+                        "summary": entry["summary"],
+                        "source_name": name,
+                        "source_url": url,
+                        "region": region
+                    }
+                    if dump is None:
+                        dump_path.parent.mkdir(parents=True, exist_ok=True)
+                        dump = open(part_path, "w", encoding="utf-8")
+                    dump.write(json.dumps(article, ensure_ascii=False) + "\n")
+                    new_links.append(link)
+                    emit(article)
+
+                result["validator"] = {
+                    "url": url,
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified")
+                }
     except Exception as e:
-        print(f"[SOCKET ERROR] Could not send message to queue: {e}")
+        result["status"] = "error"
+        result["error"] = str(e)
+    finally:
+        if dump is not None:
+            # Publish the dump only once complete, so the Summarizer never reads a torn line
+            dump.flush()
+            os.fsync(dump.fileno())
+            dump.close()
+            os.replace(part_path, dump_path)
+            fsync_dir(dump_path.parent)
+            if manifest is not None:
+                manifest.append([{
+                    "path": str(dump_path),
+                    "source": name,
+                    "date": dump_path.parent.parent.name,
+                    "fetched_at": dump_path.stem.replace("fetched_", ""),
+                    "items": len(new_links),
+                    "bytes": dump_path.stat().st_size,
+                }])
+            status_store.mark_fetched(new_links)
+            result["dump_path"] = str(dump_path)
+            result["new_articles"] = len(new_links)
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+def iter_articles(region: str = None, limit: int = 50, sources: List[str] = None, notify: bool = True,
+                  stats: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Fetch all feeds for a region concurrently and yield new articles as they are parsed.
 
-def fetch_articles(region: str = None, limit: int = 50, sources: List[str] = None) -> List[Dict]:
+    Memory is bounded by the queue between fetch threads and the caller, not by
+    the number of feeds or articles. Per-feed status/timings are written into
+    `stats` (if given) once the iterator is exhausted. Feeds answering 304 Not
+    Modified are neither parsed nor written. With notify=False no receiver is
+    told about the dumps (the orchestrator summarizes in-process right after).
+    """
     rss_sources = load_rss_sources()
     region_sources = load_region_sources()
-    status_db = load_article_status()
+    config = load_fetch_config()
+    validators = load_feed_validators()
+    stats = stats if stats is not None else {}
+    stats.update({"feeds": {}, "article_count": 0, "elapsed_ms": 0.0})
 
     region_lookup = {}
     for reg, source_list in region_sources.items():
@@ -77,64 +220,108 @@ def fetch_articles(region: str = None, limit: int = 50, sources: List[str] = Non
         source_list = region_sources.get(region, [])
         rss_sources = {k: v for k, v in rss_sources.items() if k in source_list}
 
-    all_articles = []
+    if not rss_sources:
+        return
+
+    run_start = time.perf_counter()
     now = datetime.utcnow()
     fetch_date_str = now.strftime("%Y-%m-%d")
     fetch_time_str = now.strftime("%Y-%m-%dT%H-%M-%S")
 
-    for name, url in rss_sources.items():
-        region = region_lookup.get(name, "unknown")
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=10)
-            resp.raise_for_status()
-            feed = feedparser.parse(resp.content)
-        except Exception as e:
-            print(f"[ERROR] Failed to fetch {url}: {e}")
-            continue
-
-        new_articles = []
-
-        for entry in feed.entries[:limit]:
-            link = entry.get("link", "")
-            if not link or (link in status_db and status_db[link]["status"] == "done"):
-                continue
+    status_store = open_status_store()
+    host_limits = build_host_limits(rss_sources, config)
+    session = get_session(pool_size=max(1, config["per_host_connections"]))
+    max_workers = max(1, min(config["max_workers"], len(rss_sources)))
+    dumps_by_region = {}
+
+    # Fetch threads hand articles over through a bounded queue; DONE marks a finished feed
+    handoff = queue.Queue(maxsize=ITER_QUEUE_SIZE)
+    cancelled = threading.Event()
 
+    def emit(article):
+        while not cancelled.is_set():
             try:
-                pub_dt = parsedate_to_datetime(entry.get("published", "")).astimezone(timezone.utc)
-            except Exception:
+                handoff.put(article, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def run_feed(name, url):
+        feed_region = region_lookup.get(name, "unknown")
+        timeout = config["sources"].get(name, {}).get("timeout", config["timeout"])
+        dump_path = RAW_DUMP_BASE_DIR / feed_region / fetch_date_str / name / f"fetched_{fetch_time_str}.ndjson"
+        try:
+            return stream_feed(name, url, feed_region, limit, validators.get(name), timeout,
+                               host_limits[urlparse(url).netloc], session, status_store, dump_path, emit,
+                               RawManifest(RAW_DUMP_BASE_DIR, feed_region))
+        finally:
+            emit(DONE)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+    try:
+        futures = [pool.submit(run_feed, name, url) for name, url in rss_sources.items()]
+        remaining = len(futures)
+        while remaining:
+            item = handoff.get()
+            if item is DONE:
+                remaining -= 1
                 continue
+            stats["article_count"] += 1
+            yield item
+
+        for future in futures:
+            result = future.result()
+            name, url = result["source"], result["url"]
+            stats["feeds"][name] = {k: result.get(k) for k in ("status", "bytes", "elapsed_ms", "wait_ms", "new_articles")}
+            metrics.count("feeds_fetched", status=result["status"])
+            metrics.count("fetch_bytes", result["bytes"])
+            metrics.count("articles_fetched", result["new_articles"], region=result["region"])
+            metrics.observe("feed_fetch", result["elapsed_ms"] / 1000, source=name)
+
+            if result["status"] == "error":
+                print(f"[ERROR] Failed to fetch {url}: {result.get('error')}")
+            elif result["status"] == 304:
+                print(f"[SKIP] {name} not modified ({result['elapsed_ms']} ms)")
+            if result["dump_path"]:
+                print(f"[OK] Saved {result['new_articles']} new articles from {name} to {result['dump_path']} "
+                      f"({result['elapsed_ms']} ms)")
+                dumps_by_region.setdefault(result["region"], []).append((name, result["dump_path"]))
+            if result["validator"]:
+                validators[name] = result["validator"]
+    finally:
+        # Also reached when the caller stops iterating early
+        cancelled.set()
+        pool.shutdown(wait=True)
+        status_store.close()
+
+    save_feed_validators(validators)
+    stats["elapsed_ms"] = round((time.perf_counter() - run_start) * 1000, 1)
+    metrics.record_stage("fetch", stats["elapsed_ms"] / 1000, region=region or "all")
+    metrics.REGISTRY.dump()
+
+    # One batched notification per region for the whole cycle; undelivered ones wait in the outbox
+    if notify:
+        notifier = get_notifier()
+        for reg, dumps in dumps_by_region.items():
+            notifier.notify_files(reg, [path for _, path in dumps], [src for src, _ in dumps])
+        if not dumps_by_region:
+            notifier.flush()
+
+def fetch_articles(region: str = None, limit: int = 50, sources: List[str] = None, notify: bool = True,
+                   collect: bool = True) -> Dict:
+    """
+    Fetch all feeds for a region concurrently.
 
-            pub_str = pub_dt.isoformat()
-            article = {
-                "title": entry.get("title", ""),
-                "link": link,
-                "published": pub_str,
-                "summary": entry.get("summary", ""),
-                "source_name": name,
-                "source_url": url,
-                "region": region
-            }
-
-            new_articles.append(article)
-            status_db[link] = {"uuid": None, "status": "fetched"}
-
-        if new_articles:
-            dump_dir = RAW_DUMP_BASE_DIR / region / fetch_date_str / name
-            dump_dir.mkdir(parents=True, exist_ok=True)
-            dump_path = dump_dir / f"fetched_{fetch_time_str}.json"
-
-            with open(dump_path, "w") as f:
-                json.dump(new_articles, f, indent=2)
-
-            print(f"[OK] Saved {len(new_articles)} new articles from {name} to {dump_path}")
-            notify_via_socket({
-                "task": "summarize",
-                "region": region,
-                "source": name,
-                "file": str(dump_path)
-            })
-
-            all_articles.extend(new_articles)
-
-    save_article_status(status_db)
-    return all_articles
\ No newline at end of file
+    Returns {"articles": [...], "article_count": int, "feeds": {source: timing/status},
+    "elapsed_ms": float}. With collect=False the articles are only written to
+    the raw dumps and "articles" stays empty; use iter_articles to stream them.
+    """
+    stats = {}
+    articles = []
+    for article in iter_articles(region, limit, sources, notify, stats):
+        if collect:
+            articles.append(article)
+    stats.setdefault("feeds", {})
+    stats.setdefault("article_count", 0)
+    stats.setdefault("elapsed_ms", 0.0)
+    return dict(stats, articles=articles)
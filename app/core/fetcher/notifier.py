@@ -0,0 +1,159 @@
+import fcntl
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PORT_CONFIG_PATH = Path("app/config/ports.json")
+OUTBOX_DIR = Path("data/cache/outbox")
+
+
+class Notifier:
+    """
+    Delivers fetch notifications to regional receivers.
+
+    Ports are read once, one connection per region is kept open across fetch
+    cycles, and every message must be acknowledged by the receiver. Anything
+    that cannot be delivered is appended to an on-disk outbox that is replayed,
+    in order, before the next message to that region.
+    """
+
+    def __init__(self, host="localhost", port_config=PORT_CONFIG_PATH, outbox_dir=OUTBOX_DIR, timeout=5.0):
+        self.host = host
+        self.timeout = timeout
+        self.outbox_dir = Path(outbox_dir)
+        self.outbox_dir.mkdir(parents=True, exist_ok=True)
+        with open(port_config, "r") as f:
+            self.ports = json.load(f)
+        self._conns: Dict[str, socket.socket] = {}
+        self._readers = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, region: str):
+        if region in self._conns:
+            return self._conns[region], self._readers[region]
+        sock = socket.create_connection((self.host, self.ports[region]), timeout=self.timeout)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self._conns[region] = sock
+        self._readers[region] = sock.makefile("rb")
+        return sock, self._readers[region]
+
+    def _disconnect(self, region: str):
+        sock = self._conns.pop(region, None)
+        reader = self._readers.pop(region, None)
+        for closable in (reader, sock):
+            try:
+                if closable:
+                    closable.close()
+            except OSError:
+                pass
+
+    def _deliver(self, region: str, line: bytes) -> bool:
+        # A cached connection may have died while idle, so retry once on a fresh one
+        for attempt in range(2):
+            try:
+                sock, reader = self._connect(region)
+                sock.sendall(line)
+                ack = reader.readline()
+                if ack and json.loads(ack).get("ok"):
+                    return True
+                raise ConnectionError("receiver closed the connection without acknowledging")
+            except (OSError, ValueError) as e:
+                self._disconnect(region)
+                if attempt == 1:
+                    print(f"[SOCKET ERROR] Could not deliver to {region} receiver: {e}")
+        return False
+
+    def _outbox_path(self, region: str) -> Path:
+        return self.outbox_dir / f"{region}.ndjson"
+
+    def _flush_outbox(self, region: str) -> bool:
+        path = self._outbox_path(region)
+        if not path.exists():
+            return True
+        with open(path, "r+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            lines = [line for line in f.read().splitlines(keepends=True) if line.strip()]
+            sent = 0
+            for line in lines:
+                if not self._deliver(region, line):
+                    break
+                sent += 1
+            remaining = lines[sent:]
+            f.seek(0)
+            f.truncate()
+            f.writelines(remaining)
+            f.flush()
+            os.fsync(f.fileno())
+        if sent:
+            print(f"[OUTBOX] Replayed {sent} queued message(s) to {region}")
+        if not remaining:
+            path.unlink(missing_ok=True)
+        return not remaining
+
+    def _enqueue(self, region: str, line: bytes):
+        with open(self._outbox_path(region), "ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        print(f"[OUTBOX] Queued message for {region}")
+
+    def send(self, message: Dict) -> bool:
+        region = message.get("region")
+        if not region or region not in self.ports:
+            print(f"[SOCKET ERROR] Region '{region}' not found in port config.")
+            return False
+        line = (json.dumps(message) + "\n").encode()
+        with self._lock:
+            # Keep ordering: never overtake messages still sitting in the outbox
+            if self._flush_outbox(region) and self._deliver(region, line):
+                return True
+            self._enqueue(region, line)
+            return False
+
+    def notify_files(self, region: str, files: List[str], sources: Optional[List[str]] = None) -> bool:
+        """One batched message for every dump file a fetch cycle produced."""
+        return self.send({
+            "task": "summarize",
+            "region": region,
+            "files": files,
+            "sources": sources or [],
+        })
+
+    def flush(self, region: Optional[str] = None):
+        """Replay queued messages even when this cycle produced nothing new."""
+        regions = [region] if region else [p.stem for p in self.outbox_dir.glob("*.ndjson")]
+        with self._lock:
+            for reg in regions:
+                if reg in self.ports:
+                    self._flush_outbox(reg)
+
+    def close(self):
+        with self._lock:
+            for region in list(self._conns):
+                self._disconnect(region)
+
+
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
+def _reset_notifier_after_fork():
+    global _notifier, _notifier_lock
+    _notifier = None
+    _notifier_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_notifier_after_fork)
+
+
+def get_notifier() -> Notifier:
+    """Process-wide notifier so long-running callers reuse connections between cycles."""
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            _notifier = Notifier()
+        return _notifier
@@ -0,0 +1,115 @@
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+# Local names (namespace stripped) of the elements we read from RSS 2.0, RSS 1.0/RDF and Atom
+ENTRY_TAGS = {"item", "entry"}
+TITLE_TAGS = ("title",)
+LINK_TAGS = ("link",)
+DATE_TAGS = ("pubDate", "published", "date", "updated")
+SUMMARY_TAGS = ("description", "summary", "encoded", "content")
+
+
+def local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_published(value: str) -> Optional[datetime]:
+    """RFC 822 dates (RSS) and ISO 8601 dates (Atom, dc:date) as aware UTC datetimes."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        dt = parsedate_to_datetime(value)
+    except Exception:
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _entry_from_element(elem) -> Dict:
+    fields = {}
+    for child in elem:
+        name = local_name(child.tag)
+        if name == "link" and "link" not in fields:
+            # Atom links carry the URL in href; prefer rel="alternate" (the default)
+            href = child.get("href")
+            if href is not None:
+                if child.get("rel", "alternate") == "alternate":
+                    fields["link"] = href
+                continue
+        if name not in fields:
+            fields[name] = "".join(child.itertext()).strip()
+
+    def first(names):
+        for name in names:
+            if fields.get(name):
+                return fields[name]
+        return ""
+
+    return {
+        "title": first(TITLE_TAGS),
+        "link": first(LINK_TAGS),
+        "published": first(DATE_TAGS),
+        "summary": first(SUMMARY_TAGS),
+    }
+
+
+def iter_entries(chunks: Iterable[bytes]) -> Iterator[Dict]:
+    """
+    Parse a feed incrementally, yielding {"title", "link", "published", "summary"}.
+
+    Each entry element is cleared once read, so memory stays bounded by one
+    entry plus the parser's buffer. If the document is not well-formed XML
+    before the first entry, the remaining bytes are handed to feedparser,
+    which tolerates broken markup; the raw bytes are only retained until then.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    head = bytearray()
+    yielded = False
+    depth = 0
+    chunks = iter(chunks)
+
+    for chunk in chunks:
+        if not yielded:
+            head.extend(chunk)
+        try:
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if local_name(elem.tag) not in ENTRY_TAGS:
+                    continue
+                if event == "start":
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth == 0:
+                    yield _entry_from_element(elem)
+                    elem.clear()
+                    if not yielded:
+                        yielded = True
+                        head = bytearray()
+        except ET.ParseError as e:
+            if yielded:
+                print(f"[WARN] Feed became malformed after some entries, stopping: {e}")
+                return
+            head.extend(b"".join(chunks))
+            yield from iter_entries_fallback(bytes(head))
+            return
+
+
+def iter_entries_fallback(content: bytes) -> Iterator[Dict]:
+    # Only malformed or exotic feeds get here, so most fetch runs never import feedparser
+    import feedparser
+
+    for entry in feedparser.parse(content).entries:
+        yield {
+            "title": entry.get("title", ""),
+            "link": entry.get("link", ""),
+            "published": entry.get("published", "") or entry.get("updated", ""),
+            "summary": entry.get("summary", ""),
+        }
@@ -0,0 +1,158 @@
+import argparse
+import os
+import random
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+from app.utils import metrics
+from app.utils.config import load_json_config, region_timezones
+
+REGION_CONFIG = Path("app/config/regions.json")
+REGION_SOURCE_FILE = Path("app/config/region_sources.json")
+SCHEDULE_CONFIG = Path("app/config/schedule.json")
+
+DEFAULT_SCHEDULE = {"interval_seconds": 60, "jitter_seconds": 5, "limit": 50}
+
+# Per worker process: region -> (Summarizer, TopKPrecomputer), kept warm between cycles
+_WARM = {}
+
+
+def load_schedule(regions: List[str]) -> Dict[str, Dict]:
+    config = dict({"default": {}, "regions": {}}, **load_json_config(SCHEDULE_CONFIG, {}))
+    base = dict(DEFAULT_SCHEDULE, **config["default"])
+    return {region: dict(base, **config["regions"].get(region, {})) for region in regions}
+
+
+def schedulable_regions() -> List[str]:
+    """Regions that have both feeds and a timezone."""
+    region_sources = load_json_config(REGION_SOURCE_FILE)
+    timezones = region_timezones(REGION_CONFIG)
+    return [region for region in region_sources if region in timezones]
+
+
+def _warm_pipeline(region: str):
+    from app.core.summarizer.summarizer import Summarizer
+    from app.core.summarizer.topk_precomputer import TopKPrecomputer
+
+    cached = _WARM.get(region)
+    if cached is None:
+        cached = _WARM[region] = (Summarizer(region=region), TopKPrecomputer())
+    # update() binds each pending fetch date itself; rebinding here only drops yesterday's cluster index
+    cached[0].bind_date(datetime.utcnow().strftime("%Y-%m-%d"))
+    return cached
+
+
+def run_region_cycle(region: str, limit: int = 50) -> Dict:
+    """One fetch -> summarize -> top-k cycle, executed inside the region's worker process."""
+    from app.core.fetcher.fetcher import fetch_articles
+
+    metrics.set_process_name(f"orchestrator_{region}")
+    with metrics.profile_run(f"cycle_{region}"), metrics.record_run() as run:
+        start = time.perf_counter()
+        with metrics.span("warm", region=region):
+            summarizer, topk = _warm_pipeline(region)
+
+        fetched = fetch_articles(region=region, limit=limit, notify=False, collect=False)
+
+        # Always run: raw files left by an earlier failed cycle are picked up too
+        process_log = summarizer.update()
+        dates = topk.precompute_from_log(process_log) if process_log else []
+        metrics.record_stage("cycle", time.perf_counter() - start, region=region)
+
+        return {
+            "region": region,
+            "articles": fetched["article_count"],
+            "uuids": len(process_log["uuids_processed"]) if process_log else 0,
+            "dates": dates,
+            "total_ms": round((time.perf_counter() - start) * 1000, 1),
+            "metrics": run.as_dict(),
+        }
+
+
+class Orchestrator:
+    """
+    Long-running replacement for the cron-driven sender/receiver scripts.
+
+    Each region gets its own single-process pool, so its Summarizer and
+    TopKPrecomputer stay warm across cycles, regions run in parallel on
+    separate cores, and a region never overlaps with its own previous cycle.
+    """
+
+    def __init__(self, regions: List[str] = None):
+        self.regions = regions or schedulable_regions()
+        self.schedule = load_schedule(self.regions)
+        self.pools = {region: ProcessPoolExecutor(max_workers=1) for region in self.regions}
+        self.running = {}
+        self.next_run = {region: time.monotonic() + random.uniform(0, self.schedule[region]["jitter_seconds"])
+                         for region in self.regions}
+        self.stopping = False
+
+    def log(self, message: str):
+        print(f"[ORCHESTRATOR] {message}")
+
+    def _collect(self):
+        for region, future in list(self.running.items()):
+            if not future.done():
+                continue
+            del self.running[region]
+            try:
+                result = future.result()
+                stages = ", ".join(f"{k} {v} ms" for k, v in result["metrics"]["stages_ms"].items())
+                self.log(f"{region}: {result['articles']} articles, {result['uuids']} summaries, "
+                         f"{len(result['dates'])} dates in {result['total_ms']} ms ({stages})")
+            except Exception as e:
+                self.log(f"{region}: cycle failed: {e}")
+
+    def tick(self):
+        self._collect()
+        now = time.monotonic()
+        for region in self.regions:
+            if now < self.next_run[region]:
+                continue
+            cfg = self.schedule[region]
+            self.next_run[region] = now + cfg["interval_seconds"] + random.uniform(0, cfg["jitter_seconds"])
+            if region in self.running:
+                self.log(f"{region}: previous cycle still running, skipping this one")
+                continue
+            self.running[region] = self.pools[region].submit(run_region_cycle, region, cfg["limit"])
+
+    def run(self, once: bool = False):
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "stopping", True))
+        self.log(f"Scheduling regions: {', '.join(self.regions)}")
+        try:
+            if once:
+                for region in self.regions:
+                    self.next_run[region] = 0
+                self.tick()
+                while self.running:
+                    time.sleep(0.2)
+                    self._collect()
+                return
+            while not self.stopping:
+                self.tick()
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        self.log("Shutting down, waiting for running cycles...")
+        for pool in self.pools.values():
+            pool.shutdown(wait=True)
+        self._collect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run fetch -> summarize -> top-k for all regions.")
+    parser.add_argument("--region", action="append", help="Region to schedule (repeatable, default all)")
+    parser.add_argument("--once", action="store_true", help="Run a single cycle per region and exit")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"],
+                        help="Profile every cycle and write reports to data/log/profile")
+    args = parser.parse_args()
+    if args.profile:
+        os.environ["PIPELINE_PROFILE"] = args.profile
+    Orchestrator(args.region).run(once=args.once)
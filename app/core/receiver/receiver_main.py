@@ -1,43 +1,152 @@
-import socket
+import asyncio
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from app.core.summarizer.summarizer import Summarizer
 from app.core.summarizer.topk_precomputer import TopKPrecomputer
+from app.utils import metrics
+from app.utils.config import load_json_config
 
 PORT_CONFIG_FILE = Path("app/config/ports.json")
 
+# Messages are newline-delimited JSON; a legacy sender that writes one object
+# and closes the socket is accepted too because EOF ends the last line.
+MAX_MESSAGE_BYTES = 1024 * 1024
+
 def load_port(region: str) -> int:
     if not PORT_CONFIG_FILE.exists():
         raise FileNotFoundError(f"Port config file not found at {PORT_CONFIG_FILE}")
-    with open(PORT_CONFIG_FILE, "r") as f:
-        port_config = json.load(f)
+    port_config = load_json_config(PORT_CONFIG_FILE)
     if region not in port_config:
         raise ValueError(f"No port configured for region '{region}'")
     return port_config[region]
 
-def start_region_receiver(region: str, host="localhost"):
-    port = load_port(region)
-    summarizer = Summarizer(region=region)
-    topk = TopKPrecomputer()
-
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
-        server.bind((host, port))
-        server.listen()
-        print(f"[RECEIVER {region.upper()}] Listening on {host}:{port}...")
-        while True:
-            conn, addr = server.accept()
-            with conn:
-                data = conn.recv(4096)
-                if not data:
+
+class RegionReceiver:
+    """
+    Accepts fetch notifications for one region and runs summarize + top-k.
+
+    Notifications go onto a queue; the worker waits `debounce_seconds` after
+    each one (up to `max_wait_seconds` in total) so a burst from one fetch
+    cycle becomes a single pipeline run. The pipeline runs on a dedicated
+    thread, so the event loop keeps accepting connections meanwhile.
+    """
+
+    def __init__(self, region: str, host="localhost", port=None, debounce_seconds=2.0, max_wait_seconds=10.0,
+                 summarizer=None, topk=None):
+        self.region = region
+        self.host = host
+        self.port = port or load_port(region)
+        self.debounce_seconds = debounce_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.summarizer = summarizer or Summarizer(region=region)
+        self.topk = topk or TopKPrecomputer()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"pipeline-{region}")
+        self.queue = None
+        self.stats = {
+            "received": 0,
+            "runs": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "last_batch_size": 0,
+            "last_run_ms": None,
+        }
+
+    def snapshot(self) -> dict:
+        return dict(self.stats, queue_depth=self.queue.qsize() if self.queue else 0, region=self.region)
+
+    def log(self, message: str):
+        print(f"[RECEIVER {self.region.upper()}] {message}")
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    self.log("Dropped oversized message")
+                    break
+                if not line:
+                    break
+                if not line.strip():
                     continue
                 try:
-                    msg = json.loads(data.decode())
-                    if msg.get("region") != region:
-                        continue
+                    msg = json.loads(line.decode())
+                except Exception as e:
+                    self.log(f"Error: bad message: {e}")
+                    writer.write(b'{"ok": false, "error": "bad message"}\n')
+                    await writer.drain()
+                    continue
 
-                    print(f"[RECEIVER {region.upper()}] Received file: {msg['file']}")
-                    summarizer.update()
-                    topk.precompute_top_k(regions=[region])
+                if msg.get("task") == "stats":
+                    writer.write((json.dumps(self.snapshot()) + "\n").encode())
+                    await writer.drain()
+                    continue
+                if msg.get("region") != self.region:
+                    writer.write(b'{"ok": false, "error": "wrong region"}\n')
+                    await writer.drain()
+                    continue
 
-                except Exception as e:
-                    print(f"[RECEIVER {region.upper()}] Error: {e}")
\ No newline at end of file
+                self.stats["received"] += 1
+                self.queue.put_nowait(msg)
+                writer.write(b'{"ok": true}\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # Persistent sender connections are simply dropped on shutdown
+            pass
+        finally:
+            writer.close()
+
+    async def next_batch(self) -> list:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while True:
+            remaining = min(self.debounce_seconds, deadline - time.monotonic())
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def run_pipeline(self, batch: list):
+        # The Summarizer scans every pending raw file, so one run covers the whole batch
+        files = [f for m in batch for f in (m.get("files") or [m.get("file")])]
+        self.log(f"Processing {len(batch)} notification(s): {files}")
+        process_log = self.summarizer.update()
+        if process_log:
+            self.topk.precompute_from_log(process_log)
+
+    async def worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.next_batch()
+            self.stats["last_batch_size"] = len(batch)
+            self.stats["coalesced"] += len(batch) - 1
+            start = time.perf_counter()
+            try:
+                await loop.run_in_executor(self.executor, self.run_pipeline, batch)
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.log(f"Error: {e}")
+            self.stats["runs"] += 1
+            self.stats["last_run_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    async def serve(self):
+        self.queue = asyncio.Queue()
+        server = await asyncio.start_server(self.handle_client, self.host, self.port, limit=MAX_MESSAGE_BYTES)
+        worker = asyncio.create_task(self.worker())
+        self.log(f"Listening on {self.host}:{self.port}...")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            worker.cancel()
+            self.executor.shutdown(wait=True)
+
+
+def start_region_receiver(region: str, host="localhost"):
+    metrics.set_process_name(f"receiver_{region}")
+    asyncio.run(RegionReceiver(region, host=host).serve())
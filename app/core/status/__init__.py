@@ -0,0 +1 @@
+# status init
\ No newline at end of file
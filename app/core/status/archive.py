@@ -0,0 +1,292 @@
+import argparse
+import fcntl
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.utils.helper import atomic_write_json, fsync_dir, read_dump
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SEGMENT_ROOT = "segments"
+LOOSE_ROOT = "raw"
+INDEX_SUFFIX = ".idx.json"
+LOCK_FILE = "compact.lock"
+
+CODECS = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd segments need the zstandard package")
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd segments need the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class ArchiveStore:
+    """
+    Archived fetches for one region: loose files plus compacted day segments.
+
+    The Summarizer moves processed dumps to archive/raw/{region}/{date}/{source}/.
+    compact() rolls each (date, source) directory into one compressed NDJSON
+    segment under archive/segments/{region}/{date}/{source}.ndjson.{gz,zst}.
+    Every fetch file becomes its own gzip member or zstd frame, so concatenated
+    they still form one valid stream. The sidecar {source}.idx.json records
+    each member's fetch name, byte offset, length and item count, so one fetch
+    can be read back without decompressing the whole day.
+
+    The index is authoritative. Bytes past its last member (from a crash
+    mid-append) are truncated before the next append. Loose files are deleted
+    only after the index naming them is durable, and fetches already indexed
+    are skipped, so re-running after a crash never duplicates data.
+    """
+
+    def __init__(self, base_dir="data", region="us"):
+        self.region = region
+        self.root = Path(base_dir) / "archive"
+        self.loose_dir = self.root / LOOSE_ROOT / region
+        self.segment_dir = self.root / SEGMENT_ROOT / region
+
+    def _lock(self):
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        handle = open(self.segment_dir / LOCK_FILE, "a")
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def segment_path(self, date_str: str, source: str, codec: str) -> Path:
+        return self.segment_dir / date_str / f"{source}{CODECS[codec]}"
+
+    def index_path(self, date_str: str, source: str) -> Path:
+        return self.segment_dir / date_str / f"{source}{INDEX_SUFFIX}"
+
+    def load_index(self, date_str: str, source: str) -> Optional[Dict]:
+        try:
+            with open(self.index_path(date_str, source), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    # Compaction
+
+    def compact(self, before: Optional[str] = None, codec: Optional[str] = None) -> Dict:
+        """
+        Compact every loose (date, source) directory with date < `before`
+        (default: all). Returns files, items and bytes before/after.
+        """
+        stats = {"files": 0, "items": 0, "bytes_in": 0, "bytes_out": 0, "segments": 0}
+        if not self.loose_dir.exists():
+            return stats
+        with self._lock():
+            for date_dir in sorted(p for p in self.loose_dir.iterdir() if p.is_dir()):
+                if before is not None and date_dir.name >= before:
+                    continue
+                for source_dir in sorted(p for p in date_dir.iterdir() if p.is_dir()):
+                    result = self._compact_source(date_dir.name, source_dir, codec)
+                    for key, value in result.items():
+                        stats[key] += value
+                    if result["files"]:
+                        stats["segments"] += 1
+                _remove_if_empty(date_dir)
+        return stats
+
+    def _compact_source(self, date_str: str, source_dir: Path, codec: Optional[str]) -> Dict:
+        source = source_dir.name
+        index = self.load_index(date_str, source)
+        if index is None:
+            index = {"codec": codec or default_codec(), "members": []}
+        codec = index["codec"]
+        segment = self.segment_path(date_str, source, codec)
+        segment.parent.mkdir(parents=True, exist_ok=True)
+        indexed = {member["fetch"] for member in index["members"]}
+        end = index["members"][-1]["offset"] + index["members"][-1]["length"] if index["members"] else 0
+
+        stats = {"files": 0, "items": 0, "bytes_in": 0, "bytes_out": 0}
+        files = sorted(source_dir.glob("fetched_*.*json"))
+        consumed = []
+        with open(segment, "ab") as out:
+            # Drop a member whose index entry never got written
+            out.truncate(end)
+            for fpath in files:
+                fetch_name = fpath.stem.replace("fetched_", "")
+                consumed.append(fpath)
+                if fetch_name in indexed:
+                    continue
+                try:
+                    with open(fpath, "r") as f:
+                        items = read_dump(f, fpath.suffix)
+                except (OSError, ValueError) as e:
+                    consumed.pop()
+                    print(f"[WARN] Skipped unreadable {fpath}: {e}")
+                    continue
+                data = "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items).encode("utf-8")
+                member = compress(data, codec)
+                out.write(member)
+                index["members"].append({"fetch": fetch_name, "offset": end, "length": len(member),
+                                         "items": len(items), "raw_bytes": len(data)})
+                indexed.add(fetch_name)
+                end += len(member)
+                stats["files"] += 1
+                stats["items"] += len(items)
+                stats["bytes_in"] += fpath.stat().st_size
+                stats["bytes_out"] += len(member)
+            out.flush()
+            os.fsync(out.fileno())
+
+        if stats["files"]:
+            atomic_write_json(self.index_path(date_str, source), index)
+        for fpath in consumed:
+            fpath.unlink()
+        if consumed:
+            fsync_dir(source_dir)
+        _remove_if_empty(source_dir)
+        return stats
+
+    # Reading
+
+    def dates(self) -> List[str]:
+        found = set()
+        for root in (self.loose_dir, self.segment_dir):
+            if root.exists():
+                found.update(p.name for p in root.iterdir() if p.is_dir())
+        return sorted(found)
+
+    def sources(self, date_str: str) -> List[str]:
+        found = set()
+        loose = self.loose_dir / date_str
+        if loose.exists():
+            found.update(p.name for p in loose.iterdir() if p.is_dir())
+        segments = self.segment_dir / date_str
+        if segments.exists():
+            found.update(p.name[:-len(INDEX_SUFFIX)] for p in segments.glob(f"*{INDEX_SUFFIX}"))
+        return sorted(found)
+
+    def read_fetch(self, date_str: str, source: str, fetch_name: str) -> Optional[List[Dict]]:
+        """One fetch's items, decompressing only its member; None if it is not in the archive."""
+        index = self.load_index(date_str, source)
+        for member in (index or {}).get("members", []):
+            if member["fetch"] == fetch_name:
+                with open(self.segment_path(date_str, source, index["codec"]), "rb") as f:
+                    f.seek(member["offset"])
+                    return _parse_member(f.read(member["length"]), index["codec"])
+        for fpath in (self.loose_dir / date_str / source).glob(f"fetched_{fetch_name}.*json"):
+            with open(fpath, "r") as f:
+                return read_dump(f, fpath.suffix)
+        return None
+
+    def iter_fetches(self, date_str: str, source: str) -> Iterator[Tuple[str, List[Dict]]]:
+        """(fetch name, items) for one source and date, compacted members first, then loose files."""
+        index = self.load_index(date_str, source)
+        seen = set()
+        if index is not None:
+            with open(self.segment_path(date_str, source, index["codec"]), "rb") as f:
+                for member in index["members"]:
+                    f.seek(member["offset"])
+                    seen.add(member["fetch"])
+                    yield member["fetch"], _parse_member(f.read(member["length"]), index["codec"])
+        loose = self.loose_dir / date_str / source
+        if loose.exists():
+            for fpath in sorted(loose.glob("fetched_*.*json")):
+                fetch_name = fpath.stem.replace("fetched_", "")
+                if fetch_name in seen:
+                    continue
+                try:
+                    with open(fpath, "r") as f:
+                        yield fetch_name, read_dump(f, fpath.suffix)
+                except FileNotFoundError:
+                    # Compacted between listing and reading; its member was already yielded or is newer
+                    continue
+
+    def iter_items(self, start: Optional[str] = None, end: Optional[str] = None,
+                   sources: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        Stream archived articles for dates in [start, end], oldest first.
+        Each item carries "fetch_name" and "source" like the Summarizer's input.
+        """
+        for date_str in self.dates():
+            if (start and date_str < start) or (end and date_str > end):
+                continue
+            for source in self.sources(date_str):
+                if sources and source not in sources:
+                    continue
+                for fetch_name, items in self.iter_fetches(date_str, source):
+                    for item in items:
+                        item.setdefault("source", source)
+                        item["fetch_name"] = fetch_name
+                        yield item
+
+    def stats(self) -> Dict:
+        loose_files = loose_bytes = segment_files = segment_bytes = members = 0
+        if self.loose_dir.exists():
+            for fpath in self.loose_dir.glob("*/*/fetched_*.*json"):
+                loose_files += 1
+                loose_bytes += fpath.stat().st_size
+        if self.segment_dir.exists():
+            for fpath in self.segment_dir.glob("*/*"):
+                if fpath.is_file():
+                    segment_files += 1
+                    segment_bytes += fpath.stat().st_size
+                    if fpath.name.endswith(INDEX_SUFFIX):
+                        with open(fpath, "r") as f:
+                            members += len(json.load(f)["members"])
+        return {"region": self.region, "loose_files": loose_files, "loose_bytes": loose_bytes,
+                "segment_files": segment_files, "segment_bytes": segment_bytes, "compacted_fetches": members}
+
+
+def _parse_member(data: bytes, codec: str) -> List[Dict]:
+    return [json.loads(line) for line in decompress(data, codec).splitlines() if line.strip()]
+
+
+def _remove_if_empty(path: Path):
+    try:
+        path.rmdir()
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact archived raw fetches into compressed day segments.")
+    parser.add_argument("command", choices=["compact", "stats"])
+    parser.add_argument("--base-dir", default="data")
+    parser.add_argument("--region", action="append", help="Region to process (repeatable, default all archived)")
+    parser.add_argument("--min-age-days", type=int, default=1,
+                        help="Only compact dates at least this many days before today (UTC); 0 compacts everything")
+    parser.add_argument("--codec", choices=sorted(CODECS), default=None,
+                        help="Codec for new segments (default zstd if installed, else gzip)")
+    args = parser.parse_args()
+
+    regions = args.region
+    if not regions:
+        loose_root = Path(args.base_dir) / "archive" / LOOSE_ROOT
+        regions = sorted(p.name for p in loose_root.iterdir() if p.is_dir()) if loose_root.exists() else []
+    before = None
+    if args.min_age_days > 0:
+        before = (datetime.now(timezone.utc) - timedelta(days=args.min_age_days - 1)).strftime("%Y-%m-%d")
+
+    for region in regions:
+        store = ArchiveStore(args.base_dir, region)
+        if args.command == "compact":
+            result = store.compact(before=before, codec=args.codec)
+            ratio = result["bytes_in"] / result["bytes_out"] if result["bytes_out"] else 0
+            print(f"[COMPACT] {region}: {result['files']} files ({result['items']} items) into "
+                  f"{result['segments']} segments, {result['bytes_in']} -> {result['bytes_out']} bytes ({ratio:.1f}x)")
+        else:
+            print(json.dumps(store.stats()))
@@ -0,0 +1,130 @@
+import argparse
+import fcntl
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app.utils.helper import atomic_write_json, fsync_dir
+
+MANIFEST_FILE = "manifest.ndjson"
+CURSOR_FILE = "manifest.cursor"
+LOCK_FILE = "manifest.lock"
+
+
+class RawManifest:
+    """
+    Append-only queue of raw dump files for one region, across dates.
+
+    The fetcher appends one line per published dump (path, source, date, item
+    count, size). The Summarizer reads everything past its cursor, the byte
+    offset of the first unconsumed line, and advances the cursor once those
+    files are archived. No directory walk is needed on either side. A fully
+    consumed manifest is truncated on advance so it never grows unbounded.
+    """
+
+    def __init__(self, raw_root="data/raw", region="us"):
+        self.region = region
+        self.dir = Path(raw_root) / region
+        self.path = self.dir / MANIFEST_FILE
+        self.cursor_path = self.dir / CURSOR_FILE
+        self.lock_path = self.dir / LOCK_FILE
+
+    def _lock(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        handle = open(self.lock_path, "a")
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def append(self, entries: List[Dict]):
+        if not entries:
+            return
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode()
+        with self._lock():
+            with open(self.path, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def cursor(self) -> int:
+        try:
+            with open(self.cursor_path, "r") as f:
+                return int(json.load(f)["offset"])
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def pending(self) -> Tuple[List[Dict], int]:
+        """Entries past the cursor whose file still exists, and the offset just after the last one read."""
+        offset = self.cursor()
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return [], 0
+        if offset > size:
+            # Truncated after the cursor was saved; every line in the file is new
+            offset = 0
+        entries = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    print(f"[WARN] Skipped a corrupt line in {self.path}")
+                    continue
+                if os.path.exists(entry["path"]):
+                    entries.append(entry)
+        return entries, offset
+
+    def advance(self, offset: int):
+        with self._lock():
+            atomic_write_json(self.cursor_path, {"offset": offset})
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                return
+            if offset == size and size:
+                # Reset the cursor before truncating, so a crash in between only re-reads archived entries
+                atomic_write_json(self.cursor_path, {"offset": 0})
+                os.truncate(self.path, 0)
+                fsync_dir(self.dir)
+
+    def needs_rebuild(self) -> bool:
+        return not self.cursor_path.exists()
+
+    def rebuild(self) -> int:
+        """One-off scan of raw/{region}/{date}/{source}/ for dumps written before the manifest existed."""
+        with self._lock():
+            entries = []
+            for fpath in sorted(self.dir.glob("*/*/fetched_*.*json")):
+                entries.append({
+                    "path": str(fpath),
+                    "source": fpath.parent.name,
+                    "date": fpath.parent.parent.name,
+                    "fetched_at": fpath.stem.replace("fetched_", ""),
+                    "items": None,
+                    "bytes": fpath.stat().st_size,
+                })
+            data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode()
+            atomic_write_json(self.cursor_path, {"offset": 0})
+            tmp = self.path.with_suffix(".rebuild")
+            with open(tmp, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            fsync_dir(self.dir)
+        print(f"[MANIFEST] {self.region}: indexed {len(entries)} raw files")
+        return len(entries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the pending raw-file manifest from the raw tree.")
+    parser.add_argument("--raw-root", default="data/raw")
+    parser.add_argument("--region", action="append", required=True, help="Region to rebuild (repeatable)")
+    args = parser.parse_args()
+    for region in args.region:
+        RawManifest(args.raw_root, region).rebuild()
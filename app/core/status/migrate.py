@@ -0,0 +1,42 @@
+import argparse
+import json
+from pathlib import Path
+
+from app.core.status.store import DEFAULT_BASE_DIR, JSON_FILE, STATUS_DONE, STATUS_FETCHED, open_status_store
+
+
+def migrate_json_status(base_dir=DEFAULT_BASE_DIR, src=None, batch_size=5000) -> int:
+    """Copy the legacy article_status.json into the SQLite status store."""
+    src = Path(src) if src else Path(base_dir) / JSON_FILE
+    if not src.exists():
+        print(f"[MIGRATE] Nothing to migrate, {src} not found.")
+        return 0
+
+    with open(src, "r") as f:
+        legacy = json.load(f)
+
+    done = {link: rec.get("uuid") for link, rec in legacy.items()
+            if isinstance(rec, dict) and rec.get("status") == STATUS_DONE}
+    fetched = [link for link, rec in legacy.items()
+               if isinstance(rec, dict) and rec.get("status") == STATUS_FETCHED]
+
+    # mark_fetched never downgrades a link the store already has as done,
+    # so re-running the migration after the pipeline moved on is safe.
+    with open_status_store(base_dir, backend="sqlite") as store:
+        items = list(done.items())
+        for i in range(0, len(items), batch_size):
+            store.mark_done(dict(items[i:i + batch_size]))
+        for i in range(0, len(fetched), batch_size):
+            store.mark_fetched(fetched[i:i + batch_size])
+    total = len(done) + len(fetched)
+
+    print(f"[MIGRATE] Imported {total} links from {src}.")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate article_status.json into the SQLite status store.")
+    parser.add_argument("--base-dir", default=DEFAULT_BASE_DIR)
+    parser.add_argument("--src", default=None, help="Path to the legacy JSON file")
+    args = parser.parse_args()
+    migrate_json_status(args.base_dir, args.src)
@@ -0,0 +1,243 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+from app.utils.helper import atomic_write_json
+
+STATUS_FETCHED = "fetched"
+STATUS_DONE = "done"
+
+DEFAULT_BASE_DIR = "data"
+SQLITE_FILE = Path("cache") / "article_status.db"
+JSON_FILE = Path("cache") / "article_status.json"
+
+
+class StatusStore:
+    """
+    Tracks the processing state of every article link.
+
+    A record is {"uuid": str | None, "status": "fetched" | "done"}. Backends
+    must make every write method atomic so that concurrent fetchers and
+    regional summarizers never overwrite each other's changes.
+    """
+
+    def get(self, link: str) -> Optional[Dict]:
+        return self.get_many([link]).get(link)
+
+    def get_many(self, links: Iterable[str]) -> Dict[str, Dict]:
+        raise NotImplementedError
+
+    def is_done(self, link: str) -> bool:
+        record = self.get(link)
+        return record is not None and record["status"] == STATUS_DONE
+
+    def done_links(self, links: Iterable[str]) -> Set[str]:
+        return {link for link, rec in self.get_many(links).items() if rec["status"] == STATUS_DONE}
+
+    def upsert_many(self, records: Dict[str, Dict]):
+        raise NotImplementedError
+
+    def mark_fetched(self, links: Iterable[str]) -> int:
+        """Insert links as fetched; links already done are left untouched."""
+        raise NotImplementedError
+
+    def mark_done(self, uuids_by_link: Dict[str, str]) -> int:
+        raise NotImplementedError
+
+    def links_for(self, uuid: str) -> Set[str]:
+        """Links recorded as done under `uuid`, i.e. the known members of its group."""
+        raise NotImplementedError
+
+    def prune(self, ttl_days: float) -> int:
+        """Drop done links that have not been touched for ttl_days."""
+        raise NotImplementedError
+
+    def items(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SQLiteStatusStore(StatusStore):
+    """SQLite (WAL) backend: point lookups, batched upserts and cheap TTL pruning."""
+
+    BATCH = 500
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS article_status (
+                link TEXT PRIMARY KEY,
+                uuid TEXT,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_status_updated ON article_status (status, updated_at)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_status_uuid ON article_status (uuid)")
+
+    def _write(self, sql: str, rows: list) -> int:
+        changed = 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for i in range(0, len(rows), self.BATCH):
+                    cur = self._conn.executemany(sql, rows[i:i + self.BATCH])
+                    changed += cur.rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return changed
+
+    def get_many(self, links: Iterable[str]) -> Dict[str, Dict]:
+        links = list(dict.fromkeys(link for link in links if link))
+        found = {}
+        with self._lock:
+            for i in range(0, len(links), self.BATCH):
+                chunk = links[i:i + self.BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT link, uuid, status FROM article_status WHERE link IN ({placeholders})", chunk
+                ).fetchall()
+                for link, uuid, status in rows:
+                    found[link] = {"uuid": uuid, "status": status}
+        return found
+
+    def upsert_many(self, records: Dict[str, Dict]):
+        now = time.time()
+        rows = [(link, rec.get("uuid"), rec["status"], now) for link, rec in records.items()]
+        return self._write("""
+            INSERT INTO article_status (link, uuid, status, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(link) DO UPDATE SET
+                uuid = excluded.uuid, status = excluded.status, updated_at = excluded.updated_at
+        """, rows)
+
+    def mark_fetched(self, links: Iterable[str]) -> int:
+        now = time.time()
+        rows = [(link, STATUS_FETCHED, now) for link in dict.fromkeys(links) if link]
+        return self._write(f"""
+            INSERT INTO article_status (link, uuid, status, updated_at) VALUES (?, NULL, ?, ?)
+            ON CONFLICT(link) DO UPDATE SET updated_at = excluded.updated_at
+            WHERE article_status.status != '{STATUS_DONE}'
+        """, rows)
+
+    def mark_done(self, uuids_by_link: Dict[str, str]) -> int:
+        now = time.time()
+        rows = [(link, uuid, STATUS_DONE, now) for link, uuid in uuids_by_link.items() if link]
+        return self._write("""
+            INSERT INTO article_status (link, uuid, status, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(link) DO UPDATE SET
+                uuid = excluded.uuid, status = excluded.status, updated_at = excluded.updated_at
+        """, rows)
+
+    def links_for(self, uuid: str) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT link FROM article_status WHERE uuid = ? AND status = ?", (uuid, STATUS_DONE)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def prune(self, ttl_days: float) -> int:
+        cutoff = time.time() - ttl_days * 86400
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM article_status WHERE status = ? AND updated_at < ?", (STATUS_DONE, cutoff)
+            )
+            return cur.rowcount
+
+    def items(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT link, uuid, status FROM article_status").fetchall()
+        for link, uuid, status in rows:
+            yield link, {"uuid": uuid, "status": status}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JsonStatusStore(StatusStore):
+    """Legacy single-file backend, kept for migration and small local runs."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r") as f:
+                self._data = json.load(f)
+        except Exception:
+            self._data = {}
+
+    def _save(self):
+        atomic_write_json(self.path, self._data, indent=2)
+
+    def get_many(self, links: Iterable[str]) -> Dict[str, Dict]:
+        with self._lock:
+            return {link: dict(self._data[link]) for link in links if link in self._data}
+
+    def upsert_many(self, records: Dict[str, Dict]):
+        with self._lock:
+            for link, rec in records.items():
+                self._data[link] = {"uuid": rec.get("uuid"), "status": rec["status"], "updated_at": time.time()}
+            self._save()
+        return len(records)
+
+    def mark_fetched(self, links: Iterable[str]) -> int:
+        changed = 0
+        with self._lock:
+            for link in links:
+                if link and self._data.get(link, {}).get("status") != STATUS_DONE:
+                    self._data[link] = {"uuid": None, "status": STATUS_FETCHED, "updated_at": time.time()}
+                    changed += 1
+            self._save()
+        return changed
+
+    def mark_done(self, uuids_by_link: Dict[str, str]) -> int:
+        return self.upsert_many({link: {"uuid": uuid, "status": STATUS_DONE} for link, uuid in uuids_by_link.items()})
+
+    def links_for(self, uuid: str) -> Set[str]:
+        with self._lock:
+            return {link for link, rec in self._data.items() if rec.get("uuid") == uuid and rec["status"] == STATUS_DONE}
+
+    def prune(self, ttl_days: float) -> int:
+        cutoff = time.time() - ttl_days * 86400
+        with self._lock:
+            stale = [link for link, rec in self._data.items()
+                     if rec["status"] == STATUS_DONE and rec.get("updated_at", 0) < cutoff]
+            for link in stale:
+                del self._data[link]
+            self._save()
+        return len(stale)
+
+    def items(self):
+        with self._lock:
+            snapshot = list(self._data.items())
+        for link, rec in snapshot:
+            yield link, {"uuid": rec.get("uuid"), "status": rec["status"]}
+
+
+def open_status_store(base_dir=DEFAULT_BASE_DIR, backend: str = "sqlite") -> StatusStore:
+    base_dir = Path(base_dir)
+    if backend == "sqlite":
+        return SQLiteStatusStore(base_dir / SQLITE_FILE)
+    if backend == "json":
+        return JsonStatusStore(base_dir / JSON_FILE)
+    raise ValueError(f"Unknown status store backend '{backend}'")
@@ -0,0 +1,241 @@
+import fcntl
+import json
+import math
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+DEFAULT_THRESHOLD = 85
+
+_NON_WORD = re.compile(r"\W+", re.UNICODE)
+_CJK = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+
+
+def index_keys(text: str) -> Set[str]:
+    """
+    Keys used for candidate generation.
+
+    Whitespace-delimited languages use the same word tokens fuzzywuzzy compares;
+    CJK text has no spaces, so character bigrams stand in for words there.
+    """
+    text = _NON_WORD.sub(" ", (text or "").lower()).strip()
+    if not text:
+        return set()
+    if _CJK.search(text):
+        compact = text.replace(" ", "")
+        if len(compact) < 2:
+            return {compact}
+        return {compact[i:i + 2] for i in range(len(compact) - 1)}
+    return set(text.split())
+
+
+def is_similar(a: Dict, b: Dict, threshold: int = DEFAULT_THRESHOLD) -> bool:
+    """The exact check the pairwise grouping always used."""
+    from fuzzywuzzy import fuzz
+
+    return fuzz.token_set_ratio(a["title"], b["title"]) > threshold or \
+        fuzz.token_set_ratio(a["summary"], b["summary"]) > threshold
+
+
+class UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.rank = [0] * size
+
+    def find(self, x: int) -> int:
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.rank[ra] < self.rank[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        if self.rank[ra] == self.rank[rb]:
+            self.rank[ra] += 1
+        return True
+
+
+class TokenIndex:
+    """
+    Inverted index from key to document ids with prefix-filtered lookups.
+
+    A query only probes the rarest keys of a document. If two texts are near
+    duplicates most keys are shared, so at least one rare key is too, while
+    ubiquitous words ("the", "says") never expand into huge posting lists.
+    """
+
+    def __init__(self, min_prefix: int = 3, prefix_ratio: float = 0.25):
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.min_prefix = min_prefix
+        self.prefix_ratio = prefix_ratio
+
+    def add(self, doc_id: int, keys: Iterable[str]):
+        for key in keys:
+            self.postings[key].append(doc_id)
+
+    def prefix(self, keys: Set[str]) -> List[str]:
+        size = max(self.min_prefix, math.ceil(len(keys) * self.prefix_ratio) + 1)
+        return sorted(keys, key=lambda k: (len(self.postings.get(k, ())), k))[:size]
+
+    def candidates(self, keys: Set[str]) -> Set[int]:
+        found = set()
+        for key in self.prefix(keys):
+            found.update(self.postings.get(key, ()))
+        return found
+
+
+def representative_order(article: Dict):
+    """Earliest published article leads its group, independent of input order."""
+    return article.get("published", ""), article.get("link", ""), article.get("title", "")
+
+
+def group_articles(articles: List[Dict], threshold: int = DEFAULT_THRESHOLD) -> List[List[Dict]]:
+    """
+    Cluster near-duplicate articles.
+
+    Candidate pairs come from title and summary token indexes, only those pairs
+    get the exact fuzzy check, and confirmed pairs are merged with union-find.
+    The resulting partition does not depend on the order of `articles`.
+    """
+    n = len(articles)
+    if n == 0:
+        return []
+
+    title_keys = [index_keys(a.get("title", "")) for a in articles]
+    summary_keys = [index_keys(a.get("summary", "")) for a in articles]
+    title_index, summary_index = TokenIndex(), TokenIndex()
+    for i in range(n):
+        title_index.add(i, title_keys[i])
+        summary_index.add(i, summary_keys[i])
+
+    uf = UnionFind(n)
+    checked = set()
+    for i in range(n):
+        candidates = title_index.candidates(title_keys[i]) | summary_index.candidates(summary_keys[i])
+        for j in candidates:
+            if j == i:
+                continue
+            pair = (i, j) if i < j else (j, i)
+            if pair in checked:
+                continue
+            checked.add(pair)
+            if uf.find(i) != uf.find(j) and is_similar(articles[i], articles[j], threshold):
+                uf.union(i, j)
+
+    clusters = defaultdict(list)
+    for i in range(n):
+        clusters[uf.find(i)].append(articles[i])
+
+    groups = [sorted(members, key=representative_order) for members in clusters.values()]
+    groups.sort(key=lambda g: representative_order(g[0]))
+    return groups
+
+
+class ClusterIndex:
+    """
+    Incremental clustering: new articles are matched against the representatives
+    of clusters already built instead of regrouping everything seen so far.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.clusters: List[Dict] = []
+        self.key_to_id: Dict[str, int] = {}
+        self._title_index = TokenIndex()
+        self._summary_index = TokenIndex()
+
+    def __len__(self):
+        return len(self.clusters)
+
+    def __contains__(self, key: str):
+        return key in self.key_to_id
+
+    def add(self, key: str, article: Dict) -> int:
+        if key in self.key_to_id:
+            return self.key_to_id[key]
+        cid = len(self.clusters)
+        self.clusters.append({
+            "key": key,
+            "title": article.get("title", ""),
+            "summary": article.get("summary", "")
+        })
+        self.key_to_id[key] = cid
+        self._title_index.add(cid, index_keys(article.get("title", "")))
+        self._summary_index.add(cid, index_keys(article.get("summary", "")))
+        return cid
+
+    def match(self, article: Dict) -> Optional[str]:
+        """Return the key of the oldest existing cluster the article belongs to."""
+        candidates = self._title_index.candidates(index_keys(article.get("title", ""))) | \
+            self._summary_index.candidates(index_keys(article.get("summary", "")))
+        for cid in sorted(candidates):
+            if is_similar(article, self.clusters[cid], self.threshold):
+                return self.clusters[cid]["key"]
+        return None
+
+
+class PersistentClusterIndex(ClusterIndex):
+    """
+    ClusterIndex for one region and day, kept across runs.
+
+    Each cluster's signature (representative uuid, title and feed summary) is
+    appended to an NDJSON file once the run that created it is journaled, so
+    the next run loads the day's clusters without rereading score_cache and
+    matches against the feed text rather than the LLM summary. A torn final
+    line from a crash is skipped; a cluster appended twice on replay is loaded
+    once.
+    """
+
+    def __init__(self, path, threshold: int = DEFAULT_THRESHOLD):
+        super().__init__(threshold)
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(".lock")
+        self.exists = self.path.exists()
+        if self.exists:
+            self._load()
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self.add(record["uuid"], record)
+
+    def signature(self, key: str) -> Dict:
+        cluster = self.clusters[self.key_to_id[key]]
+        return {"uuid": key, "title": cluster["title"], "summary": cluster["summary"]}
+
+    def persist(self, signatures: List[Dict]):
+        """Append signatures to the day's file (and to this index, for a replayed plan)."""
+        for record in signatures:
+            self.add(record["uuid"], record)
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in signatures)
+        if not lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with open(self.path, "ab") as f:
+                # Start on a fresh line if a crash left a partial one
+                if f.tell() and not self._ends_with_newline():
+                    lines = "\n" + lines
+                f.write(lines.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+        self.exists = True
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
@@ -0,0 +1,73 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.utils.helper import atomic_write_bytes, fsync_dir
+
+PHASE_SUMMARIZED = "summarized"
+PHASE_INDEXED = "indexed"
+PHASE_STATUS = "status"
+PHASE_ARCHIVED = "archived"
+
+
+def unfinished_dates(log_dir, region: str) -> List[str]:
+    """Dates of the region's runs that left a journal behind, oldest first."""
+    prefix = f"{region}_"
+    return sorted(p.stem[len(prefix):] for p in (Path(log_dir) / "journal").glob(f"{prefix}*.ndjson"))
+
+
+class RunJournal:
+    """
+    Write-ahead journal for one Summarizer run, one file per region and date.
+
+    The first line is the run's plan (raw files, groups to summarize, links to
+    mark done), written atomically before any side effect. Each finished phase
+    appends one fsynced line. The file is removed once the process log is
+    written, so a journal found at startup means the previous run crashed; its
+    plan is replayed instead of rescanning the raw tree. Every phase is
+    idempotent, so replaying a phase that partly ran is safe.
+    """
+
+    def __init__(self, log_dir, region: str, date_str: str):
+        self.path = Path(log_dir) / "journal" / f"{region}_{date_str}.ndjson"
+
+    def begin(self, plan: Dict):
+        # Groups may hold ArticleRecords; they are replayed as plain dicts
+        data = json.dumps(dict(plan, event="begin"), ensure_ascii=False, default=lambda obj: obj.to_dict())
+        atomic_write_bytes(self.path, (data + "\n").encode())
+
+    def mark(self, phase: str):
+        with open(self.path, "ab") as f:
+            f.write((json.dumps({"event": "phase", "phase": phase}) + "\n").encode())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self) -> Optional[Dict]:
+        """The unfinished run's plan with a "phases" set, or None if the last run completed."""
+        if not self.path.exists():
+            return None
+        plan = None
+        phases = set()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn final line from a crash mid-append: that phase did not finish
+                    break
+                if record.get("event") == "begin":
+                    plan = record
+                elif record.get("event") == "phase":
+                    phases.add(record["phase"])
+        if plan is None:
+            return None
+        plan["phases"] = phases
+        return plan
+
+    def commit(self):
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            return
+        fsync_dir(self.path.parent)
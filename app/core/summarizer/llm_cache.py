@@ -0,0 +1,133 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+CACHE_FILE = Path("cache") / "llm_cache.db"
+
+_TAGS = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Strip markup and case/whitespace noise so the same wire story hashes identically."""
+    return _SPACE.sub(" ", _TAGS.sub(" ", text or "")).strip().lower()
+
+
+def content_key(title: str, summary: str, model: str, prompt_version: str) -> str:
+    payload = "\n".join([prompt_version, model, normalize_text(title), normalize_text(summary)])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMCache:
+    """
+    Global LLM result cache keyed by normalized content, prompt version and model.
+
+    One entry holds the summary plus an impact dict that accumulates a score for
+    every region that asked about the story, so regions and dates share results.
+    A lookup is a hit when the caller's region already has an impact score, and
+    a partial hit when only the summary can be reused and the region still
+    needs scoring.
+    """
+
+    def __init__(self, base_dir="data", max_entries: int = 200000, max_age_days: float = 14):
+        self.path = Path(base_dir) / CACHE_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self.partial_hits = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                impact TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)")
+
+    def get(self, key: str, region: str) -> Optional[Tuple[str, Dict]]:
+        """(summary, impact) for `key`, or None; `region` missing from impact means a partial hit."""
+        with self._lock:
+            row = self._conn.execute("SELECT summary, impact FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            impact = json.loads(row[1])
+            if region in impact:
+                self.hits += 1
+            else:
+                self.partial_hits += 1
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0], impact
+
+    def put(self, key: str, summary: str, impact: Dict, model: str, prompt_version: str) -> Dict:
+        """Store a result, merging its impact scores into any existing entry; returns the merged impact."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT summary, impact FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                merged = dict(json.loads(row[1])) if row else {}
+                merged.update(impact)
+                summary = row[0] if row else summary
+                encoded = json.dumps(merged)
+                self._conn.execute("""
+                    INSERT INTO llm_cache (key, model, prompt_version, summary, impact, size, created_at, last_used)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET impact = excluded.impact, size = excluded.size,
+                        last_used = excluded.last_used
+                """, (key, model, prompt_version, summary, encoded, len(summary) + len(encoded), now, now))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return merged
+
+    def evict(self) -> int:
+        """Drop entries unused for max_age_days, then the least recently used beyond max_entries."""
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM llm_cache WHERE last_used < ?", (cutoff,)).rowcount
+            count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            if count > self.max_entries:
+                removed += self._conn.execute("""
+                    DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM llm_cache ORDER BY last_used ASC LIMIT ?
+                    )
+                """, (count - self.max_entries,)).rowcount
+            self.evicted += removed
+        return removed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        lookups = self.hits + self.partial_hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "partial_hits": self.partial_hits,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evicted": self.evicted,
+            "entries": entries,
+            "bytes": size
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
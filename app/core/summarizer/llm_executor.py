@@ -0,0 +1,296 @@
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.utils import metrics
+
+# Part of every LLM cache key; bump whenever a prompt's wording or output format changes.
+PROMPT_VERSION = "v1"
+
+SINGLE_PROMPT = """
+Summarize the following news article in 2-3 sentences and rate its importance (1-10) for the source region and globally:
+
+Source Region: {region}
+
+Title: {title}
+Summary: {summary}
+
+Return as JSON:
+{{
+  "summary": "...",
+  "impact": {{"{region}": int, "global": int}}
+}}
+"""
+
+BATCH_PROMPT = """
+Summarize each of the following news articles in 2-3 sentences and rate its importance (1-10) for the source region and globally:
+
+Source Region: {region}
+
+{articles}
+
+Return a JSON array with one object per article, in the same order:
+[
+  {{"id": int, "summary": "...", "impact": {{"{region}": int, "global": int}}}}
+]
+"""
+
+BATCH_ITEM = """[{id}]
+Title: {title}
+Summary: {summary}
+"""
+
+# Score-only variants, for stories whose summary is already cached from another region
+SCORE_PROMPT = """
+Rate the importance (1-10) of the following news article for the source region and globally:
+
+Source Region: {region}
+
+Title: {title}
+Summary: {summary}
+
+Return as JSON:
+{{
+  "impact": {{"{region}": int, "global": int}}
+}}
+"""
+
+SCORE_BATCH_PROMPT = """
+Rate the importance (1-10) of each of the following news articles for the source region and globally:
+
+Source Region: {region}
+
+{articles}
+
+Return a JSON array with one object per article, in the same order:
+[
+  {{"id": int, "impact": {{"{region}": int, "global": int}}}}
+]
+"""
+
+# (single prompt, batch prompt) by whether the job only needs scoring
+PROMPTS = {False: (SINGLE_PROMPT, BATCH_PROMPT), True: (SCORE_PROMPT, SCORE_BATCH_PROMPT)}
+
+# Rough output budget per article, used to reserve tokens before the call.
+OUTPUT_TOKENS_PER_ARTICLE = 120
+# Latencies kept for summary() percentiles; warm executors live as long as their process
+LATENCY_SAMPLES = 10000
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def is_rate_limited(exc: Exception) -> bool:
+    for attr in ("status_code", "http_status", "code"):
+        if getattr(exc, attr, None) == 429:
+            return True
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(exc).lower()
+    return "429" in message or "rate limit" in message
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate` units per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0):
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class SharedTokenBucket:
+    """
+    TokenBucket whose level lives in shared memory, so every process of a pool
+    draws from one budget. Must be created before the workers and handed to
+    them at start (e.g. through a pool initializer).
+    """
+
+    def __init__(self, rate: float, capacity: float, ctx=None):
+        self.rate = rate
+        self.capacity = capacity
+        # [tokens, updated]; CLOCK_MONOTONIC is system-wide, so timestamps compare across processes
+        self._state = (ctx or multiprocessing.get_context()).Array("d", [capacity, time.monotonic()])
+
+    def acquire(self, amount: float = 1.0):
+        amount = min(amount, self.capacity)
+        while True:
+            with self._state.get_lock():
+                now = time.monotonic()
+                tokens = min(self.capacity, self._state[0] + (now - self._state[1]) * self.rate)
+                self._state[1] = now
+                if tokens >= amount:
+                    self._state[0] = tokens - amount
+                    return
+                self._state[0] = tokens
+                wait = (amount - tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits, as the OpenAI API enforces them.
+    With `shared`, the limits hold across all processes the limiter is passed to.
+    """
+
+    def __init__(self, requests_per_minute: float = 500, tokens_per_minute: float = 60000, shared: bool = False):
+        bucket = SharedTokenBucket if shared else TokenBucket
+        self.requests = bucket(requests_per_minute / 60.0, max(1.0, requests_per_minute / 60.0))
+        self.tokens = bucket(tokens_per_minute / 60.0, tokens_per_minute / 6.0)
+
+    def acquire(self, tokens: int):
+        self.requests.acquire(1)
+        self.tokens.acquire(tokens)
+
+
+class LLMExecutor:
+    """
+    Runs summarize/score jobs against an LLM with bounded concurrency.
+
+    `complete` is any callable taking a prompt string and returning the model's
+    text. Jobs are {"key", "title", "summary", "region"} dicts; with
+    batch_size > 1 several jobs share one prompt and a JSON-array response.
+    A job with "score_only" set only asks for the impact scores and reports
+    its own summary back unchanged.
+    `on_result(key, summary, impact)` is invoked on the calling thread as each
+    result arrives, so callers can persist results incrementally.
+    """
+
+    def __init__(self, complete: Callable[[str], str], max_workers: int = 4, batch_size: int = 1,
+                 limiter: Optional[RateLimiter] = None, max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0):
+        self.complete = complete
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        # The metrics registry keeps the full latency histogram
+        self.stats = {"jobs": 0, "calls": 0, "retries": 0, "rate_limited": 0, "failures": 0,
+                      "latencies_ms": deque(maxlen=LATENCY_SAMPLES)}
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _call(self, prompt: str, expected_outputs: int) -> str:
+        attempt = 0
+        while True:
+            if self.limiter:
+                self.limiter.acquire(estimate_tokens(prompt) + OUTPUT_TOKENS_PER_ARTICLE * expected_outputs)
+            start = time.perf_counter()
+            try:
+                self._count("calls")
+                text = self.complete(prompt)
+                elapsed = time.perf_counter() - start
+                with self._stats_lock:
+                    self.stats["latencies_ms"].append(elapsed * 1000)
+                metrics.observe("llm_call", elapsed)
+                return text
+            except Exception as e:
+                if not is_rate_limited(e) or attempt >= self.max_retries:
+                    raise
+                self._count("rate_limited")
+                metrics.count("llm_rate_limited")
+                self._count("retries")
+                delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+                time.sleep(delay * (0.5 + random.random() / 2))
+                attempt += 1
+
+    def run_one(self, job: Dict) -> Tuple[str, Dict]:
+        score_only = bool(job.get("score_only"))
+        prompt = PROMPTS[score_only][0].format(region=job["region"], title=job["title"], summary=job["summary"])
+        parsed = json.loads(self._call(prompt, 1))
+        return (job["summary"] if score_only else parsed["summary"]), parsed["impact"]
+
+    def _run_batch(self, jobs: List[Dict]) -> List[Tuple[str, Optional[Tuple[str, Dict]], Optional[Exception]]]:
+        if len(jobs) == 1:
+            try:
+                return [(jobs[0]["key"], self.run_one(jobs[0]), None)]
+            except Exception as e:
+                return [(jobs[0]["key"], None, e)]
+
+        articles = "\n".join(
+            BATCH_ITEM.format(id=i, title=job["title"], summary=job["summary"]) for i, job in enumerate(jobs)
+        )
+        results = {}
+        score_only = bool(jobs[0].get("score_only"))
+        try:
+            prompt = PROMPTS[score_only][1].format(region=jobs[0]["region"], articles=articles)
+            for item in json.loads(self._call(prompt, len(jobs))):
+                idx = int(item["id"])
+                if 0 <= idx < len(jobs):
+                    results[idx] = (jobs[idx]["summary"] if score_only else item["summary"], item["impact"])
+        except Exception as e:
+            print(f"[LLM] Batch of {len(jobs)} failed, retrying individually: {e}")
+
+        # Anything the packed response dropped is retried on its own.
+        out = []
+        for i, job in enumerate(jobs):
+            if i in results:
+                out.append((job["key"], results[i], None))
+                continue
+            try:
+                out.append((job["key"], self.run_one(job), None))
+            except Exception as e:
+                out.append((job["key"], None, e))
+        return out
+
+    def run(self, jobs: List[Dict], on_result: Callable[[str, Optional[str], Optional[Dict]], None]):
+        """Execute all jobs; a failed job is reported with summary and impact set to None."""
+        self._count("jobs", len(jobs))
+        # Batches only mix jobs for the same region and prompt, because the prompt names one region.
+        by_region = {}
+        for job in jobs:
+            by_region.setdefault((job["region"], bool(job.get("score_only"))), []).append(job)
+        batches = []
+        for region_jobs in by_region.values():
+            for i in range(0, len(region_jobs), self.batch_size):
+                batches.append(region_jobs[i:i + self.batch_size])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm") as pool:
+            futures = [pool.submit(self._run_batch, batch) for batch in batches]
+            for future in as_completed(futures):
+                for key, result, error in future.result():
+                    if error is not None:
+                        self._count("failures")
+                        print(f"[LLM] Failed to summarize {key}: {error}")
+                        on_result(key, None, None)
+                    else:
+                        on_result(key, result[0], result[1])
+
+    def summary(self) -> Dict:
+        with self._stats_lock:
+            latencies = sorted(self.stats["latencies_ms"])
+            out = {k: v for k, v in self.stats.items() if k != "latencies_ms"}
+        if latencies:
+            out["latency_ms_p50"] = round(latencies[len(latencies) // 2], 1)
+            out["latency_ms_p95"] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1)
+        return out
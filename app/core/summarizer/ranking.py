@@ -0,0 +1,182 @@
+import argparse
+import json
+import math
+from datetime import date as date_cls, datetime, time as time_cls, timedelta
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+FEATURES = ("impact_region", "impact_global", "frequency", "recency")
+
+
+class RankingFormula(NamedTuple):
+    """
+    score = sum(weight * feature) over FEATURES.
+
+    recency is 0.5 ** (age / half_life), with age measured back from the end of
+    the local day being ranked, so it is fixed per article and a date's scores
+    never shrink as articles arrive (the incremental top-k relies on that).
+    """
+    weights: Dict[str, float]
+    half_life_hours: float = 24.0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "RankingFormula":
+        if not config:
+            return DEFAULT_FORMULA
+        weights = dict(config.get("weights", DEFAULT_FORMULA.weights))
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown ranking features {sorted(unknown)}; expected some of {FEATURES}")
+        return cls(weights, float(config.get("half_life_hours", DEFAULT_FORMULA.half_life_hours)))
+
+
+# What TopKPrecomputer always ranked by: the region's own impact plus frequency
+DEFAULT_FORMULA = RankingFormula({"impact_region": 1.0, "frequency": 1.0})
+
+
+def day_end_timestamp(date_str: str, tz_name: str) -> float:
+    start = datetime.combine(date_cls.fromisoformat(date_str), time_cls.min, tzinfo=ZoneInfo(tz_name))
+    return (start + timedelta(days=1)).timestamp()
+
+
+def _published_ts(article: Dict) -> float:
+    try:
+        return datetime.fromisoformat(article.get("published", "").replace("Z", "+00:00")).timestamp()
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def top_k_positions(scores: np.ndarray, k: int, uuids_of: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """
+    Positions of the k best `scores`, best first, ties broken by ascending uuid.
+    `uuids_of(positions)` is only asked for the candidates at or above the k-th
+    score. Shared by the score index and the ranking path so both order alike.
+    """
+    idx = np.arange(len(scores))
+    if k <= 0 or len(idx) == 0:
+        return idx[:0]
+    if len(idx) > k:
+        # Keep everything tied with the k-th score so the uuid tie-break stays exact
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        idx = idx[scores >= kth]
+    order = np.lexsort((uuids_of(idx), -scores[idx]))[:k]
+    return idx[order]
+
+
+class RankingFeatures:
+    """
+    Column arrays for a batch of score entries, shared by every formula and k.
+
+    Each column is extracted on first use, so a formula pays only for the
+    features it weights (parsing `published` for recency is the costly one).
+    """
+
+    def __init__(self, articles: List[Dict], region: str, reference_ts: Optional[float] = None):
+        self.articles = articles
+        self.region = region
+        self.reference_ts = reference_ts
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self):
+        return len(self.articles)
+
+    def column(self, feature: str) -> np.ndarray:
+        values = self._columns.get(feature)
+        if values is None:
+            values = self._columns[feature] = self._extract(feature)
+        return values
+
+    def _extract(self, feature: str) -> np.ndarray:
+        n = len(self.articles)
+        if feature == "impact_region":
+            return np.fromiter(((a.get("impact") or {}).get(self.region, 0) for a in self.articles),
+                               dtype=np.float64, count=n)
+        if feature == "impact_global":
+            return np.fromiter(((a.get("impact") or {}).get("global", 0) for a in self.articles),
+                               dtype=np.float64, count=n)
+        if feature == "frequency":
+            return np.fromiter((a.get("frequency", 1) for a in self.articles), dtype=np.float64, count=n)
+        if feature == "age_hours":
+            published = np.fromiter((_published_ts(a) for a in self.articles), dtype=np.float64, count=n)
+            reference = self.reference_ts
+            if reference is None:
+                reference = np.nanmax(published) if n and not np.isnan(published).all() else 0.0
+            # Hours before the reference; unparseable dates count as infinitely old
+            age = np.nan_to_num((reference - published) / 3600.0, nan=np.inf)
+            return np.maximum(age, 0.0)
+        raise KeyError(feature)
+
+    def score(self, formula: RankingFormula) -> np.ndarray:
+        scores = np.zeros(len(self), dtype=np.float64)
+        for feature, weight in formula.weights.items():
+            if not weight:
+                continue
+            if feature == "recency":
+                scores += weight * np.exp2(-self.column("age_hours") / formula.half_life_hours)
+            else:
+                scores += weight * self.column(feature)
+        return scores
+
+    def top_k_indices(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k best scores, best first; ties broken by uuid."""
+        return top_k_positions(scores, k,
+                               lambda idx: np.array([self.articles[i].get("uuid", "") for i in idx], dtype=str))
+
+    def top_k(self, formula: RankingFormula, k: int) -> List[Dict]:
+        return [self.articles[i] for i in self.top_k_indices(self.score(formula), k)]
+
+
+def rank(articles: List[Dict], region: str, formula: RankingFormula = DEFAULT_FORMULA, k: int = 5,
+         reference_ts: Optional[float] = None) -> List[Dict]:
+    return RankingFeatures(articles, region, reference_ts).top_k(formula, k)
+
+
+def rank_variants(articles: List[Dict], region: str, formulas: Dict[str, RankingFormula], ks: Iterable[int],
+                  reference_ts: Optional[float] = None) -> Dict[str, Dict[int, List[Dict]]]:
+    """Every (formula, k) ranking from one feature extraction, e.g. for A/B comparisons."""
+    features = RankingFeatures(articles, region, reference_ts)
+    ks = sorted(set(ks))
+    results = {}
+    for name, formula in formulas.items():
+        # Select once at the largest k; smaller ks are prefixes of it
+        best = features.top_k_indices(features.score(formula), ks[-1]) if ks else []
+        results[name] = {k: [articles[i] for i in best[:k]] for k in ks}
+    return results
+
+
+if __name__ == "__main__":
+    from app.core.summarizer.topk_precomputer import TopKPrecomputer
+
+    parser = argparse.ArgumentParser(description="Compare ranking formulas on one region's local date.")
+    parser.add_argument("--base-dir", default="data")
+    parser.add_argument("--region", required=True)
+    parser.add_argument("--date", required=True, help="Local date, YYYY-MM-DD")
+    parser.add_argument("--formula", action="append", default=[], metavar="NAME=JSON",
+                        help='Variant to compare, e.g. fresh=\'{"weights": {"impact_region": 1, "recency": 5}}\'')
+    parser.add_argument("--k", type=int, action="append", help="Cut-off to report (repeatable, default 5)")
+    args = parser.parse_args()
+
+    precomputer = TopKPrecomputer(base_dir=args.base_dir)
+    scores = precomputer.load_scores(args.region, *precomputer.day_bounds(args.region, args.date, args.date))
+    articles = precomputer.group_by_local_date(scores, args.region).get(args.date, [])
+    formulas = {"configured": precomputer.formula(args.region)}
+    for spec in args.formula:
+        name, _, config = spec.partition("=")
+        formulas[name] = RankingFormula.from_config(json.loads(config))
+    reference = day_end_timestamp(args.date, precomputer.regions[args.region])
+    ks = args.k or [5]
+    results = rank_variants(articles, args.region, formulas, ks, reference)
+    baseline = results["configured"]
+    report = {}
+    for name, by_k in results.items():
+        report[name] = {
+            k: {
+                "uuids": [a["uuid"] for a in items],
+                "overlap_with_configured": len({a["uuid"] for a in items} & {a["uuid"] for a in baseline[k]}),
+            }
+            for k, items in by_k.items()
+        }
+    print(json.dumps({"region": args.region, "date": args.date, "articles": len(articles), "variants": report},
+                     indent=2))
@@ -0,0 +1,54 @@
+import sys
+from typing import Dict
+
+FIELDS = ("title", "link", "published", "summary", "source_name", "source_url", "region", "fetch_name")
+# Few distinct values repeated on every article of a feed, so one shared copy each
+INTERNED = ("source_name", "source_url", "region", "fetch_name")
+
+
+class ArticleRecord:
+    """
+    Compact in-memory form of one raw dump article.
+
+    Slots instead of a per-article dict, and the feed-level strings are
+    interned. Supports the item access the grouping and summarizing code
+    uses on plain dicts (`a["title"]`, `a.get("summary", "")`), so either
+    form can be passed around.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, title="", link="", published="", summary="", source_name="", source_url="", region="",
+                 fetch_name=""):
+        self.title = title
+        self.link = link
+        self.published = published
+        self.summary = summary
+        self.source_name = sys.intern(source_name or "")
+        self.source_url = sys.intern(source_url or "")
+        self.region = sys.intern(region or "")
+        self.fetch_name = sys.intern(fetch_name or "")
+
+    @classmethod
+    def from_dict(cls, item: Dict, fetch_name: str = "") -> "ArticleRecord":
+        return cls(item.get("title", ""), item.get("link", ""), item.get("published", ""), item.get("summary", ""),
+                   item.get("source_name", ""), item.get("source_url", ""), item.get("region", ""),
+                   fetch_name or item.get("fetch_name", ""))
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            return default
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __repr__(self):
+        return f"ArticleRecord(link={self.link!r}, title={self.title!r})"
@@ -0,0 +1,244 @@
+import argparse
+import fcntl
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.summarizer.ranking import top_k_positions
+
+RECORD_DTYPE = np.dtype([
+    ("published_ts", "<i8"),
+    ("impact_region", "<f4"),
+    ("impact_global", "<f4"),
+    ("frequency", "<i4"),
+    ("blob_offset", "<i8"),
+    ("blob_length", "<i4"),
+    ("uuid", "S64"),
+])
+
+RECORDS_FILE = "records.bin"
+BLOB_FILE = "blob.ndjson"
+LOCK_FILE = "index.lock"
+
+
+def to_timestamp(published: str) -> int:
+    return int(datetime.fromisoformat(published.replace("Z", "+00:00")).timestamp())
+
+
+class ScoreIndex:
+    """
+    Append-only columnar index of one region's score_cache entries.
+
+    records.bin is a flat array of RECORD_DTYPE rows that is memory-mapped for
+    vectorized range and top-k queries; blob.ndjson holds the full JSON entries
+    addressed by (blob_offset, blob_length). Re-appending a uuid supersedes its
+    older row, so frequency bumps never rewrite existing data.
+    """
+
+    def __init__(self, base_dir="data", region="us", index_root="score_index"):
+        self.region = region
+        self.dir = Path(base_dir) / index_root / region
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.records_path = self.dir / RECORDS_FILE
+        self.blob_path = self.dir / BLOB_FILE
+        self.lock_path = self.dir / LOCK_FILE
+        self._records = np.zeros(0, dtype=RECORD_DTYPE)
+        self._latest = np.zeros(0, dtype=bool)
+        self._positions: Dict[bytes, int] = {}
+        # (st_dev, st_ino) of the mapped records file
+        self._identity = None
+        self._blob = None
+
+    def __len__(self):
+        self.refresh()
+        return int(self._latest.sum())
+
+    def _lock(self):
+        handle = open(self.lock_path, "a")
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def append(self, entries: Iterable[Dict]) -> int:
+        rows = []
+        with self._lock() as lock_handle:
+            # Drop a torn trailing record left by a crash mid-append
+            size = self.records_path.stat().st_size if self.records_path.exists() else 0
+            if size % RECORD_DTYPE.itemsize:
+                os.truncate(self.records_path, size - size % RECORD_DTYPE.itemsize)
+
+            # Blob bytes are flushed before the records that point at them
+            with open(self.blob_path, "ab") as blob:
+                offset = blob.tell()
+                for entry in entries:
+                    try:
+                        ts = to_timestamp(entry["published"])
+                    except Exception as e:
+                        print(f"[WARN] Skipped unindexable entry {entry.get('uuid')}: {e}")
+                        continue
+                    data = (json.dumps(entry, ensure_ascii=False) + "\n").encode()
+                    blob.write(data)
+                    impact = entry.get("impact", {})
+                    rows.append((ts, impact.get(self.region, 0), impact.get("global", 0),
+                                 entry.get("frequency", 1), offset, len(data) - 1, entry["uuid"].encode()))
+                    offset += len(data)
+                blob.flush()
+                os.fsync(blob.fileno())
+
+            if rows:
+                with open(self.records_path, "ab") as f:
+                    f.write(np.array(rows, dtype=RECORD_DTYPE).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            fcntl.flock(lock_handle, fcntl.LOCK_UN)
+        return len(rows)
+
+    def refresh(self):
+        """Map any records appended since the last call and update the latest-row mask."""
+        try:
+            st = os.stat(self.records_path)
+        except FileNotFoundError:
+            return
+        if (st.st_dev, st.st_ino) == self._identity and st.st_size // RECORD_DTYPE.itemsize == len(self._records):
+            return
+        # Map through one handle, so a swap after the stat can't pair one file's size with another's rows
+        with open(self.records_path, "rb") as f:
+            st = os.fstat(f.fileno())
+            identity = (st.st_dev, st.st_ino)
+            count = st.st_size // RECORD_DTYPE.itemsize
+            known = len(self._records)
+            if identity != self._identity or count < known:
+                # The index was rebuilt and swapped in underneath us; start over
+                known = 0
+                self._latest = np.zeros(0, dtype=bool)
+                self._positions = {}
+            self._identity = identity
+            self._records = np.memmap(f, dtype=RECORD_DTYPE, mode="r", shape=(count,)) \
+                if count else np.zeros(0, dtype=RECORD_DTYPE)
+        if known == 0:
+            # Cold open: the last occurrence of every uuid wins, computed in one pass
+            uuids = self._records["uuid"]
+            _, first_from_end = np.unique(uuids[::-1], return_index=True)
+            last = count - 1 - first_from_end
+            self._latest = np.zeros(count, dtype=bool)
+            self._latest[last] = True
+            self._positions = dict(zip(uuids[last].tolist(), last.tolist()))
+            if self._blob is not None:
+                self._blob.close()
+                self._blob = None
+            return
+        latest = np.ones(count, dtype=bool)
+        latest[:known] = self._latest
+        for i in range(known, count):
+            uuid = self._records["uuid"][i]
+            previous = self._positions.get(uuid)
+            if previous is not None:
+                latest[previous] = False
+            self._positions[uuid] = i
+        self._latest = latest
+        if self._blob is not None:
+            self._blob.close()
+            self._blob = None
+
+    def _select(self, start_ts: Optional[int], end_ts: Optional[int]) -> np.ndarray:
+        self.refresh()
+        mask = self._latest.copy()
+        ts = self._records["published_ts"]
+        if start_ts is not None:
+            mask &= ts >= start_ts
+        if end_ts is not None:
+            mask &= ts < end_ts
+        return np.nonzero(mask)[0]
+
+    def load(self, indices: Iterable[int]) -> List[Dict]:
+        if self._blob is None:
+            self._blob = open(self.blob_path, "rb")
+        out = []
+        for i in indices:
+            record = self._records[i]
+            self._blob.seek(int(record["blob_offset"]))
+            out.append(json.loads(self._blob.read(int(record["blob_length"]))))
+        return out
+
+    def range(self, start_ts: Optional[int] = None, end_ts: Optional[int] = None) -> List[Dict]:
+        idx = self._select(start_ts, end_ts)
+        idx = idx[np.argsort(self._records["published_ts"][idx], kind="stable")]
+        return self.load(idx)
+
+    def scores(self, idx: np.ndarray, field: str = "score") -> np.ndarray:
+        records = self._records[idx]
+        if field == "score":
+            return records["impact_region"].astype(np.float64) + records["frequency"]
+        if field == "global_score":
+            return records["impact_global"].astype(np.float64) + records["frequency"]
+        return records[field].astype(np.float64)
+
+    def top_k(self, k: int, start_ts: Optional[int] = None, end_ts: Optional[int] = None,
+              field: str = "score") -> List[Dict]:
+        """Top-k by impact_region + frequency, impact_global + frequency ("global_score") or a single column; ties broken by uuid."""
+        idx = self._select(start_ts, end_ts)
+        if len(idx) == 0 or k <= 0:
+            return []
+        order = top_k_positions(self.scores(idx, field), k, lambda positions: self._records["uuid"][idx[positions]])
+        return self.load(idx[order])
+
+    def close(self):
+        if self._blob is not None:
+            self._blob.close()
+            self._blob = None
+
+
+def build_from_score_cache(base_dir="data", region="us", batch_size=5000) -> int:
+    """
+    Rebuild one region's index from the score_cache tree.
+
+    The index is written to a side directory and swapped in afterwards. The
+    live index's append lock is held throughout, so a Summarizer appending in
+    the meantime waits and lands in the new files instead of the replaced ones.
+    """
+    base_dir = Path(base_dir)
+    region_dir = base_dir / "score_cache" / region
+    target = ScoreIndex(base_dir, region)
+    with target._lock():
+        build = ScoreIndex(base_dir, region, index_root="score_index.build")
+        for path in (build.records_path, build.blob_path):
+            if path.exists():
+                path.unlink()
+
+        total = 0
+        batch = []
+        files = sorted(region_dir.glob("*/*.json")) if region_dir.exists() else []
+        for file in files:
+            try:
+                with open(file, "r") as f:
+                    entry = json.load(f)
+                if isinstance(entry, dict) and "published" in entry and "uuid" in entry:
+                    batch.append(entry)
+            except Exception as e:
+                print(f"[WARN] Failed to load {file}: {e}")
+            if len(batch) >= batch_size:
+                total += build.append(batch)
+                batch = []
+        if batch:
+            total += build.append(batch)
+
+        for name in (BLOB_FILE, RECORDS_FILE):
+            src = build.dir / name
+            if src.exists():
+                os.replace(src, target.dir / name)
+            elif (target.dir / name).exists():
+                (target.dir / name).unlink()
+    print(f"[INDEX] {region}: indexed {total} entries from {len(files)} files")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the columnar score index from score_cache.")
+    parser.add_argument("--base-dir", default="data")
+    parser.add_argument("--region", action="append", required=True, help="Region to index (repeatable)")
+    args = parser.parse_args()
+    for region in args.region:
+        build_from_score_cache(args.base_dir, region)
@@ -1,14 +1,24 @@
 import os
 import json
+import time
 import hashlib
 from collections import defaultdict
+from itertools import islice
 from dotenv import load_dotenv
-from fuzzywuzzy import fuzz
-from langchain.chat_models import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional
+from app.core.status.manifest import RawManifest
+from app.core.status.store import open_status_store
+from app.core.summarizer.dedup import PersistentClusterIndex, group_articles
+from app.core.summarizer.journal import (
+    PHASE_ARCHIVED, PHASE_INDEXED, PHASE_STATUS, PHASE_SUMMARIZED, RunJournal, unfinished_dates
+)
+from app.core.summarizer.llm_cache import LLMCache, content_key
+from app.core.summarizer.llm_executor import PROMPT_VERSION, LLMExecutor, RateLimiter
+from app.core.summarizer.records import ArticleRecord
+from app.utils import metrics
+from app.utils.helper import atomic_write_json, read_dump
 
 
 def generate_article_id(title: str, link: str) -> str:
@@ -16,174 +26,550 @@ def generate_article_id(title: str, link: str) -> str:
     return hashlib.sha256(unique_str.encode()).hexdigest()
 
 
+def merge_process_logs(logs: List[Dict]) -> Optional[Dict]:
+    """Fold several runs' process logs into one, so a single top-k update sees every uuid."""
+    if not logs:
+        return None
+    merged = dict(logs[-1])
+    merged["fetch_files"] = [f for log in logs for f in log["fetch_files"]]
+    merged["uuids_processed"] = list(dict.fromkeys(u for log in logs for u in log["uuids_processed"]))
+    merged["score_dirs"] = list(dict.fromkeys(d for log in logs for d in log.get("score_dirs", [log["score_dir"]])))
+    merged["articles"] = sum(log.get("articles", 0) for log in logs)
+    return merged
+
+
 class Summarizer:
-    def __init__(self, region, date_str=None, base_dir="data", top_k=5, frequency_minutes=60, use_llm=True):
+    def __init__(self, region, date_str=None, base_dir="data", top_k=5, frequency_minutes=60, use_llm=True,
+                 status_backend="sqlite", status_ttl_days=30, incremental_grouping=True,
+                 llm_workers=4, llm_batch_size=1, requests_per_minute=500, tokens_per_minute=60000,
+                 model_name="gpt-3.5-turbo", llm_cache_max_entries=200000, llm_cache_max_age_days=14, llm=None,
+                 limiter=None, window_size=None):
         load_dotenv()
         self.region = region
         self.top_k = top_k
         self.use_llm = use_llm
         self.frequency_minutes = frequency_minutes
-        self.llm = ChatOpenAI(model_name="gpt-3.5-turbo", temperature=0) if use_llm else None
+        self.model_name = model_name
+        # Any object with ChatOpenAI's predict(prompt) -> str can be passed in, e.g. a stub for benchmarks
+        if use_llm and llm is None:
+            # langchain (and openai under it) dominate import time, so only processes that summarize pay for it
+            from langchain.chat_models import ChatOpenAI
+            llm = ChatOpenAI(model_name=model_name, temperature=0)
+        self.llm = llm if use_llm else None
 
-        self.date = date_str or datetime.utcnow().strftime("%Y-%m-%d")
+        # Without an explicit date, each raw file is summarized under the UTC date it was fetched on
+        self.fixed_date = date_str
         self.base_dir = Path(base_dir)
-        self.raw_dir = self.base_dir / "raw" / self.region / self.date
-        self.cache_dir = self.base_dir / "score_cache" / self.region / self.date
         self.summary_dir = self.base_dir / "summaries"
         self.log_dir = self.base_dir / "log" / "process_log"
-        self.status_file = self.base_dir / "cache" / "article_status.json"
-        self.archive_dir = self.base_dir / "archive" / "raw" / self.region / self.date
+        self.manifest = RawManifest(self.base_dir / "raw", self.region)
 
-        for path in [self.cache_dir, self.log_dir, self.status_file.parent, self.archive_dir]:
-            path.mkdir(parents=True, exist_ok=True)
+        self.status_ttl_days = status_ttl_days
+        self.log_dir.mkdir(parents=True, exist_ok=True)
 
-        self.llm_prompt = PromptTemplate.from_template("""
-Summarize the following news article in 2-3 sentences and rate its importance (1-10) for the source region and globally:
+        self.llm_executor = LLMExecutor(
+            self.llm.predict,
+            max_workers=llm_workers,
+            batch_size=llm_batch_size,
+            # A limiter can be passed in to share one budget, e.g. across a backfill's worker processes
+            limiter=limiter or RateLimiter(requests_per_minute, tokens_per_minute)
+        ) if use_llm else None
 
-Source Region: {region}
+        # Shared across regions and dates; placeholder results without an LLM are never cached
+        self.llm_cache = LLMCache(
+            self.base_dir, max_entries=llm_cache_max_entries, max_age_days=llm_cache_max_age_days
+        ) if use_llm else None
 
-Title: {title}
-Summary: {summary}
+        self.status_store = open_status_store(self.base_dir, backend=status_backend)
+        # Opened on the first append, so importing the Summarizer doesn't pull in numpy
+        self._score_index = None
 
-Return as JSON:
-{{
-  "summary": "...",
-  "impact": {{"{region}": int, "global": int}}
-}}
-""")
+        # Streaming mode runs one journaled plan per window of at least this many articles, so memory
+        # stays bounded on a backlog; later windows join earlier stories through the cluster index
+        self.window_size = window_size
+        # Incremental mode matches new groups against the day's clusters from earlier runs, so a story
+        # re-fetched from another outlet joins its existing entry instead of costing a new LLM call
+        self.incremental_grouping = incremental_grouping or bool(window_size)
+        self.date = None
+        self.bind_date(date_str or datetime.utcnow().strftime("%Y-%m-%d"))
 
-        self.llm_chain = LLMChain(llm=self.llm, prompt=self.llm_prompt) if use_llm else None
+    def bind_date(self, date_str, reload=False):
+        """
+        Point the date-scoped directories (raw, score_cache, archive, journal) and
+        the cluster index at `date_str`; `reload` re-reads them for the same date.
+        """
+        if date_str == self.date and not reload:
+            return
+        self.date = date_str
+        self.raw_dir = self.base_dir / "raw" / self.region / self.date
+        self.cache_dir = self.base_dir / "score_cache" / self.region / self.date
+        self.archive_dir = self.base_dir / "archive" / "raw" / self.region / self.date
+        self.quarantine_dir = self.base_dir / "quarantine" / "raw" / self.region / self.date
+        for path in [self.cache_dir, self.archive_dir]:
+            path.mkdir(parents=True, exist_ok=True)
+        self.journal = RunJournal(self.base_dir / "log", self.region, self.date)
+        self.cluster_index = None
+        if self.incremental_grouping:
+            self.cluster_index = PersistentClusterIndex(
+                self.base_dir / "cluster_index" / self.region / f"{self.date}.ndjson")
+            if not self.cluster_index.exists:
+                self._seed_cluster_index()
 
-        # Load status DB
-        if self.status_file.exists():
-            with open(self.status_file, "r") as f:
-                self.article_status = json.load(f)
-        else:
-            self.article_status = {}
+    def _seed_cluster_index(self):
+        """Build the day's cluster file from score_cache, for days summarized before it existed."""
+        signatures = []
+        for fpath in sorted(self.cache_dir.glob("*.json")):
+            try:
+                with open(fpath, "r") as f:
+                    entry = json.load(f)
+                signatures.append({"uuid": entry["uuid"], "title": entry["title"], "summary": entry["summary"]})
+            except Exception as e:
+                print(f"[WARN] Failed to index {fpath}: {e}")
+        self.cluster_index.persist(signatures)
 
-    def load_new_articles(self):
+    def load_new_articles(self, files=None):
+        """
+        Articles not yet done from the given raw dumps (default: this date's
+        pending manifest entries). Every file read is returned for archiving,
+        even if all of its links turned out to be done already.
+        """
         articles = []
         fetch_files_used = set()
+        for window, window_files in self.iter_article_windows(files):
+            articles.extend(window)
+            fetch_files_used |= window_files
+        return articles, fetch_files_used
 
-        if not self.raw_dir.exists():
-            self.raw_dir.mkdir(parents=True, exist_ok=True)
-            return [], set()
+    def iter_article_windows(self, files=None, window_size=None):
+        """
+        Yield (articles, files) batches made of whole raw files, each holding at
+        least `window_size` new articles (the last may hold fewer); a single
+        batch without `window_size`. Files are read lazily, so done links a
+        previous batch marked are already filtered out of the next one.
+        """
+        if files is None:
+            entries, _ = self.manifest.pending()
+            files = [entry["path"] for entry in entries if entry["date"] == self.date]
 
-        for source_dir in self.raw_dir.iterdir():
-            if not source_dir.is_dir():
+        articles = []
+        fetch_files_used = set()
+        for fpath in map(Path, files):
+            fetch_name = fpath.stem.replace("fetched_", "")
+            try:
+                metrics.count("files_opened", kind="raw")
+                with open(fpath, "r") as f:
+                    items = read_dump(f, fpath.suffix)
+                done = self.status_store.done_links(item.get("link") for item in items)
+                articles.extend(ArticleRecord.from_dict(item, fetch_name) for item in items
+                                if item.get("link") not in done)
+                fetch_files_used.add(str(fpath))
+            except FileNotFoundError:
                 continue
-
-            for fpath in sorted(source_dir.glob("fetched_*.json")):
-                fetch_name = fpath.stem.replace("fetched_", "")
-
-                try:
-                    with open(fpath, "r") as f:
-                        items = json.load(f)
-                        valid_items = []
-                        for item in items:
-                            item["fetch_name"] = fetch_name
-                            link = item.get("link")
-                            if link not in self.article_status or self.article_status[link]["status"] != "done":
-                                valid_items.append(item)
-                        if valid_items:
-                            articles.extend(valid_items)
-                            fetch_files_used.add(str(fpath))
-                except Exception as e:
-                    print(f"[ERROR] Failed to read {fpath}: {e}")
-
-        return articles, fetch_files_used
+            except Exception as e:
+                # The manifest cursor moves past it either way, so keep it where it can be inspected and replayed
+                print(f"[ERROR] Failed to read {fpath}: {e}")
+                self._quarantine(fpath)
+                continue
+            if window_size and len(articles) >= window_size:
+                yield articles, fetch_files_used
+                articles, fetch_files_used = [], set()
+        if articles or fetch_files_used:
+            yield articles, fetch_files_used
 
     def group_articles(self, articles):
-        groups = []
-        used = set()
-        for i, a in enumerate(articles):
-            if i in used:
-                continue
-            group = [a]
-            for j in range(i + 1, len(articles)):
-                if j in used:
-                    continue
-                if fuzz.token_set_ratio(a["title"], articles[j]["title"]) > 85 or \
-                   fuzz.token_set_ratio(a["summary"], articles[j]["summary"]) > 85:
-                    group.append(articles[j])
-                    used.add(j)
-            groups.append(group)
-        return groups
+        return group_articles(articles)
+
+    def group_uuid(self, group):
+        best = group[0]
+        if self.cluster_index is None:
+            return generate_article_id(best['title'], best['link'])
+        uuid = self.cluster_index.match(best)
+        if uuid is None:
+            uuid = generate_article_id(best['title'], best['link'])
+            self.cluster_index.add(uuid, best)
+        return uuid
 
     def summarize_and_score(self, title, summary):
         if not self.use_llm:
             return summary, {self.region: 0, "global": 0}
         try:
-            result = self.llm_chain.run({"title": title, "summary": summary, "region": self.region})
-            parsed = json.loads(result)
-            return parsed["summary"], parsed["impact"]
+            return self.llm_executor.run_one({"title": title, "summary": summary, "region": self.region})
         except Exception:
             return summary, {self.region: 0, "global": 0}
 
-    def update(self):
-        articles, fetch_files_used = self.load_new_articles()
-        if not articles:
-            print(f"[{self.region.upper()}] No new articles to process.")
+    def build_entry(self, uuid, group, summary, impact, llm_key=None):
+        best = group[0]
+        # The same link re-dumped by several fetches is one article, not several
+        links = list(dict.fromkeys(a["link"] for a in group))
+        entry = {
+            "uuid": uuid,
+            "title": best["title"],
+            "summary": summary,
+            "link": best["link"],
+            "source_url": best["source_url"],
+            "published": min(a["published"] for a in group),
+            "frequency": len(links),
+            "impact": impact,
+            # Later runs only add articles whose link is not listed yet, so a replayed merge counts once
+            "links": links,
+            "sources": sorted({a.get("source_name") for a in group if a.get("source_name")}),
+        }
+        if llm_key:
+            entry["llm_key"] = llm_key
+        return entry
+
+    def summarize_groups(self, pending, on_entry):
+        """Summarize {uuid: group} through the cache and executor; on_entry gets each entry as it arrives."""
+        llm_keys = {}
+        # Cached summaries of stories another region already scored; only this region's impact is asked for
+        reused = {}
+
+        def on_result(uuid, summary, impact):
+            group = pending[uuid]
+            llm_key = llm_keys.get(uuid)
+            if summary is None:
+                summary, impact, llm_key = reused.get(uuid, group[0]["summary"]), {self.region: 0, "global": 0}, None
+            elif llm_key:
+                impact = self.llm_cache.put(llm_key, summary, impact, self.model_name, PROMPT_VERSION)
+            on_entry(uuid, self.build_entry(uuid, group, summary, impact, llm_key))
+
+        if not self.use_llm:
+            for uuid in pending:
+                on_result(uuid, None, None)
             return
 
-        grouped = self.group_articles(articles)
-        cache_results = {}
-        processed_files = set()
+        jobs = []
+        with metrics.span("llm_cache_lookup", region=self.region):
+            for uuid, group in pending.items():
+                best = group[0]
+                llm_keys[uuid] = content_key(best["title"], best["summary"], self.model_name, PROMPT_VERSION)
+                cached = self.llm_cache.get(llm_keys[uuid], self.region)
+                if cached and self.region in cached[1]:
+                    metrics.count("llm_cache_hits", region=self.region)
+                    on_entry(uuid, self.build_entry(uuid, group, cached[0], cached[1], llm_keys[uuid]))
+                    continue
+                if cached:
+                    metrics.count("llm_cache_partial_hits", region=self.region)
+                    reused[uuid] = cached[0]
+                    jobs.append({"key": uuid, "title": best["title"], "summary": cached[0], "region": self.region,
+                                 "score_only": True})
+                    continue
+                jobs.append({"key": uuid, "title": best["title"], "summary": best["summary"], "region": self.region})
+
+        if jobs:
+            calls_before = self.llm_executor.stats["calls"]
+            with metrics.span("llm", region=self.region):
+                self.llm_executor.run(jobs, on_result)
+            metrics.count("llm_jobs", len(jobs), region=self.region)
+            metrics.count("llm_calls", self.llm_executor.stats["calls"] - calls_before, region=self.region)
+        self.llm_cache.evict()
+
+    def merge_into_cluster(self, uuid, members):
+        """
+        Fold articles that joined an already summarized cluster into its entry:
+        frequency and sources grow by the links it does not list yet. Returns
+        the updated entry, or None if nothing was new.
+        """
+        entry = self._read_cache_entry(uuid)
+        if entry is None:
+            return None
+        links = entry.get("links")
+        if links is None:
+            # Written before entries listed their links: the status store still knows which links were
+            # marked done under this uuid, so reprocessing those same articles adds nothing
+            links = list(dict.fromkeys([entry["link"]] + sorted(self.status_store.links_for(uuid))))
+            frequency = max(entry.get("frequency", 1), len(links))
+        else:
+            frequency = len(links)
+        known = set(links)
+        sources = set(entry.get("sources", []))
+        added = 0
+        for member in members:
+            if member["link"] in known:
+                continue
+            known.add(member["link"])
+            links.append(member["link"])
+            if member.get("source_name"):
+                sources.add(member["source_name"])
+            added += 1
+        if not added:
+            return None
+        entry["links"] = links
+        entry["frequency"] = frequency + added
+        entry["sources"] = sorted(sources)
+        return entry
+
+    def update(self):
+        """
+        Summarize every pending raw file from the manifest, date by date.
+
+        Returns one process log covering all dates processed (score_dirs lists
+        each date's score_cache directory), or None if there was nothing new.
+        """
+        logs = []
+        with metrics.profile_run(f"summarizer_{self.region}"), metrics.record_run() as run:
+            try:
+                logs.extend(self.recover(run))
+                if self.manifest.needs_rebuild():
+                    # First run against a raw tree written before the manifest existed
+                    self.manifest.rebuild()
+                entries, offset = self.manifest.pending()
+                files_by_date = defaultdict(list)
+                for entry in entries:
+                    files_by_date[entry["date"]].append(entry["path"])
+                dates = [self.fixed_date] if self.fixed_date else sorted(files_by_date)
+
+                for date_str in dates:
+                    self.bind_date(date_str)
+                    process_log = self._update(run, files_by_date.get(date_str, []))
+                    if process_log:
+                        logs.append(process_log)
+                if not dates:
+                    print(f"[{self.region.upper()}] No new articles to process.")
+                if not self.fixed_date:
+                    self.manifest.advance(offset)
+            finally:
+                metrics.REGISTRY.dump()
+        return merge_process_logs(logs)
+
+    def recover(self, run):
+        """Finish runs that crashed part-way, using their journals instead of rescanning raw files."""
+        logs = []
+        dates = [self.fixed_date] if self.fixed_date else unfinished_dates(self.base_dir / "log", self.region)
+        for date_str in dates:
+            self.bind_date(date_str)
+            plan = self.journal.load()
+            if plan is None:
+                continue
+            print(f"[{self.region.upper()}] Resuming unfinished {date_str} run from {plan['run_time']} "
+                  f"(completed: {', '.join(sorted(plan['phases'])) or 'nothing'})")
+            metrics.count("runs_recovered", region=self.region)
+            logs.append(self._apply(plan, run))
+        return logs
+
+    def _update(self, run, files=None):
+        logs = []
+        windows = self.iter_article_windows(files, self.window_size)
+        window = 0
+        while True:
+            with metrics.span("load", region=self.region):
+                batch = next(windows, None)
+            if batch is None:
+                break
+            articles, fetch_files_used = batch
+            if not articles:
+                # Nothing new in them, but they are consumed all the same
+                self._archive(fetch_files_used)
+                continue
+            metrics.count("articles_loaded", len(articles), region=self.region)
+            plan = self._plan(articles, fetch_files_used)
+            # Only this window's uuids outlive it; the articles and groups are dropped before the next one
+            del articles, batch
+            if self.window_size:
+                plan["window"] = window
+                window += 1
+            # Recorded before any side effect, so a crash from here on can be replayed
+            self.journal.begin(plan)
+            plan["phases"] = set()
+            logs.append(self._apply(plan, run))
+            del plan
+        if not logs:
+            print(f"[{self.region.upper()}] No new articles to process for {self.date}.")
+        return merge_process_logs(logs)
+
+    def reprocess(self, articles, overwrite=False):
+        """
+        Summarize the iterable `articles` under the bound date regardless of
+        their done status, e.g. a backfill streamed from the archive. Nothing is
+        archived. Groups whose score_cache entry exists are reused unless
+        `overwrite`. With `window_size`, articles are consumed one window at a
+        time like update() does.
+        """
+        logs = []
+        # Entries this call wrote; a later window joins them instead of overwriting them
+        rewritten = set()
+        articles = iter(articles)
+        with metrics.record_run() as run:
+            plan = self.journal.load()
+            if plan is not None:
+                # Finish an interrupted run for this date before starting over it
+                self._apply(plan, run)
+            window = 0
+            while True:
+                batch = list(islice(articles, self.window_size) if self.window_size else articles)
+                if not batch:
+                    break
+                metrics.count("articles_loaded", len(batch), region=self.region)
+                plan = self._plan(batch, set(), skip_done=False, overwrite=overwrite, rewritten=rewritten)
+                del batch
+                if self.window_size:
+                    plan["window"] = window
+                    window += 1
+                self.journal.begin(plan)
+                plan["phases"] = set()
+                logs.append(self._apply(plan, run))
+                rewritten.update(plan["pending"])
+                del plan
+        return merge_process_logs(logs)
+
+    def _plan(self, articles, fetch_files_used, skip_done=True, overwrite=False, rewritten=()):
+        with metrics.span("group", region=self.region):
+            grouped = self.group_articles(articles)
+        metrics.count("groups", len(grouped), region=self.region)
+        cached = []
+        pending = {}
+        merges = {}
+        done_links = {}
+        known_clusters = len(self.cluster_index) if self.cluster_index is not None else 0
+        already_done = self.status_store.done_links(group[0]["link"] for group in grouped) if skip_done else set()
 
         for group in grouped:
             best = group[0]
-            uuid = generate_article_id(best['title'], best['link'])
+            uuid = self.group_uuid(group)
 
             # Skip if already marked as done
-            if best['link'] in self.article_status and self.article_status[best['link']]['status'] == 'done':
+            if best['link'] in already_done:
                 continue
 
-            cache_path = self.cache_dir / f"{uuid}.json"
-            if cache_path.exists():
-                with open(cache_path) as f:
-                    cache_results[uuid] = json.load(f)
+            if uuid in pending:
+                # Joined a cluster another group of this run created
+                pending[uuid] = pending[uuid] + group
+            elif (not overwrite or uuid in rewritten) and (self.cache_dir / f"{uuid}.json").exists():
+                # Joined a cluster an earlier run already summarized: bump it instead of calling the LLM
+                if uuid not in merges:
+                    cached.append(uuid)
+                merges.setdefault(uuid, []).extend(
+                    {"link": a["link"], "source_name": a.get("source_name", "")} for a in group)
             else:
-                summary, impact = self.summarize_and_score(best["title"], best["summary"])
-                cache_results[uuid] = {
-                    "uuid": uuid,
-                    "title": best["title"],
-                    "summary": summary,
-                    "link": best["link"],
-                    "source_url": best["source_url"],
-                    "published": min(a["published"] for a in group),
-                    "frequency": len(group),
-                    "impact": impact,
-                }
-                with open(cache_path, "w") as f:
-                    json.dump(cache_results[uuid], f, indent=2)
-
-            # Mark article as processed
-            self.article_status[best['link']] = {"uuid": uuid, "status": "done"}
-
-        now = datetime.utcnow().strftime("%Y-%m-%dT%H-%M-%S")
-
-        # Save updated status DB
-        with open(self.status_file, "w") as f:
-            json.dump(self.article_status, f, indent=2)
-
-        # Move processed fetched_*.json files
-        for fpath in fetch_files_used:
+                pending[uuid] = group
+
+            # Mark every article of the group as processed so duplicates are not re-fetched
+            for a in group:
+                done_links[a['link']] = uuid
+
+        return {
+            "run_time": datetime.utcnow().strftime("%Y-%m-%dT%H-%M-%S"),
+            "fetch_files": sorted(fetch_files_used),
+            "cached": cached,
+            "pending": pending,
+            "merges": merges,
+            # Signatures of clusters first seen in this run, persisted once the run is journaled
+            "clusters": [self.cluster_index.signature(c["key"])
+                         for c in self.cluster_index.clusters[known_clusters:]] if self.cluster_index is not None else [],
+            "done_links": done_links,
+            "articles": len(articles),
+            "groups": len(grouped),
+            "overwrite": overwrite,
+        }
+
+    def score_index(self):
+        if self._score_index is None:
+            from app.core.summarizer.score_index import ScoreIndex
+
+            self._score_index = ScoreIndex(self.base_dir, self.region)
+        return self._score_index
+
+    def _read_cache_entry(self, uuid):
+        try:
+            with open(self.cache_dir / f"{uuid}.json", "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Failed to load score for {uuid}: {e}")
+            return None
+
+    def _quarantine(self, fpath):
+        """Move an unreadable raw dump to quarantine/raw/{region}/{date}/{source}/."""
+        metrics.count("raw_files_quarantined", region=self.region)
+        try:
+            target = self.quarantine_dir / fpath.parent.name
+            target.mkdir(parents=True, exist_ok=True)
+            fpath.rename(target / fpath.name)
+            print(f"[WARN] Quarantined {fpath} to {target}")
+        except OSError as e:
+            print(f"[ERROR] Failed to quarantine {fpath}: {e}")
+
+    def _archive(self, files):
+        """Move processed raw dumps out of the raw tree."""
+        archive_start = time.perf_counter()
+        for fpath in files:
+            f = Path(fpath)
+            if not f.exists():
+                continue
             try:
-                f = Path(fpath)
                 archive_path = self.archive_dir / f.parent.name
                 archive_path.mkdir(parents=True, exist_ok=True)
                 f.rename(archive_path / f.name)
             except Exception as e:
                 print(f"[ERROR] Failed to move {fpath}: {e}")
+        metrics.record_stage("archive", time.perf_counter() - archive_start, region=self.region)
+
+    def _apply(self, plan, run):
+        """Run the journaled phases of a plan that have not completed yet."""
+        pending = plan["pending"]
+        phases = plan["phases"]
+        new_entries = {}
+
+        def write_entry(uuid, entry):
+            new_entries[uuid] = entry
+            atomic_write_json(self.cache_dir / f"{uuid}.json", entry, indent=2)
+
+        if PHASE_SUMMARIZED not in phases:
+            # After a crash, groups whose cache file already made it to disk are not summarized again
+            todo = pending if plan.get("overwrite") else {
+                uuid: group for uuid, group in pending.items() if not (self.cache_dir / f"{uuid}.json").exists()
+            }
+            # LLM calls run concurrently; each cache file is written as soon as its result arrives
+            with metrics.span("summarize", region=self.region):
+                self.summarize_groups(todo, write_entry)
+            metrics.count("entries_written", len(new_entries), region=self.region)
+            # Idempotent: a replay finds the links already listed and leaves the entry alone
+            with metrics.span("merge", region=self.region):
+                for uuid, members in plan.get("merges", {}).items():
+                    entry = self.merge_into_cluster(uuid, members)
+                    if entry is not None:
+                        write_entry(uuid, entry)
+                        metrics.count("clusters_joined", region=self.region)
+            self.journal.mark(PHASE_SUMMARIZED)
+
+        if PHASE_INDEXED not in phases:
+            # Re-appending a uuid supersedes its earlier row, so a repeated append is harmless
+            entries = [new_entries.get(uuid) or self._read_cache_entry(uuid)
+                       for uuid in list(pending) + list(plan.get("merges", {}))]
+            with metrics.span("score_index", region=self.region):
+                self.score_index().append([entry for entry in entries if entry])
+            if self.cluster_index is not None:
+                self.cluster_index.persist(plan.get("clusters", []))
+            self.journal.mark(PHASE_INDEXED)
+
+        if PHASE_STATUS not in phases:
+            # Single batched transaction instead of rewriting the whole status file
+            with metrics.span("status", region=self.region):
+                self.status_store.mark_done(plan["done_links"])
+                self.status_store.prune(self.status_ttl_days)
+            self.journal.mark(PHASE_STATUS)
+
+        if PHASE_ARCHIVED not in phases:
+            self._archive(plan["fetch_files"])
+            self.journal.mark(PHASE_ARCHIVED)
 
         # Write process log
-        log_path = self.log_dir / f"summarizer_{self.region}_{now}.json"
-        with open(log_path, "w") as f:
-            json.dump({
-                "run_time": now,
-                "region": self.region,
-                "fetch_files": list(fetch_files_used),
-                "uuids_processed": list(cache_results.keys())
-            }, f, indent=2)
-
-        print(f"[{self.region.upper()}] Processed {len(articles)} articles into {len(grouped)} groups.")
\ No newline at end of file
+        now = plan["run_time"]
+        suffix = f"_w{plan['window']}" if "window" in plan else ""
+        log_path = self.log_dir / f"summarizer_{self.region}_{now}{suffix}.json"
+        process_log = {
+            "run_time": now,
+            "region": self.region,
+            "date": self.date,
+            "score_dir": str(self.cache_dir),
+            "score_dirs": [str(self.cache_dir)],
+            "fetch_files": plan["fetch_files"],
+            "uuids_processed": plan["cached"] + list(pending),
+            "articles": plan["articles"],
+            "llm_cache": self.llm_cache.stats() if self.llm_cache else None,
+            "metrics": run.as_dict()
+        }
+        atomic_write_json(log_path, process_log, indent=2)
+        self.journal.commit()
+
+        print(f"[{self.region.upper()}] Processed {plan['articles']} articles into {plan['groups']} groups.")
+        return process_log
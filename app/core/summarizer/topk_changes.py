@@ -0,0 +1,74 @@
+import fcntl
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CHANGES_FILE = "changes.ndjson"
+LOCK_FILE = "changes.lock"
+# Past this size the log is replaced by an empty one; readers notice the new inode and rescan once
+MAX_BYTES = 1 << 20
+
+
+class TopKChangeLog:
+    """
+    Append-only feed of top_k_cache rewrites: one {"region", "date", "ts"} line
+    per file written, in top_k_cache/changes.ndjson.
+
+    The precomputer appends after each atomic replace. API processes tail it
+    from a byte offset and reload only the files it names, instead of
+    re-statting the whole tree. It is a hint, not a record: lines are not
+    fsynced, and a reader that finds a new inode or a shorter file falls back
+    to a full scan.
+    """
+
+    def __init__(self, summary_dir="data/top_k_cache"):
+        self.dir = Path(summary_dir)
+        self.path = self.dir / CHANGES_FILE
+        self.lock_path = self.dir / LOCK_FILE
+
+    def append(self, region: str, date_str: str):
+        line = json.dumps({"region": region, "date": date_str, "ts": round(time.time(), 3)}) + "\n"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if self.path.stat().st_size > MAX_BYTES:
+                    self.path.unlink()
+            except FileNotFoundError:
+                pass
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def position(self) -> Optional[Tuple[int, int]]:
+        """(inode, size) of the log now, or None if there is none yet."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size
+
+    def read(self, position: Optional[Tuple[int, int]]) -> Tuple[Optional[List[Dict]], Optional[Tuple[int, int]]]:
+        """
+        Changes since `position` and the position to resume from. The list is
+        None when the caller has to rescan: no log, a rotated log, or no
+        position yet.
+        """
+        current = self.position()
+        if current is None or position is None or current[0] != position[0] or current[1] < position[1]:
+            return None, current
+        if current[1] == position[1]:
+            return [], position
+        with open(self.path, "rb") as f:
+            f.seek(position[1])
+            data = f.read(current[1] - position[1])
+        # Stop at the last complete line; a line still being written is read next time
+        complete = data[:data.rfind(b"\n") + 1]
+        changes = []
+        for line in complete.splitlines():
+            try:
+                changes.append(json.loads(line))
+            except ValueError:
+                continue
+        return changes, (position[0], position[1] + len(complete))
@@ -1,20 +1,59 @@
+import argparse
 import json
-from datetime import datetime, timezone
+from datetime import date as date_cls, datetime, time as time_cls, timezone
 from pathlib import Path
 from zoneinfo import ZoneInfo
+from app.utils import metrics
+from app.core.summarizer.ranking import RankingFeatures, RankingFormula, day_end_timestamp
+from app.core.summarizer.score_index import RECORDS_FILE, ScoreIndex
+from app.core.summarizer.topk_changes import TopKChangeLog
+from app.utils.config import region_rankings, region_timezones
+from app.utils.helper import atomic_write_json
 
 class TopKPrecomputer:
-    def __init__(self, base_dir="data", top_k=5, region_config="app/config/regions.json"):
+    def __init__(self, base_dir="data", top_k=5, region_config="app/config/regions.json", margin=20):
         self.base_dir = Path(base_dir)
         self.score_dir = self.base_dir / "score_cache"
         self.output_dir = self.base_dir / "top_k_cache"
+        self.state_dir = self.base_dir / "top_k_state"
+        self.index_dir = self.base_dir / "score_index"
+        self._score_indexes = {}
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Tells API workers which files changed, so they reload those instead of rescanning
+        self.changes = TopKChangeLog(self.output_dir)
         self.top_k = top_k
+        # Extra candidates kept per date so later frequency bumps can reorder the top-k
+        self.margin = margin
 
-        with open(region_config, "r") as f:
-            self.regions = json.load(f)
+        self.regions = region_timezones(region_config)
+        self.rankings = {region: RankingFormula.from_config(config)
+                         for region, config in region_rankings(region_config).items()}
+
+    def formula(self, region) -> RankingFormula:
+        return self.rankings.get(region) or RankingFormula.from_config(None)
+
+    def score_index(self, region):
+        """The region's memory-mapped ScoreIndex, or None if it was never built."""
+        index = self._score_indexes.get(region)
+        if index is None and (self.index_dir / region / RECORDS_FILE).exists():
+            index = self._score_indexes[region] = ScoreIndex(self.base_dir, region)
+        return index
+
+    def day_bounds(self, region, first_date, last_date):
+        """Timestamps covering local dates first_date..last_date (inclusive) in the region's timezone."""
+        start = datetime.combine(date_cls.fromisoformat(first_date), time_cls.min, tzinfo=ZoneInfo(self.regions[region]))
+        return int(start.timestamp()), int(day_end_timestamp(last_date, self.regions[region]))
+
+    def load_scores(self, region, start_ts=None, end_ts=None) -> list:
+        """
+        Latest score entry of every uuid published in [start_ts, end_ts), read
+        from the score index. A region without an index falls back to scanning
+        score_cache, which ignores the bounds.
+        """
+        index = self.score_index(region)
+        if index is not None:
+            return index.range(start_ts, end_ts)
 
-    def load_scores(self, region) -> list:
         all_scores = []
         region_dir = self.score_dir / region
         if not region_dir.exists():
@@ -39,27 +78,30 @@ class TopKPrecomputer:
             return set()
         return {f.stem for f in region_dir.glob("*.json") if f.is_file()}
 
+    def local_date(self, article, tz) -> str:
+        pub = article.get("published", "")
+        pub_dt = datetime.fromisoformat(pub.replace("Z", "+00:00"))
+        return pub_dt.astimezone(tz).strftime("%Y-%m-%d")
+
+    def group_by_local_date(self, articles, region) -> dict:
+        tz = ZoneInfo(self.regions[region])
+        articles_by_date = {}
+        for article in articles:
+            try:
+                articles_by_date.setdefault(self.local_date(article, tz), []).append(article)
+            except Exception as e:
+                print(f"[WARN] Skipped bad article: {e}")
+        return articles_by_date
+
     def precompute_top_k(self, regions=None, top_k=None, rerun_days=2):
         regions = regions or self.regions.keys()
         top_k = top_k or self.top_k
         today = datetime.now(timezone.utc).date()
 
         for region in regions:
-            tzname = self.regions[region]
-            tz = ZoneInfo(tzname)
             computed_dates = self.already_computed_dates(region)
-            articles_by_date = {}
-
-            all_scores = self.load_scores(region)
-            for article in all_scores:
-                try:
-                    pub = article.get("published", "")
-                    pub_dt = datetime.fromisoformat(pub.replace("Z", "+00:00"))
-                    pub_local = pub_dt.astimezone(tz)
-                    date_str = pub_local.strftime("%Y-%m-%d")
-                    articles_by_date.setdefault(date_str, []).append(article)
-                except Exception as e:
-                    print(f"[WARN] Skipped bad article: {e}")
+            with metrics.span("topk_load", region=region):
+                articles_by_date = self.group_by_local_date(self.load_scores(region), region)
 
             for date_str, articles in articles_by_date.items():
                 date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
@@ -69,25 +111,120 @@ class TopKPrecomputer:
                     print(f"[SKIP] Already computed for {region} {date_str}")
                     continue
 
-                top_k_items = self._compute_top_k(articles, region, top_k)
-                out_path = self.output_dir / region / f"{date_str}.json"
-                out_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(out_path, "w") as f:
-                    json.dump(top_k_items, f, indent=2)
-                print(f"[DONE] {region} {date_str} saved to {out_path}")
+                with metrics.span("topk_full", region=region):
+                    # Keep the incremental state in step, margin included
+                    candidates = self._compute_top_k(articles, region, top_k + self.margin, date_str)
+                    self._write_state(region, date_str, candidates)
+                    self._write_top_k(region, date_str, candidates[:top_k])
+                metrics.count("topk_dates_written", region=region)
 
-    def _compute_top_k(self, articles, region, top_k):
-        scored = []
-        for a in articles:
-            try:
-                impact = a.get("impact", {}).get(region, 0)
-                freq = a.get("frequency", 1)
-                a["_score"] = impact + freq
-                scored.append(a)
-            except Exception as e:
-                print(f"[ERROR] Scoring article: {e}")
+    def rebuild(self, regions=None, top_k=None, dates=None):
+        """
+        Full backfill: recompute every date (or only local `dates`) and reset
+        their incremental state from scratch.
+        """
+        regions = regions or self.regions.keys()
+        top_k = top_k or self.top_k
+
+        for region in regions:
+            bounds = self.day_bounds(region, min(dates), max(dates)) if dates else (None, None)
+            articles_by_date = self.group_by_local_date(self.load_scores(region, *bounds), region)
+            if dates is not None:
+                articles_by_date = {d: a for d, a in articles_by_date.items() if d in dates}
+            for date_str, articles in articles_by_date.items():
+                candidates = self._compute_top_k(articles, region, top_k + self.margin, date_str)
+                self._write_state(region, date_str, candidates)
+                self._write_top_k(region, date_str, candidates[:top_k])
+            print(f"[REBUILD] {region}: {len(articles_by_date)} dates")
+
+    def precompute_incremental(self, region, entries, top_k=None):
+        """
+        Merge freshly scored entries into the bounded per-date candidate lists and
+        rewrite only the local dates they touch. Scores only ever grow, so the
+        top-k of (old candidates + new entries) is exact.
+        """
+        top_k = top_k or self.top_k
+        updated = []
+
+        for date_str, articles in self.group_by_local_date(entries, region).items():
+            candidates = {a["uuid"]: a for a in self._load_state(region, date_str, top_k)}
+            for article in articles:
+                candidates[article["uuid"]] = article
+            kept = self._compute_top_k(list(candidates.values()), region, top_k + self.margin, date_str)
+            self._write_state(region, date_str, kept)
+            self._write_top_k(region, date_str, kept[:top_k])
+            updated.append(date_str)
+        return updated
+
+    def precompute_from_log(self, process_log, top_k=None):
+        """Incremental update driven by the UUIDs a Summarizer run just produced."""
+        region = process_log["region"]
+        # A run spanning several fetch dates lists each date's score_cache directory
+        score_dirs = [Path(d) for d in process_log.get("score_dirs", [process_log["score_dir"]])]
+        entries = []
+        with metrics.span("topk_incremental", region=region):
+            for uuid in process_log.get("uuids_processed", []):
+                for score_dir in score_dirs:
+                    path = score_dir / f"{uuid}.json"
+                    if len(score_dirs) > 1 and not path.exists():
+                        continue
+                    try:
+                        metrics.count("files_opened", kind="score_cache")
+                        with open(path, "r") as f:
+                            entries.append(json.load(f))
+                    except Exception as e:
+                        print(f"[WARN] Failed to load score for {uuid}: {e}")
+                    break
+                else:
+                    print(f"[WARN] Failed to load score for {uuid}: not in {len(score_dirs)} score dirs")
+            dates = self.precompute_incremental(region, entries, top_k)
+        metrics.count("topk_dates_written", len(dates), region=region)
+        metrics.REGISTRY.dump()
+        return dates
+
+    def _load_state(self, region, date_str, top_k=None) -> list:
+        path = self.state_dir / region / f"{date_str}.json"
+        if not path.exists():
+            # No state yet (e.g. first incremental run after upgrading): recompute the date with its margin,
+            # since the published top-k alone has nothing to promote once a member drops
+            bounds = self.day_bounds(region, date_str, date_str)
+            articles = self.group_by_local_date(self.load_scores(region, *bounds), region).get(date_str, [])
+            return self._compute_top_k(articles, region, (top_k or self.top_k) + self.margin, date_str)
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[WARN] Failed to load {path}: {e}")
+            return []
+
+    def _write_state(self, region, date_str, candidates):
+        atomic_write_json(self.state_dir / region / f"{date_str}.json", candidates)
+
+    def _write_top_k(self, region, date_str, top_k_items):
+        out_path = self.output_dir / region / f"{date_str}.json"
+        # The API may be reading this file right now; it must never see a partial write
+        atomic_write_json(out_path, top_k_items, indent=2)
+        self.changes.append(region, date_str)
+        print(f"[DONE] {region} {date_str} saved to {out_path}")
+
+    def _compute_top_k(self, articles, region, top_k, date_str=None):
+        # Recency is measured from the end of the local day, so a date's scores stay fixed between runs
+        reference = day_end_timestamp(date_str, self.regions[region]) if date_str else None
+        # Vectorized scoring + argpartition; ties broken by uuid so full and incremental modes agree
+        return RankingFeatures(articles, region, reference).top_k(self.formula(region), top_k)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute top-k summaries per region and local date.")
+    parser.add_argument("--base-dir", default="data")
+    parser.add_argument("--region", action="append", help="Region to process (repeatable, default all)")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every date and reset incremental state")
+    args = parser.parse_args()
 
-        scored.sort(key=lambda x: x["_score"], reverse=True)
-        for a in scored:
-            a.pop("_score", None)
-        return scored[:top_k]
\ No newline at end of file
+    precomputer = TopKPrecomputer(base_dir=args.base_dir, top_k=args.top_k)
+    with metrics.profile_run("topk"):
+        if args.rebuild:
+            precomputer.rebuild(regions=args.region)
+        else:
+            precomputer.precompute_top_k(regions=args.region)
@@ -1,6 +1,34 @@
-from fastapi import FastAPI
-from app.api.routes import router as summary_routes
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from app.api.routes import router as summary_routes, summary_index, summary_notifier
+from app.api.stream import watch_summaries
+from app.utils import metrics
 
-app = FastAPI(title="News Summary API")
 
-app.include_router(summary_routes)
\ No newline at end of file
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load top_k_cache into memory before the first request; from then on one task per worker keeps it
+    # fresh from the precomputer's change log and wakes /summary/stream subscribers
+    summary_index.refresh(force=True)
+    watcher = asyncio.create_task(watch_summaries(summary_index, summary_notifier, summary_index.refresh_seconds))
+    yield
+    watcher.cancel()
+
+
+app = FastAPI(title="News Summary API", lifespan=lifespan)
+
+app.include_router(summary_routes)
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template, not the raw path, to keep the series count bounded
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    metrics.observe("http_request", time.perf_counter() - start, path=path)
+    metrics.count("http_requests", path=path, status=response.status_code)
+    return response
\ No newline at end of file
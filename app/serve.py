@@ -0,0 +1,97 @@
+import argparse
+import os
+import signal
+import socket
+import time
+import uvicorn
+
+# A worker that dies sooner than this after starting is not respawned in a tight loop
+MIN_WORKER_LIFETIME_SECONDS = 1.0
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, app, access_log: bool):
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(app, access_log=access_log, log_level="warning")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(host="0.0.0.0", port=8000, workers=2, access_log=False):
+    """
+    Prefork API server: import and warm the app once, then fork the workers.
+
+    The parent imports app.main (FastAPI, pydantic, routes) and loads the
+    summary index before forking, so each worker starts with everything
+    already in memory, shared copy-on-write, instead of paying the import and
+    the top_k_cache scan itself. Workers share one listening socket; the
+    parent only respawns workers that exit and forwards SIGTERM/SIGINT.
+    """
+    from app.main import app
+    from app.api.routes import summary_index
+
+    start = time.perf_counter()
+    summary_index.refresh(force=True)
+    print(f"[SERVE] Warmed summary index in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    sock = bind_socket(host, port)
+    children = {}
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(sock, app, access_log)
+            finally:
+                os._exit(0)
+        children[pid] = time.monotonic()
+        print(f"[SERVE] Worker {pid} listening on {host}:{port}")
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = children.pop(pid, None)
+        if started is None or stopping:
+            continue
+        print(f"[SERVE] Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, respawning")
+        if time.monotonic() - started < MIN_WORKER_LIFETIME_SECONDS:
+            time.sleep(MIN_WORKER_LIFETIME_SECONDS)
+        spawn()
+    sock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the summary API from prefork workers warmed before fork.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--access-log", action="store_true")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.access_log)
@@ -0,0 +1,68 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, Union
+
+_cache: Dict[str, Tuple[tuple, Any]] = {}
+_derived_cache: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+_lock = threading.Lock()
+
+_MISSING = object()
+
+
+def load_json_config(path: Union[str, Path], default: Any = _MISSING) -> Any:
+    """
+    Parse an app/config JSON file once per process and serve it from memory.
+
+    Later calls only stat the file and re-read it if its mtime or size
+    changed, so edits are still picked up by long-lived workers. Callers share
+    the returned object and must not mutate it. `default` is returned when
+    the file does not exist; without it the FileNotFoundError propagates.
+    """
+    key = os.fspath(path)
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        if default is _MISSING:
+            raise
+        return default
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with _lock:
+        with open(key, "r") as f:
+            data = json.load(f)
+        _cache[key] = (stamp, data)
+    return data
+
+
+def _derived(path, name: str, build: Callable[[Any], Any]) -> Any:
+    """`build(config)`, recomputed only when the underlying file was re-read."""
+    config = load_json_config(path)
+    key = (os.fspath(path), name)
+    cached = _derived_cache.get(key)
+    if cached is None or cached[0] is not config:
+        cached = _derived_cache[key] = (config, build(config))
+    return cached[1]
+
+
+def region_timezones(path: Union[str, Path] = "app/config/regions.json") -> Dict[str, str]:
+    """
+    Region -> IANA timezone name.
+
+    A regions.json value is either the timezone itself or an object such as
+    {"timezone": "Asia/Tokyo", "ranking": {...}}.
+    """
+    return _derived(path, "timezones", lambda config: {
+        region: value if isinstance(value, str) else value["timezone"] for region, value in config.items()
+    })
+
+
+def region_rankings(path: Union[str, Path] = "app/config/regions.json") -> Dict[str, Dict]:
+    """Region -> its "ranking" settings from regions.json, for regions that define one."""
+    return _derived(path, "rankings", lambda config: {
+        region: value["ranking"] for region, value in config.items()
+        if isinstance(value, dict) and value.get("ranking")
+    })
@@ -1 +1,60 @@
-# deduplication, date utils
\ No newline at end of file
+# deduplication, date utils
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Union
+
+# Read once: os.umask can only be queried by setting it, which is not thread-safe later on
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def fsync_dir(path: Union[str, Path]):
+    """Persist a rename/unlink in `path` itself (no-op where directories can't be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes):
+    """
+    Write via a temp file in the same directory, fsync, then rename over `path`.
+
+    Readers see either the old file or the complete new one, never a partial
+    write, and a crash leaves at most a stray *.tmp file behind.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # mkstemp creates 0600; give the file the mode open() would have, so other users can read it
+            os.fchmod(f.fileno(), 0o666 & ~_UMASK)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    fsync_dir(path.parent)
+
+
+def atomic_write_json(path: Union[str, Path], data, indent=None, ensure_ascii=True):
+    atomic_write_bytes(path, json.dumps(data, indent=indent, ensure_ascii=ensure_ascii).encode("utf-8"))
+
+
+def read_dump(f, suffix: str) -> List[Dict]:
+    """Raw dumps are NDJSON (one article per line) or, from older fetchers, a JSON list."""
+    if suffix == ".ndjson":
+        return [json.loads(line) for line in f if line.strip()]
+    return json.load(f)
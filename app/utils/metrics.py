@@ -0,0 +1,274 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+METRICS_DIR = Path("data/metrics")
+PROFILE_DIR = Path("data/log/profile")
+
+# Seconds; covers a single cache lookup up to a slow LLM-bound cycle
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _label_key(labels: Dict) -> Tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def to_dict(self) -> Dict:
+        return {"buckets": list(self.buckets), "counts": list(self.counts), "count": self.count, "sum": self.sum}
+
+
+class Registry:
+    """
+    Process-wide counters, gauges and latency histograms.
+
+    Pipeline processes dump their registry to METRICS_DIR after every run so the
+    API process, which never runs the pipeline itself, can expose them on /metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Tuple], float] = defaultdict(float)
+        self.gauges: Dict[Tuple[str, Tuple], float] = {}
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        with self._lock:
+            self.counters[(name, _label_key(labels))] += amount
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self.gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(seconds)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in self.counters.items()],
+                "gauges": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in self.gauges.items()],
+                "histograms": [dict(h.to_dict(), name=n, labels=dict(l)) for (n, l), h in self.histograms.items()],
+            }
+
+    def dump(self, name: Optional[str] = None, metrics_dir: Path = METRICS_DIR) -> Path:
+        metrics_dir = Path(metrics_dir)
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        path = metrics_dir / f"{name or process_name()}.json"
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp, "w") as f:
+            json.dump(dict(self.snapshot(), updated=time.time(), pid=os.getpid()), f)
+        os.replace(tmp, path)
+        return path
+
+
+REGISTRY = Registry()
+_process_name = None
+
+
+def set_process_name(name: str):
+    """Name under which this process's metrics are dumped (one file per long-lived process)."""
+    global _process_name
+    _process_name = name
+
+
+def process_name() -> str:
+    return _process_name or Path(sys.argv[0]).stem or f"pid_{os.getpid()}"
+
+
+def _reset_registry_after_fork():
+    # Forked workers start with their own counters, not a copy of the parent's
+    global REGISTRY
+    REGISTRY = Registry()
+
+
+os.register_at_fork(after_in_child=_reset_registry_after_fork)
+
+
+class RunMetrics:
+    """Stage timings and counters for one pipeline run, embedded in its process log."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.started = time.perf_counter()
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+                "stages_ms": {k: round(v, 1) for k, v in self.stages.items()},
+                "counters": {k: int(v) if float(v).is_integer() else v for k, v in self.counters.items()},
+            }
+
+
+_current_run: contextvars.ContextVar = contextvars.ContextVar("run_metrics", default=None)
+
+
+@contextmanager
+def record_run():
+    """Collect stages/counters of everything run inside; nested calls share the outer run."""
+    current = _current_run.get()
+    if current is not None:
+        yield current
+        return
+    run = RunMetrics()
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+
+
+def count(name: str, amount: float = 1, **labels):
+    REGISTRY.inc(f"{name}_total", amount, **labels)
+    run = _current_run.get()
+    if run is not None:
+        with run._lock:
+            run.counters[name] += amount
+
+
+def observe(name: str, seconds: float, **labels):
+    REGISTRY.observe(f"{name}_seconds", seconds, **labels)
+
+
+def record_stage(stage: str, seconds: float, **labels):
+    REGISTRY.observe("pipeline_stage_seconds", seconds, stage=stage, **labels)
+    run = _current_run.get()
+    if run is not None:
+        with run._lock:
+            run.stages[stage] += seconds * 1000
+
+
+@contextmanager
+def span(stage: str, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start, **labels)
+
+
+_profiling = threading.Lock()
+
+
+@contextmanager
+def profile_run(name: str, mode: Optional[str] = None):
+    """
+    Opt-in profiler around one run, enabled by PIPELINE_PROFILE=cprofile|pyinstrument.
+
+    cProfile writes a .prof file (open with snakeviz or pstats); pyinstrument,
+    if installed, writes an HTML report. Nested runs are profiled by the outermost one.
+    """
+    mode = (mode or os.environ.get("PIPELINE_PROFILE", "")).lower()
+    if mode not in ("cprofile", "pyinstrument") or not _profiling.acquire(blocking=False):
+        yield
+        return
+    stamp = datetime.utcnow().strftime("%Y-%m-%dT%H-%M-%S")
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        if mode == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                print("[PROFILE] pyinstrument is not installed, falling back to cProfile")
+                mode = "cprofile"
+        if mode == "pyinstrument":
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                path = PROFILE_DIR / f"{name}_{stamp}.html"
+                path.write_text(profiler.output_html())
+                print(f"[PROFILE] Wrote {path}")
+        else:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                path = PROFILE_DIR / f"{name}_{stamp}.prof"
+                profiler.dump_stats(path)
+                print(f"[PROFILE] Wrote {path}")
+    finally:
+        _profiling.release()
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labels: Dict) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for k, v in sorted(labels.items()))
+    return "{" + ",".join(escaped) + "}"
+
+
+def load_snapshots(metrics_dir: Path = METRICS_DIR) -> Dict[str, Dict]:
+    snapshots = {}
+    for path in sorted(Path(metrics_dir).glob("*.json")):
+        try:
+            with open(path, "r") as f:
+                snapshots[path.stem] = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Skipped metrics file {path}: {e}")
+    return snapshots
+
+
+def render_prometheus(snapshots: Dict[str, Dict]) -> str:
+    """Prometheus text exposition of {process: snapshot}; each series gets a process label."""
+    families = defaultdict(list)
+    for process, snap in snapshots.items():
+        for kind in ("counters", "gauges", "histograms"):
+            for metric in snap.get(kind, []):
+                families[(metric["name"], kind)].append((dict(metric["labels"], process=process), metric))
+
+    lines = []
+    types = {"counters": "counter", "gauges": "gauge", "histograms": "histogram"}
+    for (name, kind), series in sorted(families.items()):
+        lines.append(f"# TYPE {name} {types[kind]}")
+        for labels, metric in series:
+            if kind != "histograms":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(metric['value'])}")
+                continue
+            cumulative = 0
+            for bound, n in zip(metric["buckets"], metric["counts"]):
+                cumulative += n
+                lines.append(f"{name}_bucket{_format_labels(dict(labels, le=repr(float(bound))))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(dict(labels, le='+Inf'))} {metric['count']}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(metric['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {metric['count']}")
+    return "\n".join(lines) + "\n"
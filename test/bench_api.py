@@ -0,0 +1,114 @@
+import http.client
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+import click
+from fixtures_gen import write_top_k_cache
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workdir, port, env):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env
+    )
+    for _ in range(100):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+def load(port, paths, duration, concurrency, revalidate=False):
+    counts = [0] * concurrency
+    latencies = [[] for _ in range(concurrency)]
+    stop = time.perf_counter() + duration
+
+    def worker(n):
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        etags = {}
+        i = n
+        while time.perf_counter() < stop:
+            path = paths[i % len(paths)]
+            i += 1
+            headers = {"If-None-Match": etags[path]} if revalidate and path in etags else {}
+            start = time.perf_counter()
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            latencies[n].append(time.perf_counter() - start)
+            if resp.status == 200:
+                etags[path] = resp.getheader("ETag")
+            counts[n] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    merged = sorted(x for lat in latencies for x in lat)
+    return {
+        "requests": sum(counts),
+        "rps": round(sum(counts) / duration, 1),
+        "p50_ms": round(merged[len(merged) // 2] * 1000, 2) if merged else None,
+        "p99_ms": round(merged[int(len(merged) * 0.99)] * 1000, 2) if merged else None,
+    }
+
+
+def bench_api(duration=5.0, concurrency=8, days=30):
+    workdir = tempfile.mkdtemp(prefix="bench_api_")
+    try:
+        os.symlink(REPO_ROOT / "app", Path(workdir) / "app")
+        write_top_k_cache(Path(workdir) / "data", days=days)
+        today = datetime.now().date()
+        paths = ["/summary/today?region=us"] + [
+            f"/summary/{(today - timedelta(days=d)).isoformat()}?region=us" for d in range(1, days)
+        ] + [
+            f"/summary/range?from={today - timedelta(days=days - 1)}&to={today}&region=us&page_size=31",
+            f"/summary/global?date={today}",
+        ]
+        report = {}
+        scenarios = [("uncached", "0", False), ("cached", "256", False), ("cached_etag", "256", True)]
+        for name, cache_size, revalidate in scenarios:
+            port = free_port()
+            env = dict(os.environ, SUMMARY_CACHE_SIZE=cache_size, PYTHONPATH=str(REPO_ROOT))
+            proc = start_server(workdir, port, env)
+            try:
+                load(port, paths, 0.5, concurrency, revalidate)
+                report[name] = load(port, paths, duration, concurrency, revalidate)
+            finally:
+                proc.terminate()
+                proc.wait()
+        return report
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+@click.command()
+@click.option("--duration", default=5.0, help="Seconds per scenario")
+@click.option("--concurrency", default=8, help="Concurrent keep-alive clients")
+def main(duration, concurrency):
+    print(json.dumps(bench_api(duration, concurrency), indent=2))
+
+
+if __name__ == "__main__":
+    main()
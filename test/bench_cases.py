@@ -0,0 +1,160 @@
+import json
+import shutil
+import statistics
+import time
+from typing import Callable, Dict
+import click
+from bench_api import bench_api
+from bench_import import bench_import
+from bench_llm import bench_llm
+from bench_sse import bench_sse
+from bench_topk import bench_topk
+from fake_llm import FakeLLM
+from feed_server import FeedServer, SyntheticFeeds, render_rss
+from fixtures_gen import StoryGenerator, workspace, write_raw_dumps
+from app.core.fetcher.stream_parser import iter_entries
+from app.core.summarizer.dedup import group_articles
+
+
+def measure(fn: Callable[[], object], repeat=5, setup: Callable[[], object] = None) -> Dict:
+    """Run fn `repeat` times (after an optional per-run setup) and report timing stats in seconds."""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return {
+        "runs": repeat,
+        "min_s": round(times[0], 5),
+        "median_s": round(statistics.median(times), 5),
+        "max_s": round(times[-1], 5),
+    }
+
+
+def case_parse(items=500, repeat=5):
+    generator = StoryGenerator(duplicate_rate=0.0)
+    body = render_rss("bench", generator.articles(items))
+    chunks = [body[i:i + 16384] for i in range(0, len(body), 16384)]
+    result = measure(lambda: sum(1 for _ in iter_entries(chunks)), repeat)
+    result.update(items=items, bytes=len(body), items_per_s=round(items / result["median_s"], 1))
+    return result
+
+
+def case_group(articles=500, duplicate_rate=0.3, repeat=3):
+    data = StoryGenerator(duplicate_rate).articles(articles, sources=("a", "b", "c", "d"))
+    groups = []
+    result = measure(lambda: groups.append(len(group_articles(data))), repeat)
+    stories = len({a["label"] for a in data})
+    result.update(articles=articles, groups=groups[-1], stories=stories,
+                  articles_per_s=round(articles / result["median_s"], 1))
+    return result
+
+
+def case_fetch(feeds=6, items=50, latency_ms=20, repeat=3):
+    from app.core.fetcher.fetcher import fetch_articles
+
+    synthetic = SyntheticFeeds(feeds, items)
+    with FeedServer(synthetic, latency_ms=latency_ms) as server, workspace(server.urls()) as workdir:
+        def reset():
+            # Every cold run sees unknown links and no stored validators
+            for path in ("data/cache", "data/raw"):
+                target = workdir / path
+                if target.exists():
+                    shutil.rmtree(target)
+
+        counts = []
+        cold = measure(lambda: counts.append(fetch_articles(region="us", notify=False, collect=False)),
+                       repeat, setup=reset)
+        warm = measure(lambda: fetch_articles(region="us", notify=False, collect=False), repeat)
+    return {
+        "feeds": feeds,
+        "articles": counts[-1]["article_count"],
+        "cold": cold,
+        "not_modified": warm,
+        "median_s": cold["median_s"],
+        "articles_per_s": round(counts[-1]["article_count"] / cold["median_s"], 1),
+    }
+
+
+def case_summarize(articles=200, duplicate_rate=0.3, latency_ms=5, repeat=3):
+    from app.core.summarizer.summarizer import Summarizer
+
+    with workspace() as workdir:
+        def reset():
+            shutil.rmtree(workdir / "data", ignore_errors=True)
+            write_raw_dumps(workdir / "data", per_source=articles // 4, duplicate_rate=duplicate_rate)
+
+        logs = []
+
+        def run():
+            # Limits far above the stub's capacity, so the numbers measure the pipeline and not the limiter
+            summarizer = Summarizer(region="us", llm=FakeLLM(latency_ms=latency_ms, per_article_ms=0),
+                                    llm_workers=8, requests_per_minute=10 ** 6, tokens_per_minute=10 ** 9)
+            logs.append(summarizer.update())
+            summarizer.status_store.close()
+
+        result = measure(run, repeat, setup=reset)
+    log = logs[-1]
+    result.update(articles=articles, groups=len(log["uuids_processed"]),
+                  stages_ms=log["metrics"]["stages_ms"],
+                  articles_per_s=round(articles / result["median_s"], 1))
+    return result
+
+
+def case_llm(jobs=200, latency_ms=20):
+    report = bench_llm(jobs, workers=8, batch_size=5, latency_ms=latency_ms)
+    report["median_s"] = report["elapsed_s"]
+    return report
+
+
+def case_topk(days=60, per_day=100):
+    report = bench_topk(days, per_day)
+    report["median_s"] = report["incremental_s"]
+    return report
+
+
+def case_api(duration=2.0, concurrency=8):
+    report = bench_api(duration, concurrency, days=30)
+    report["rps"] = report["cached"]["rps"]
+    report["p99_ms"] = report["cached"]["p99_ms"]
+    return report
+
+
+def case_stream(subscribers=1000, updates=3):
+    report = bench_sse(subscribers, updates)
+    # Time until a rewrite reached the last subscriber, worst of the updates
+    report["median_s"] = round(max(f["max_ms"] for f in report["fanout"]) / 1000, 4)
+    return report
+
+
+def case_import(repeat=3):
+    entries = bench_import(repeat=repeat)
+    # Slowest entry point is the headline number
+    return {"median_s": round(max(e["median_ms"] for e in entries.values()) / 1000, 4), "entries": entries}
+
+
+CASES = {
+    "parse": case_parse,
+    "group": case_group,
+    "fetch": case_fetch,
+    "summarize": case_summarize,
+    "llm": case_llm,
+    "topk": case_topk,
+    "api": case_api,
+    "stream": case_stream,
+    "import": case_import,
+}
+
+
+@click.command()
+@click.argument("names", nargs=-1)
+def main(names):
+    for name in names or CASES:
+        print(name, json.dumps(CASES[name](), indent=2))
+
+
+if __name__ == "__main__":
+    main()
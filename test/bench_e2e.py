@@ -0,0 +1,87 @@
+import json
+import os
+import time
+import click
+from bench_api import free_port, load, start_server
+from fake_llm import FakeLLM
+from feed_server import FeedServer, SyntheticFeeds
+from fixtures_gen import REPO_ROOT, workspace
+
+
+def bench_e2e(cycles=5, feeds=6, items=50, new_per_cycle=10, duplicate_rate=0.3, feed_latency_ms=20,
+              llm_latency_ms=50, api_duration=2.0, concurrency=8):
+    """
+    Feed server -> fetch -> summarize (stub LLM) -> incremental top-k, for
+    `cycles` fetch cycles, then load the API that serves the result.
+    """
+    from app.core.fetcher.fetcher import fetch_articles
+    from app.core.summarizer.summarizer import Summarizer
+    from app.core.summarizer.topk_precomputer import TopKPrecomputer
+
+    synthetic = SyntheticFeeds(feeds, items, duplicate_rate, new_per_cycle)
+    with FeedServer(synthetic, latency_ms=feed_latency_ms) as server, workspace(server.urls()) as workdir:
+        llm = FakeLLM(latency_ms=llm_latency_ms, per_article_ms=0)
+        summarizer = Summarizer(region="us", llm=llm, llm_workers=8,
+                                requests_per_minute=10 ** 6, tokens_per_minute=10 ** 9)
+        topk = TopKPrecomputer()
+
+        cycle_stats = []
+        articles = summaries = 0
+        start = time.perf_counter()
+        for cycle in range(cycles):
+            if cycle:
+                synthetic.advance()
+            cycle_start = time.perf_counter()
+            fetched = fetch_articles(region="us", notify=False, collect=False)
+            process_log = summarizer.update()
+            dates = topk.precompute_from_log(process_log) if process_log else []
+            articles += fetched["article_count"]
+            summaries += len(process_log["uuids_processed"]) if process_log else 0
+            cycle_stats.append({
+                "articles": fetched["article_count"],
+                "uuids": len(process_log["uuids_processed"]) if process_log else 0,
+                "dates": len(dates),
+                "total_s": round(time.perf_counter() - cycle_start, 3),
+                "stages_ms": process_log["metrics"]["stages_ms"] if process_log else {},
+            })
+        pipeline_s = time.perf_counter() - start
+        summarizer.status_store.close()
+
+        port = free_port()
+        env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+        proc = start_server(str(workdir), port, env)
+        try:
+            paths = ["/summary/today?region=us"]
+            load(port, paths, 0.5, concurrency)
+            api = load(port, paths, api_duration, concurrency)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    return {
+        "cycles": cycles,
+        "articles": articles,
+        "summaries": summaries,
+        "llm_calls": llm.calls,
+        "pipeline_s": round(pipeline_s, 3),
+        "median_s": round(sorted(c["total_s"] for c in cycle_stats)[len(cycle_stats) // 2], 3),
+        "articles_per_s": round(articles / pipeline_s, 1),
+        "per_cycle": cycle_stats,
+        "api": api,
+        "rps": api["rps"],
+    }
+
+
+@click.command()
+@click.option("--cycles", default=5, help="Fetch cycles to run")
+@click.option("--feeds", default=6, help="Synthetic feeds")
+@click.option("--items", default=50, help="Items per feed")
+@click.option("--duplicate-rate", default=0.3, help="Share of items re-reporting another feed's story")
+@click.option("--llm-latency-ms", default=50, help="Stub LLM latency per call")
+def main(cycles, feeds, items, duplicate_rate, llm_latency_ms):
+    print(json.dumps(bench_e2e(cycles, feeds, items, duplicate_rate=duplicate_rate,
+                               llm_latency_ms=llm_latency_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import click
+from fixtures_gen import REPO_ROOT
+
+# Cold-import budget per entry point, in milliseconds of `-X importtime` cumulative time
+BUDGETS_MS = {
+    "app.main": 800,
+    "app.core.sender.sender_us": 350,
+    "app.core.receiver.receiver_us": 400,
+    "app.core.orchestrator": 150,
+}
+
+# Only the code paths that actually use these may import them
+HEAVY_MODULES = ("langchain", "openai", "fuzzywuzzy", "feedparser")
+
+
+def parse_importtime(stderr: str):
+    """{module: (self_us, cumulative_us)} from `python -X importtime` output."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            timings[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            # The header line
+            continue
+    return timings
+
+
+def import_once(module: str):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(proc.stderr)
+
+
+def bench_import(modules=None, repeat=5, budget_scale=1.0):
+    """Median cold-import time of each entry point in a fresh interpreter, against its budget."""
+    report = {}
+    for module in modules or BUDGETS_MS:
+        runs = [import_once(module) for _ in range(repeat)]
+        total_ms = statistics.median(run[module][1] for run in runs) / 1000
+        last = runs[-1]
+        heaviest = sorted(((name, t[0]) for name, t in last.items()), key=lambda item: -item[1])[:5]
+        budget_ms = BUDGETS_MS.get(module, 0) * budget_scale
+        report[module] = {
+            "median_ms": round(total_ms, 1),
+            "budget_ms": budget_ms or None,
+            "over_budget": bool(budget_ms) and total_ms > budget_ms,
+            "heavy": sorted(name for name in last if name.split(".")[0] in HEAVY_MODULES),
+            "top_self_ms": {name: round(us / 1000, 1) for name, us in heaviest},
+        }
+    return report
+
+
+@click.command()
+@click.option("--module", "modules", multiple=True, help="Entry point to import (repeatable); default all budgeted")
+@click.option("--repeat", default=5, help="Fresh interpreters per entry point")
+@click.option("--budget-scale", default=1.0, help="Multiply every budget, e.g. 2.0 on a slow CI machine")
+def main(modules, repeat, budget_scale):
+    report = bench_import(modules, repeat, budget_scale)
+    print(json.dumps(report, indent=2))
+    failed = [m for m, r in report.items() if r["over_budget"] or r["heavy"]]
+    if failed:
+        print(f"[FAIL] Over budget or importing heavy dependencies eagerly: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import time
+import click
+from fake_llm import FakeLLM
+from app.core.summarizer.llm_executor import LLMExecutor, RateLimiter
+
+
+def bench_llm(jobs=200, workers=8, batch_size=5, latency_ms=200, rps=None, rpm=6000, tpm=1000000):
+    llm = FakeLLM(latency_ms=latency_ms, requests_per_second=rps)
+    executor = LLMExecutor(llm, max_workers=workers, batch_size=batch_size,
+                           limiter=RateLimiter(rpm, tpm), backoff_base=0.1)
+    job_list = [
+        {"key": str(i), "title": f"Synthetic headline number {i}", "summary": "Body text " * 20, "region": "us"}
+        for i in range(jobs)
+    ]
+    done = []
+    start = time.perf_counter()
+    executor.run(job_list, lambda key, summary, impact: done.append(key))
+    elapsed = time.perf_counter() - start
+    report = executor.summary()
+    report.update({
+        "workers": workers,
+        "batch_size": batch_size,
+        "completed": len(done),
+        "elapsed_s": round(elapsed, 2),
+        "jobs_per_s": round(len(done) / elapsed, 1),
+    })
+    return report
+
+
+@click.command()
+@click.option("--jobs", default=200, help="Number of article groups to summarize")
+@click.option("--latency-ms", default=200, help="Fake LLM latency per call")
+@click.option("--rps", default=None, type=int, help="Fake server request limit per second (429 beyond it)")
+def main(jobs, latency_ms, rps):
+    for workers, batch_size in [(1, 1), (8, 1), (8, 5)]:
+        print(bench_llm(jobs, workers, batch_size, latency_ms, rps))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import json
+import multiprocessing
+import resource
+import shutil
+import tempfile
+import time
+from pathlib import Path
+import click
+from fixtures_gen import REPO_ROOT, write_raw_dumps
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _summarize_in_child(workdir: str, window_size, queue):
+    import os
+    from fake_llm import FakeLLM
+    from app.core.summarizer.summarizer import Summarizer
+
+    os.chdir(workdir)
+    summarizer = Summarizer(region="us", llm=FakeLLM(latency_ms=0, per_article_ms=0), llm_workers=8,
+                            requests_per_minute=10 ** 9, tokens_per_minute=10 ** 12, window_size=window_size)
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    log = summarizer.update()
+    queue.put({
+        "window_size": window_size,
+        "seconds": round(time.perf_counter() - start, 2),
+        "uuids": len(log["uuids_processed"]) if log else 0,
+        "baseline_rss_mb": round(baseline, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "growth_mb": round(_peak_rss_mb() - baseline, 1),
+    })
+
+
+def bench_memory(articles=5000, windows=(None, 1000), files=400, duplicate_rate=0.3):
+    """
+    Peak RSS of one Summarizer.update over an `articles`-sized backlog, per
+    window size (None = everything at once). Each run happens in a fresh
+    spawned interpreter on its own copy of the raw tree.
+    """
+    template = Path(tempfile.mkdtemp(prefix="bench_mem_"))
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    try:
+        sources = ("s0", "s1", "s2", "s3")
+        write_raw_dumps(template / "data", sources=sources, per_source=articles // len(sources),
+                        duplicate_rate=duplicate_rate, files_per_source=max(1, files // len(sources)))
+        shutil.copytree(REPO_ROOT / "app" / "config", template / "app" / "config")
+        for window_size in windows:
+            workdir = Path(tempfile.mkdtemp(prefix="bench_mem_run_"))
+            try:
+                shutil.copytree(template, workdir, dirs_exist_ok=True)
+                queue = ctx.Queue()
+                proc = ctx.Process(target=_summarize_in_child, args=(str(workdir), window_size, queue))
+                proc.start()
+                results.append(queue.get())
+                proc.join()
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        shutil.rmtree(template, ignore_errors=True)
+    return {"articles": articles, "runs": results}
+
+
+@click.command()
+@click.option("--articles", default=5000, help="Backlog size")
+@click.option("--window", "windows", multiple=True, type=int, help="Window size to compare (repeatable)")
+@click.option("--files", default=400, help="Raw dump files the backlog is spread over")
+def main(articles, windows, files):
+    print(json.dumps(bench_memory(articles, [None] + list(windows or [1000]), files), indent=2))
+
+
+if __name__ == "__main__":
+    main()
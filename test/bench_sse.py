@@ -0,0 +1,161 @@
+import asyncio
+import http.client
+import json
+import os
+import resource
+import shutil
+import tempfile
+import time
+from pathlib import Path
+import click
+from bench_api import free_port, start_server
+from fixtures_gen import REPO_ROOT, write_top_k_cache
+
+REGION_CONFIG = REPO_ROOT / "app" / "config" / "regions.json"
+
+
+def server_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def raise_fd_limit(needed: int):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return {"p50_ms": round(samples[len(samples) // 2] * 1000, 2),
+            "p99_ms": round(samples[int(len(samples) * 0.99)] * 1000, 2),
+            "max_ms": round(samples[-1] * 1000, 2)}
+
+
+async def next_event(reader) -> float:
+    """Wall-clock arrival time of the next `summary` event, skipping retry and keep-alive blocks."""
+    while True:
+        block = await reader.readuntil(b"\n\n")
+        if b"\nevent: summary\n" in b"\n" + block:
+            return time.time()
+
+
+async def subscribe(port: int, region: str):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 20)
+    writer.write(f"GET /summary/stream?region={region} HTTP/1.1\r\nHost: bench\r\n"
+                 f"Accept: text/event-stream\r\n\r\n".encode())
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+    # The current summary is sent on connect
+    await next_event(reader)
+    return reader, writer
+
+
+def probe(port: int, path: str, requests: int):
+    """Sequential keep-alive requests, to see what idle subscribers cost ordinary traffic."""
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        conn.request("GET", path)
+        conn.getresponse().read()
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    return percentiles(latencies)
+
+
+async def hold_subscribers(port, pid, region, subscribers, updates, publish, probes):
+    report = {}
+    start = time.perf_counter()
+    connections = []
+    # Batches keep the connect burst within the listen backlog
+    for first in range(0, subscribers, 200):
+        batch = min(200, subscribers - first)
+        connections += await asyncio.gather(*(subscribe(port, region) for _ in range(batch)))
+    report["connect_s"] = round(time.perf_counter() - start, 2)
+    try:
+        report["rss_mb"] = server_rss_mb(pid)
+        report["today_latency"] = await asyncio.to_thread(probe, port, f"/summary/today?region={region}", probes)
+        report["fanout"] = []
+        for n in range(updates):
+            arrivals = [asyncio.ensure_future(next_event(reader)) for reader, _ in connections]
+            published = await asyncio.to_thread(publish, n)
+            delays = [arrival - published for arrival in await asyncio.gather(*arrivals)]
+            report["fanout"].append(dict(percentiles(delays), delivered=len(delays)))
+    finally:
+        for _, writer in connections:
+            writer.close()
+    return report
+
+
+def bench_sse(subscribers=2000, updates=3, region="us", refresh_seconds=0.2, probes=200):
+    """
+    Hold `subscribers` idle /summary/stream connections on one API worker,
+    then rewrite the region's today file `updates` times through the
+    precomputer and time the delivery to every subscriber. Delivery includes
+    up to `refresh_seconds` of index polling.
+    """
+    from app.core.summarizer.topk_precomputer import TopKPrecomputer
+    from app.utils.config import region_timezones
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+
+    raise_fd_limit(subscribers * 2 + 256)
+    workdir = Path(tempfile.mkdtemp(prefix="bench_sse_"))
+    try:
+        os.symlink(REPO_ROOT / "app", workdir / "app")
+        write_top_k_cache(workdir / "data", region=region, days=3)
+        precomputer = TopKPrecomputer(base_dir=workdir / "data", region_config=str(REGION_CONFIG))
+        tz = ZoneInfo(region_timezones(REGION_CONFIG)[region])
+
+        def publish(n):
+            date_str = datetime.now(tz).date().isoformat()
+            articles = [{
+                "uuid": f"{n:04d}{i:060d}",
+                "title": f"Update {n} headline {i}",
+                "summary": "A fresh synthetic summary sentence.",
+                "link": f"https://example.com/update/{n}/{i}",
+                "source_url": "https://example.com/rss",
+                "published": f"{date_str}T12:00:00+00:00",
+                "frequency": i + 1,
+                "impact": {region: 10 - i, "global": 5},
+            } for i in range(5)]
+            published = time.time()
+            precomputer._write_top_k(region, date_str, articles)
+            return published
+
+        port = free_port()
+        env = dict(os.environ, PYTHONPATH=str(REPO_ROOT), SUMMARY_INDEX_REFRESH_SECONDS=str(refresh_seconds))
+        proc = start_server(workdir, port, env)
+        try:
+            idle_rss = server_rss_mb(proc.pid)
+            idle_latency = probe(port, f"/summary/today?region={region}", probes)
+            held = asyncio.run(hold_subscribers(port, proc.pid, region, subscribers, updates, publish, probes))
+        finally:
+            proc.terminate()
+            proc.wait()
+        return {
+            "subscribers": subscribers,
+            "connect_s": held["connect_s"],
+            "server_rss_mb": {"idle": round(idle_rss, 1), "subscribed": round(held["rss_mb"], 1),
+                              "per_subscriber_kb": round((held["rss_mb"] - idle_rss) * 1024 / max(subscribers, 1), 1)},
+            "today_latency": {"no_subscribers": idle_latency, "with_subscribers": held["today_latency"]},
+            "fanout": held["fanout"],
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+@click.command()
+@click.option("--subscribers", default=2000, help="Idle /summary/stream connections to hold")
+@click.option("--updates", default=3, help="Top-k rewrites to fan out")
+@click.option("--refresh-seconds", default=0.2, help="SUMMARY_INDEX_REFRESH_SECONDS for the server")
+def main(subscribers, updates, refresh_seconds):
+    print(json.dumps(bench_sse(subscribers, updates, refresh_seconds=refresh_seconds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+import click
+from fixtures_gen import make_entry, write_score_cache
+from app.core.summarizer.score_index import build_from_score_cache
+from app.core.summarizer.topk_precomputer import TopKPrecomputer
+
+
+def bench_topk(days=365, per_day=100, new_per_run=20, region="us"):
+    base_dir = tempfile.mkdtemp(prefix="bench_topk_")
+    try:
+        write_score_cache(base_dir, region, days, per_day)
+        start = time.perf_counter()
+        build_from_score_cache(base_dir, region)
+        index_build_s = time.perf_counter() - start
+        precomputer = TopKPrecomputer(base_dir=base_dir)
+
+        start = time.perf_counter()
+        precomputer.rebuild(regions=[region])
+        rebuild_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        precomputer.precompute_top_k(regions=[region])
+        full_s = time.perf_counter() - start
+
+        rng = random.Random(1)
+        now = datetime.now(timezone.utc)
+        new_entries = [make_entry(rng, region, now - timedelta(minutes=rng.randint(0, 120)))
+                       for _ in range(new_per_run)]
+        start = time.perf_counter()
+        precomputer.precompute_incremental(region, new_entries)
+        incremental_s = time.perf_counter() - start
+
+        return {
+            "score_files": days * per_day,
+            "index_build_s": round(index_build_s, 3),
+            "rebuild_s": round(rebuild_s, 3),
+            "full_rescan_s": round(full_s, 3),
+            "incremental_s": round(incremental_s, 4),
+            "speedup": round(full_s / incremental_s, 1) if incremental_s else None,
+        }
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+@click.command()
+@click.option("--days", default=365, help="Days of synthetic history")
+@click.option("--per-day", default=100, help="Score entries per day")
+@click.option("--new-per-run", default=20, help="Entries produced by one Summarizer run")
+def main(days, per_day, new_per_run):
+    print(bench_topk(days, per_day, new_per_run))
+
+
+if __name__ == "__main__":
+    main()
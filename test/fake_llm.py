@@ -0,0 +1,53 @@
+import json
+import re
+import threading
+import time
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+
+class FakeLLM:
+    """
+    Stand-in for ChatOpenAI.predict: answers single and packed prompts with
+    valid JSON after a fixed latency, and raises 429s past `requests_per_second`.
+    """
+
+    def __init__(self, latency_ms=200, per_article_ms=20, requests_per_second=None):
+        self.latency = latency_ms / 1000.0
+        self.per_article = per_article_ms / 1000.0
+        self.requests_per_second = requests_per_second
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._window = []
+
+    def _check_rate(self):
+        if not self.requests_per_second:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.requests_per_second:
+                raise FakeRateLimitError("429 Rate limit reached for requests")
+            self._window.append(now)
+
+    def __call__(self, prompt: str) -> str:
+        self._check_rate()
+        with self._lock:
+            self.calls += 1
+        region = re.search(r"Source Region: (\S+)", prompt).group(1)
+        ids = [int(i) for i in re.findall(r"^\[(\d+)\]$", prompt, re.MULTILINE)]
+        titles = re.findall(r"^Title: (.*)$", prompt, re.MULTILINE)
+        time.sleep(self.latency + self.per_article * max(1, len(titles)))
+
+        def answer(title):
+            score = len(title) % 10 + 1
+            return {"summary": f"Summary of {title}", "impact": {region: score, "global": max(1, score - 2)}}
+
+        if ids:
+            return json.dumps([dict(answer(title), id=i) for i, title in zip(ids, titles)])
+        return json.dumps(answer(titles[0] if titles else ""))
+
+    # Same entry point as ChatOpenAI, so it can be passed to Summarizer(llm=...)
+    predict = __call__
@@ -0,0 +1,145 @@
+import hashlib
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+import click
+from fixtures_gen import StoryGenerator
+
+
+def render_rss(name, articles) -> bytes:
+    items = "".join(
+        "<item>"
+        f"<title>{escape(a['title'])}</title>"
+        f"<link>{escape(a['link'])}</link>"
+        f"<description>{escape(a['summary'])}</description>"
+        f"<pubDate>{format_datetime(datetime.fromisoformat(a['published']))}</pubDate>"
+        "</item>"
+        for a in articles
+    )
+    return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{name}</title><link>https://{name}.example.com/</link>{items}</channel></rss>").encode()
+
+
+class SyntheticFeeds:
+    """
+    `feeds` RSS documents of `items_per_feed` items each, drawn from one shared
+    story pool so that `duplicate_rate` of the items re-report stories carried
+    by other feeds. advance() publishes `new_per_advance` fresh items per feed.
+    """
+
+    def __init__(self, feeds=6, items_per_feed=50, duplicate_rate=0.3, new_per_advance=10, seed=0):
+        self.names = [f"feed{i}" for i in range(feeds)]
+        self.items_per_feed = items_per_feed
+        self.new_per_advance = new_per_advance
+        self.generator = StoryGenerator(duplicate_rate, seed)
+        self.items = {name: [] for name in self.names}
+        self.bodies = {}
+        self._lock = threading.Lock()
+        self._publish(items_per_feed)
+
+    def _publish(self, per_feed):
+        now = datetime.now(timezone.utc)
+        for name in self.names:
+            fresh = [self.generator.article(name, published=now - timedelta(seconds=i)) for i in range(per_feed)]
+            items = (fresh + self.items[name])[:self.items_per_feed]
+            body = render_rss(name, items)
+            with self._lock:
+                self.items[name] = items
+                self.bodies[name] = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+
+    def advance(self):
+        self._publish(self.new_per_advance)
+
+    def get(self, name):
+        with self._lock:
+            return self.bodies.get(name)
+
+
+class FeedServer:
+    """Threaded HTTP server for SyntheticFeeds at /{name}.xml, with ETag/304 and optional latency."""
+
+    def __init__(self, feeds: SyntheticFeeds, host="127.0.0.1", port=0, latency_ms=0):
+        self.feeds = feeds
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests += 1
+                if latency_ms:
+                    time.sleep(latency_ms / 1000)
+                found = feeds.get(self.path.strip("/").rsplit(".", 1)[0])
+                if found is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body, etag = found
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.host, self.port = self.httpd.server_address[:2]
+        self.thread = None
+
+    def urls(self):
+        return {name: f"http://{self.host}:{self.port}/{name}.xml" for name in self.feeds.names}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+@click.command()
+@click.option("--port", default=9777)
+@click.option("--feeds", default=6, help="Number of feeds")
+@click.option("--items", default=50, help="Items per feed")
+@click.option("--duplicate-rate", default=0.3, help="Share of items re-reporting another feed's story")
+@click.option("--latency-ms", default=0, help="Added latency per request")
+@click.option("--advance-every", default=0, help="Publish new items every N seconds (0 = never)")
+def main(port, feeds, items, duplicate_rate, latency_ms, advance_every):
+    synthetic = SyntheticFeeds(feeds, items, duplicate_rate)
+    server = FeedServer(synthetic, port=port, latency_ms=latency_ms).start()
+    for name, url in server.urls().items():
+        print(f"{name}: {url}")
+    try:
+        while True:
+            time.sleep(advance_every or 3600)
+            if advance_every:
+                synthetic.advance()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import click
+from app.core.summarizer.summarizer import generate_article_id
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "tor", "vi", "sha", "dun", "pel", "or", "bri", "zen", "qua", "ful", "et", "mar"]
+
+
+def make_vocabulary(size=3000, seed=0):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+class StoryGenerator:
+    """
+    Deterministic synthetic articles. With probability `duplicate_rate` an
+    article re-reports an earlier story: same words, one swapped and reordered,
+    which the de-duplicator should group with the original.
+    """
+
+    def __init__(self, duplicate_rate=0.3, seed=0, vocabulary_size=3000):
+        self.rng = random.Random(seed)
+        self.words = make_vocabulary(vocabulary_size, seed)
+        self.duplicate_rate = duplicate_rate
+        self.stories = []
+        self.count = 0
+
+    def _sentence(self, n):
+        return [self.rng.choice(self.words) for _ in range(n)]
+
+    def article(self, source="synthetic", region="us", published=None):
+        self.count += 1
+        if self.stories and self.rng.random() < self.duplicate_rate:
+            label, title, summary = self.rng.choice(self.stories)
+            title = title[:]
+            title[self.rng.randrange(len(title))] = self.rng.choice(self.words)
+            self.rng.shuffle(title)
+        else:
+            label = f"story-{len(self.stories)}"
+            title, summary = self._sentence(9), self._sentence(30)
+            self.stories.append((label, title, summary))
+        published = published or datetime.now(timezone.utc) - timedelta(minutes=self.rng.randint(0, 600))
+        return {
+            "label": label,
+            "title": " ".join(title).capitalize(),
+            "link": f"https://{source}.example.com/{self.count}",
+            "published": published.isoformat(),
+            "summary": " ".join(summary).capitalize() + ".",
+            "source_name": source,
+            "source_url": f"https://{source}.example.com/rss",
+            "region": region,
+        }
+
+    def articles(self, n, sources=("synthetic",), region="us"):
+        return [self.article(sources[i % len(sources)], region) for i in range(n)]
+
+
+def make_entry(rng, region, published):
+    title = f"Synthetic story {rng.getrandbits(48):x}"
+    link = f"https://example.com/{rng.getrandbits(48):x}"
+    return {
+        "uuid": generate_article_id(title, link),
+        "title": title,
+        "summary": "Synthetic summary. " * 5,
+        "link": link,
+        "source_url": "https://example.com/rss",
+        "published": published.isoformat(),
+        "frequency": rng.randint(1, 4),
+        "impact": {region: rng.randint(1, 10), "global": rng.randint(1, 10)},
+    }
+
+
+def write_score_cache(base_dir, region="us", days=365, per_day=100, seed=0):
+    """A score_cache tree with `per_day` entries for each of the last `days` days."""
+    rng = random.Random(seed)
+    end = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+    for d in range(days):
+        day = end - timedelta(days=d)
+        day_dir = Path(base_dir) / "score_cache" / region / day.strftime("%Y-%m-%d")
+        day_dir.mkdir(parents=True, exist_ok=True)
+        for _ in range(per_day):
+            entry = make_entry(rng, region, day - timedelta(minutes=rng.randint(0, 600)))
+            with open(day_dir / f"{entry['uuid']}.json", "w") as f:
+                json.dump(entry, f, indent=2)
+
+
+def write_top_k_cache(base_dir, region="us", days=30, top_k=5):
+    """top_k_cache files from tomorrow back to `days` ago, as the API serves them."""
+    out = Path(base_dir) / "top_k_cache" / region
+    out.mkdir(parents=True, exist_ok=True)
+    today = datetime.now().date()
+    for d in range(-1, days):
+        date_str = (today - timedelta(days=d)).isoformat()
+        articles = [{
+            "uuid": f"{d:04d}{i:060d}",
+            "title": f"Headline {i} for {date_str}",
+            "summary": "A synthetic summary sentence. " * 4,
+            "link": f"https://example.com/{date_str}/{i}",
+            "source_url": "https://example.com/rss",
+            "published": f"{date_str}T12:00:00+00:00",
+            "frequency": i + 1,
+            "impact": {region: 10 - i, "global": 5},
+        } for i in range(top_k)]
+        with open(out / f"{date_str}.json", "w") as f:
+            json.dump(articles, f, indent=2)
+
+
+def write_raw_dumps(base_dir, region="us", sources=("s0", "s1", "s2", "s3"), per_source=50,
+                    duplicate_rate=0.3, seed=0, files_per_source=1):
+    """NDJSON fetch dumps for today's UTC date, as the fetcher writes them (`files_per_source` fetch cycles)."""
+    generator = StoryGenerator(duplicate_rate, seed)
+    date_str = datetime.utcnow().strftime("%Y-%m-%d")
+    stamp = datetime.utcnow().strftime("%Y-%m-%dT%H-%M-%S")
+    total = 0
+    for source in sources:
+        out = Path(base_dir) / "raw" / region / date_str / source
+        out.mkdir(parents=True, exist_ok=True)
+        for cycle in range(files_per_source):
+            name = f"fetched_{stamp}.ndjson" if files_per_source == 1 else f"fetched_{stamp}-{cycle:05d}.ndjson"
+            with open(out / name, "w") as f:
+                for _ in range(per_source // files_per_source):
+                    article = generator.article(source, region)
+                    article.pop("label")
+                    f.write(json.dumps(article) + "\n")
+                    total += 1
+    return total
+
+
+@contextmanager
+def workspace(feed_urls=None, region="us"):
+    """
+    Run inside a throwaway working directory with its own data/ tree and a copy
+    of app/config; `feed_urls` ({name: url}) replaces the region's real feeds.
+    """
+    workdir = Path(tempfile.mkdtemp(prefix="bench_ws_"))
+    previous = os.getcwd()
+    try:
+        shutil.copytree(REPO_ROOT / "app" / "config", workdir / "app" / "config")
+        if feed_urls is not None:
+            with open(workdir / "app" / "config" / "rss_sources.json", "w") as f:
+                json.dump(feed_urls, f, indent=2)
+            with open(workdir / "app" / "config" / "region_sources.json", "w") as f:
+                json.dump({region: list(feed_urls)}, f, indent=2)
+        os.chdir(workdir)
+        yield workdir
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+@click.command()
+@click.option("--base-dir", default="data/bench", help="Where to write the fixture trees")
+@click.option("--region", default="us")
+@click.option("--days", default=365, help="Days of score_cache / top_k_cache history")
+@click.option("--per-day", default=100, help="Score entries per day")
+@click.option("--raw", default=200, help="Raw articles to write for today (0 to skip)")
+@click.option("--duplicate-rate", default=0.3, help="Share of raw articles that re-report an earlier story")
+def main(base_dir, region, days, per_day, raw, duplicate_rate):
+    write_score_cache(base_dir, region, days, per_day)
+    write_top_k_cache(base_dir, region, days)
+    if raw:
+        sources = [f"s{i}" for i in range(4)]
+        write_raw_dumps(base_dir, region, sources, raw // len(sources), duplicate_rate)
+    print(f"Wrote fixtures for {region} under {base_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,30 @@
 import click
-from app.core.fetcher import fetch_articles
-from app.core.summarizer import Summarizer
-from app.core.topk_precomputer import TopKPrecomputer
+from app.core.fetcher.fetcher import fetch_articles
+from app.core.summarizer.summarizer import Summarizer
+from app.core.summarizer.topk_precomputer import TopKPrecomputer
 
 
 @click.command()
-@click.option('--max-age', default=30, help='Max age (in days) of UUID cache to keep.')
+@click.option('--region', default='us', help='Region to fetch and summarize.')
+@click.option('--limit', default=50, help='Max entries to read per feed.')
+@click.option('--status-ttl-days', default=30, help='Days to keep article status records.')
 @click.option('--use-llm', is_flag=True, help='Enable LLM for summarization and scoring.')
 @click.option('--top-k', default=5, help='Number of top articles to compute per region.')
 @click.option('--region-config', default='app/config/regions.json', help='Path to region config JSON.')
-def run_all(max_age, use_llm, top_k, region_config):
+def run_all(region, limit, status_ttl_days, use_llm, top_k, region_config):
     print(">>> Running fetcher...")
-    articles = fetch_articles(max_age_days=max_age)
-    print(f"Total new articles fetched: {len(articles)}")
+    result = fetch_articles(region=region, limit=limit, notify=False, collect=False)
+    print(f"Total new articles fetched: {result['article_count']}")
 
     print(">>> Running summarizer...")
-    summarizer = Summarizer(use_llm=use_llm)
-    summarizer.update()
+    summarizer = Summarizer(region=region, use_llm=use_llm, status_ttl_days=status_ttl_days)
+    process_log = summarizer.update()
 
     print(">>> Running top_k precomputer...")
     precomputer = TopKPrecomputer(top_k=top_k, region_config=region_config)
-    precomputer.precompute_top_k()
+    if process_log:
+        precomputer.precompute_from_log(process_log, top_k=top_k)
 
 
 if __name__ == "__main__":
-    run_all()
\ No newline at end of file
+    run_all()
@@ -0,0 +1,102 @@
+import json
+import platform
+import subprocess
+import sys
+import traceback
+from datetime import datetime, timezone
+from pathlib import Path
+import click
+from bench_cases import CASES
+from bench_e2e import bench_e2e
+from fixtures_gen import REPO_ROOT
+
+# Lower is better for durations and latencies, higher for throughput
+LOWER_IS_BETTER = ("median_s", "p99_ms")
+HIGHER_IS_BETTER = ("articles_per_s", "items_per_s", "jobs_per_s", "rps")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def run_suite(names, quick=False):
+    results = {}
+    for name in names:
+        print(f"[BENCH] {name}...")
+        try:
+            if name == "e2e":
+                results[name] = bench_e2e(cycles=2 if quick else 5)
+            elif quick and name == "topk":
+                results[name] = CASES[name](days=10)
+            elif quick and name == "api":
+                results[name] = CASES[name](duration=0.5)
+            elif quick and name == "stream":
+                results[name] = CASES[name](subscribers=200, updates=1)
+            else:
+                results[name] = CASES[name]()
+        except Exception as e:
+            # Keep going so one missing dependency doesn't hide every other number
+            traceback.print_exc()
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Headline metrics that got worse than the baseline by more than `tolerance` (a fraction)."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "error" in result or "error" in base:
+            continue
+        for key in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if key not in result or key not in base or not base[key]:
+                continue
+            change = (result[key] - base[key]) / base[key]
+            worse = change > tolerance if key in LOWER_IS_BETTER else change < -tolerance
+            if worse:
+                regressions.append({"case": name, "metric": key, "baseline": base[key],
+                                    "current": result[key], "change": round(change, 3)})
+    return regressions
+
+
+@click.command()
+@click.option("--case", "cases", multiple=True, help="Case to run (repeatable); default all plus e2e")
+@click.option("--output", default="data/bench/report.json", help="Where to write the JSON report")
+@click.option("--baseline", default=None, help="Earlier report to compare against")
+@click.option("--tolerance", default=0.2, help="Allowed relative slowdown before a metric counts as regressed")
+@click.option("--quick", is_flag=True, help="Smaller sizes for a fast smoke run")
+def main(cases, output, baseline, tolerance, quick):
+    names = list(cases) or list(CASES) + ["e2e"]
+    output = Path(output).resolve()
+    report = {
+        "meta": {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "quick": quick,
+        },
+        "results": run_suite(names, quick),
+    }
+    if baseline:
+        with open(baseline) as f:
+            report["regressions"] = compare(report["results"], json.load(f), tolerance)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output}")
+
+    for item in report.get("regressions", []):
+        print(f"[REGRESSION] {item['case']}.{item['metric']}: {item['baseline']} -> {item['current']} "
+              f"({item['change']:+.0%})")
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,15 @@
 
 import json
 import click
-from app.core.fetcher import fetch_articles
+from app.core.fetcher.fetcher import fetch_articles
 
 @click.command()
 @click.option('--limit', default=50, help="Max articles to fetch per source")
-def main(limit):
-    articles = fetch_articles(limit=limit)
-    print(f"Total new articles fetched: {len(articles)}")
+@click.option('--region', default=None, help="Only fetch this region's feeds (default all)")
+@click.option('--no-notify', is_flag=True, help="Don't notify the receivers")
+def main(limit, region, no_notify):
+    result = fetch_articles(region=region, limit=limit, notify=not no_notify, collect=False)
+    print(f"Total new articles fetched: {result['article_count']} in {result['elapsed_ms']} ms")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import json
+import random
+import time
+import click
+from fuzzywuzzy import fuzz
+from app.core.summarizer.dedup import DEFAULT_THRESHOLD, group_articles
+
+
+def pairwise_group_articles(articles, threshold=DEFAULT_THRESHOLD):
+    """The original O(n^2) grouping, kept as the quality reference."""
+    groups = []
+    used = set()
+    for i, a in enumerate(articles):
+        if i in used:
+            continue
+        group = [a]
+        for j in range(i + 1, len(articles)):
+            if j in used:
+                continue
+            if fuzz.token_set_ratio(a["title"], articles[j]["title"]) > threshold or \
+               fuzz.token_set_ratio(a["summary"], articles[j]["summary"]) > threshold:
+                group.append(articles[j])
+                used.add(j)
+        groups.append(group)
+    return groups
+
+
+def pair_scores(groups, articles):
+    predicted = set()
+    for group in groups:
+        links = sorted(a["link"] for a in group)
+        predicted.update((x, y) for i, x in enumerate(links) for y in links[i + 1:])
+    expected = set()
+    for i, a in enumerate(articles):
+        for b in articles[i + 1:]:
+            if a["label"] == b["label"]:
+                expected.add(tuple(sorted((a["link"], b["link"]))))
+    tp = len(predicted & expected)
+    precision = tp / len(predicted) if predicted else 1.0
+    recall = tp / len(expected) if expected else 1.0
+    return round(precision, 3), round(recall, 3)
+
+
+@click.command()
+@click.option("--fixture", default="test/fixtures/grouping_fixture.json", help="Labeled articles")
+@click.option("--shuffles", default=5, help="Random input orders to check order independence")
+def main(fixture, shuffles):
+    with open(fixture) as f:
+        articles = json.load(f)
+
+    start = time.perf_counter()
+    baseline = pairwise_group_articles(articles)
+    baseline_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    groups = group_articles(articles)
+    indexed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"pairwise: {len(baseline)} groups, precision/recall {pair_scores(baseline, articles)}, {baseline_ms:.1f} ms")
+    print(f"indexed:  {len(groups)} groups, precision/recall {pair_scores(groups, articles)}, {indexed_ms:.1f} ms")
+
+    partition = sorted(sorted(a["link"] for a in g) for g in groups)
+    rng = random.Random(0)
+    for _ in range(shuffles):
+        shuffled = articles[:]
+        rng.shuffle(shuffled)
+        assert sorted(sorted(a["link"] for a in g) for g in group_articles(shuffled)) == partition, \
+            "grouping depends on input order"
+    print(f"order independent across {shuffles} shuffles")
+
+
+if __name__ == "__main__":
+    main()
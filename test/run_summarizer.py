@@ -1,22 +1,21 @@
 # run_summarizer.py
 import click
-from app.core.summarizer import Summarizer
-from datetime import datetime
+from app.core.summarizer.summarizer import Summarizer
 
 
 @click.command()
-@click.option('--date', default=None, help='Target date in YYYY-MM-DD format (defaults to today)')
-def run_summarizer(date):
+@click.option('--region', default='us', help='Region to summarize')
+@click.option('--date', default=None, help='Only summarize dumps fetched on this UTC date (YYYY-MM-DD); '
+                                          'by default every pending date is processed')
+@click.option('--no-llm', is_flag=True, help='Skip the LLM and keep feed summaries as-is')
+def run_summarizer(region, date, no_llm):
     """
-    Run the summarizer pipeline for a given date.
+    Run the summarizer pipeline for a given region, across every pending fetch date unless --date is given.
     """
-    if date is None:
-        date = datetime.now().strftime("%Y-%m-%d")
-
-    print(f"Running summarizer for {date}")
-    summarizer = Summarizer(date_str=date)
+    print(f"Running summarizer for {region} on {date or 'all pending dates'}")
+    summarizer = Summarizer(region=region, date_str=date, use_llm=not no_llm)
     summarizer.update()
 
 
 if __name__ == "__main__":
-    run_summarizer()
\ No newline at end of file
+    run_summarizer()